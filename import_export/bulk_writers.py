@@ -0,0 +1,157 @@
+from django.db import connections
+
+
+class BaseBulkWriter:
+    """
+    Base abstract implementation of bulk writer.
+
+    A bulk writer saves the new instances collected by
+    :meth:`~import_export.resources.Resource.bulk_create`.
+    """
+
+    def __init__(self, resource, using):
+        self.resource = resource
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def write(self, instances, batch_size=None):
+        raise NotImplementedError
+
+
+class ORMBulkWriter(BaseBulkWriter):
+    """
+    Bulk writer which saves instances with the model manager's
+    ``bulk_create()``.
+
+    This is the default bulk writer.
+    """
+
+    def write(self, instances, batch_size=None):
+        self.resource._meta.model.objects.bulk_create(instances, batch_size=batch_size)
+
+
+class SQLBulkWriter(BaseBulkWriter):
+    """
+    Base implementation of bulk writers which insert the values of the concrete
+    fields directly, without building multi-row ``INSERT`` statements through
+    the ORM.
+
+    The rows are written in batches of ``batch_size`` rows (all at once if
+    ``batch_size`` is ``None``).
+
+    Unlike ``bulk_create()``, primary keys generated by the database are not set
+    on the saved instances. Instances with a value which must be compiled by the
+    database (such as a ``db_default``) are saved with :class:`ORMBulkWriter`.
+    """
+
+    def write(self, instances, batch_size=None):
+        opts = self.resource._meta.model._meta
+        if opts.parents:
+            raise ValueError("Can't bulk create a multi-table inherited model")
+        connection = self.connection
+        fields = [f for f in opts.concrete_fields if not f.generated]
+        # as with bulk_create(), an auto-incrementing primary key is left to the
+        # database unless a value was supplied
+        auto_pk = opts.pk if opts.pk.db_returning else None
+        with_pk, without_pk = [], []
+        for instance in instances:
+            instance._prepare_related_fields_for_save(operation_name="bulk_create")
+            if auto_pk is not None and instance.pk is None:
+                without_pk.append(instance)
+            else:
+                with_pk.append(instance)
+
+        batches = []
+        for objs, objs_fields in (
+            (with_pk, fields),
+            (without_pk, [f for f in fields if f is not auto_pk]),
+        ):
+            if not objs:
+                continue
+            rows = []
+            for instance in objs:
+                row = []
+                for field in objs_fields:
+                    value = field.pre_save(instance, True)
+                    if hasattr(value, "resolve_expression"):
+                        ORMBulkWriter(self.resource, self.using).write(
+                            instances, batch_size=batch_size
+                        )
+                        return
+                    row.append(field.get_db_prep_save(value, connection=connection))
+                rows.append(row)
+            batches.append(([f.column for f in objs_fields], rows))
+
+        for columns, rows in batches:
+            step = batch_size or len(rows)
+            for i in range(0, len(rows), step):
+                self.write_rows(opts.db_table, columns, rows[i : i + step])
+        for instance in instances:
+            instance._state.adding = False
+            instance._state.db = self.using
+
+    def write_rows(self, table, columns, rows):
+        """
+        Inserts ``rows``, lists of database values in the order of ``columns``,
+        into ``table``. Called once for each batch of at most ``batch_size``
+        rows.
+        """
+        raise NotImplementedError
+
+
+class SQLiteBulkWriter(SQLBulkWriter):
+    """
+    Bulk writer which inserts rows with a single parameterised ``INSERT``
+    passed to ``executemany()``.
+    """
+
+    def write_rows(self, table, columns, rows):
+        qn = self.connection.ops.quote_name
+        sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+            qn(table),
+            ", ".join(qn(column) for column in columns),
+            ", ".join(["%s"] * len(columns)),
+        )
+        with self.connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+
+class PostgreSQLCopyBulkWriter(SQLBulkWriter):
+    """
+    Bulk writer which streams rows to ``COPY ... FROM STDIN`` in text format.
+
+    Requires psycopg 3. With psycopg2, instances are saved with
+    :class:`ORMBulkWriter`.
+    """
+
+    def write(self, instances, batch_size=None):
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        if not is_psycopg3:
+            ORMBulkWriter(self.resource, self.using).write(
+                instances, batch_size=batch_size
+            )
+            return
+        super().write(instances, batch_size=batch_size)
+
+    def write_rows(self, table, columns, rows):
+        qn = self.connection.ops.quote_name
+        sql = "COPY %s (%s) FROM STDIN" % (
+            qn(table),
+            ", ".join(qn(column) for column in columns),
+        )
+        with self.connection.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+
+#: Bulk writer classes for the database vendors with a dedicated writer.
+#: Assign to ``bulk_writer_classes`` to enable them.
+VENDOR_BULK_WRITER_CLASSES = {
+    "postgresql": PostgreSQLCopyBulkWriter,
+    "sqlite": SQLiteBulkWriter,
+}
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class CheckpointsConfig(AppConfig):
+    name = "import_export.checkpoints"
+    label = "import_export_checkpoints"
+    verbose_name = _("Import checkpoints")
+    default_auto_field = "django.db.models.BigAutoField"
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("resource", models.CharField(max_length=255, verbose_name="resource")),
+                ("digest", models.CharField(max_length=64, verbose_name="digest")),
+                (
+                    "row_number",
+                    models.PositiveBigIntegerField(verbose_name="last committed row"),
+                ),
+                ("totals", models.JSONField(default=dict, verbose_name="totals")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="updated at"),
+                ),
+            ],
+            options={
+                "verbose_name": "import checkpoint",
+                "verbose_name_plural": "import checkpoints",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("resource", "digest"),
+                        name="import_export_checkpoint_unique_dataset",
+                    )
+                ],
+            },
+        ),
+    ]
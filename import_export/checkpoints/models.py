@@ -0,0 +1,28 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ImportCheckpoint(models.Model):
+    """
+    The progress of a checkpointed import, keyed by resource and dataset digest.
+    See :class:`~import_export.checkpoints.stores.ModelCheckpointStore`.
+    """
+
+    resource = models.CharField(_("resource"), max_length=255)
+    digest = models.CharField(_("digest"), max_length=64)
+    row_number = models.PositiveBigIntegerField(_("last committed row"))
+    totals = models.JSONField(_("totals"), default=dict)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("import checkpoint")
+        verbose_name_plural = _("import checkpoints")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["resource", "digest"],
+                name="import_export_checkpoint_unique_dataset",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.resource} {self.digest}"
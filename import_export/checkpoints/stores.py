@@ -0,0 +1,70 @@
+from .models import ImportCheckpoint
+
+
+class BaseCheckpointStore:
+    """
+    Base abstract implementation of an import checkpoint store.
+
+    A checkpoint store records the number of the last committed row of a
+    dataset and the totals of the rows imported so far, keyed by a digest of the
+    dataset, so that an interrupted import can be resumed.  See
+    :attr:`~import_export.options.ResourceOptions.checkpoint_store_class`.
+    """
+
+    def __init__(self, resource, using):
+        self.resource = resource
+        self.using = using
+
+    def get_checkpoint(self, digest):
+        """
+        Returns a ``(row_number, totals)`` tuple of the checkpoint of the dataset
+        with ``digest``, or ``None`` if there is none.
+        """
+        raise NotImplementedError
+
+    def set_checkpoint(self, digest, row_number, totals):
+        """
+        Records that the rows of the dataset with ``digest`` up to ``row_number``
+        are committed, with ``totals``, a ``dict`` of the number of rows of each
+        import type.
+        """
+        raise NotImplementedError
+
+    def delete_checkpoint(self, digest):
+        """
+        Removes the checkpoint of the dataset with ``digest``.
+        """
+        raise NotImplementedError
+
+
+class ModelCheckpointStore(BaseCheckpointStore):
+    """
+    Checkpoint store which saves checkpoints with the
+    :class:`~import_export.checkpoints.models.ImportCheckpoint` model, in the
+    database of the import, so that each checkpoint is committed with its rows.
+
+    Requires ``"import_export.checkpoints"`` in ``INSTALLED_APPS``.
+    """
+
+    def __init__(self, resource, using):
+        super().__init__(resource, using)
+        self.key = resource.get_checkpoint_key()
+
+    def get_queryset(self):
+        return ImportCheckpoint.objects.using(self.using).filter(resource=self.key)
+
+    def get_checkpoint(self, digest):
+        checkpoint = self.get_queryset().filter(digest=digest).first()
+        if checkpoint is None:
+            return None
+        return checkpoint.row_number, checkpoint.totals
+
+    def set_checkpoint(self, digest, row_number, totals):
+        ImportCheckpoint.objects.using(self.using).update_or_create(
+            resource=self.key,
+            digest=digest,
+            defaults={"row_number": row_number, "totals": dict(totals)},
+        )
+
+    def delete_checkpoint(self, digest):
+        self.get_queryset().filter(digest=digest).delete()
@@ -0,0 +1,194 @@
+import array
+
+import tablib
+
+# the typecodes of the arrays of codes, from the smallest item size
+_TYPECODES = ("B", "H", "I", "Q")
+
+# the types of the values which are shared between the cells which hold an
+# equal value.  Other values (e.g. ``Decimal("1.0")`` and ``Decimal("1.00")``,
+# or datetimes in different timezones) may be equal but render differently.
+_SHARED_TYPES = frozenset((str, int, bool, type(None)))
+
+# the number of distinct values after which a column checks whether most of its
+# values are distinct, and stops sharing them
+_SHARING_CHECK_INTERVAL = 1024
+
+
+def _get_key(value):
+    # 1, 1.0 and True are equal, but are not shared
+    return value if type(value) is str else (type(value), value)
+
+
+class _Column:
+    """
+    The cells of a column, as codes into the values of the column.  Equal
+    values of the :data:`_SHARED_TYPES` are stored once, until most of the
+    values of the column are found to be distinct.  The cells are then stored
+    as a list of values, and ``codes`` is ``None``.
+    """
+
+    __slots__ = ("codes", "values", "index")
+
+    def __init__(self):
+        self.codes = array.array(_TYPECODES[0])
+        self.values = []
+        # key -> code, for the values of the shared types
+        self.index = {}
+
+    def append(self, value):
+        if self.codes is not None:
+            key = _get_key(value) if type(value) in _SHARED_TYPES else None
+            code = None if key is None else self.index.get(key)
+            if code is None:
+                code = len(self.values)
+                if code % _SHARING_CHECK_INTERVAL == 0 and code * 2 > len(self.codes):
+                    # sharing the values costs more memory than it saves
+                    self.values = list(self)
+                    self.codes = self.index = None
+                else:
+                    self._add_value(key, value)
+            if self.codes is not None:
+                self.codes.append(code)
+                return
+        self.values.append(value)
+
+    def _add_value(self, key, value):
+        code = len(self.values)
+        if code >= 1 << (8 * self.codes.itemsize):
+            typecode = _TYPECODES[_TYPECODES.index(self.codes.typecode) + 1]
+            self.codes = array.array(typecode, self.codes)
+        self.values.append(value)
+        if key is not None:
+            self.index[key] = code
+
+    def map_values(self, func):
+        self.values = [func(value) for value in self.values]
+        if self.codes is None:
+            return
+        self.index = {}
+        for code, value in enumerate(self.values):
+            if type(value) in _SHARED_TYPES:
+                self.index.setdefault(_get_key(value), code)
+
+    def __getitem__(self, number):
+        if self.codes is None:
+            return self.values[number]
+        return self.values[self.codes[number]]
+
+    def __iter__(self):
+        if self.codes is None:
+            return iter(self.values)
+        values = self.values
+        return (values[code] for code in self.codes)
+
+
+class ColumnarDataset:
+    """
+    A compact, append-only alternative to :class:`tablib.Dataset` which stores
+    the exported values column by column.
+
+    Each column holds an array of small integer codes (of 1 to 8 bytes, growing
+    with the number of distinct values) into a list of its values.  Equal
+    strings, integers, booleans and ``None`` are stored once per column, so that
+    repetitive values (such as the choices, related names or dates of an
+    export) take one byte per cell rather than a list slot and a string each.
+    The values of a column whose values are mostly distinct (such as ids) are
+    stored in a list.
+
+    Supports the parts of the :class:`tablib.Dataset` API which are used on
+    export (``headers``, ``title``, :meth:`append`, iteration, indexing by row
+    or header, ``dict`` and :meth:`export`).  :meth:`to_dataset` converts the
+    buffer to a :class:`tablib.Dataset` for the formats which require one.
+
+    Used by :meth:`~import_export.resources.Resource.export` when
+    :attr:`~import_export.options.ResourceOptions.use_columnar_export` is
+    enabled.
+
+    :param headers: The column names.
+    :param title: The title of the dataset (e.g. the name of a spreadsheet).
+    """
+
+    def __init__(self, headers=None, title=None):
+        self.headers = list(headers) if headers else None
+        self.title = title
+        self._columns = [_Column() for _ in self.headers or ()]
+        self._height = 0
+
+    @property
+    def height(self):
+        """The number of rows."""
+        return self._height
+
+    @property
+    def width(self):
+        """The number of columns."""
+        return len(self._columns)
+
+    def __len__(self):
+        return self._height
+
+    def append(self, row):
+        """
+        Appends ``row``, a sequence of values with one value per column.
+        """
+        row = tuple(row)
+        if not self._columns and not self._height:
+            self._columns = [_Column() for _ in row]
+        if len(row) != self.width:
+            raise tablib.InvalidDimensions
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        self._height += 1
+
+    def extend(self, rows):
+        """
+        Appends each of ``rows``.
+        """
+        for row in rows:
+            self.append(row)
+
+    def __iter__(self):
+        return zip(*self._columns) if self._columns else iter(())
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.get_col(self.headers.index(key))
+        rows = range(self._height)[key]
+        if isinstance(rows, int):
+            return tuple(column[rows] for column in self._columns)
+        return [tuple(column[number] for column in self._columns) for number in rows]
+
+    def get_col(self, index):
+        """
+        Returns the values of the column at ``index``.
+        """
+        return list(self._columns[index])
+
+    @property
+    def dict(self):
+        """The rows, as dicts keyed by header (or lists if there are none)."""
+        if self.headers:
+            return [dict(zip(self.headers, row)) for row in self]
+        return [list(row) for row in self]
+
+    def map_values(self, func):
+        """
+        Replaces each value with ``func(value)``.  ``func`` is called once for
+        each stored value, rather than for each cell.
+        """
+        for column in self._columns:
+            column.map_values(func)
+
+    def to_dataset(self):
+        """
+        Returns the rows as a :class:`tablib.Dataset`.
+        """
+        return tablib.Dataset(*self, headers=self.headers, title=self.title)
+
+    def export(self, format, **kwargs):
+        """
+        Exports the rows with the tablib format ``format``, as
+        :meth:`tablib.Dataset.export` does.
+        """
+        return self.to_dataset().export(format, **kwargs)
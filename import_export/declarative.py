@@ -1,6 +1,8 @@
 import logging
 import warnings
+import weakref
 from collections import OrderedDict
+from copy import copy
 
 from django.apps import apps
 from django.core.exceptions import FieldDoesNotExist
@@ -15,10 +17,66 @@ from .utils import get_related_model
 logger = logging.getLogger(__name__)
 
 
+def _get_function(method):
+    return getattr(method, "__func__", method)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    return value
+
+
+# Fields generated from model fields: model -> {signature: fields}, where the
+# signature is the generated field names and everything of the resource class
+# which is used to generate them.  Resource classes with the same model and
+# signature (e.g. classes created dynamically by ``modelresource_factory()``)
+# receive copies of the same fields.  The models are weakly referenced, so that
+# the entries of dynamically created models are released with the model.
+_generated_fields_cache = weakref.WeakKeyDictionary()
+
+
+# the methods of model resources which generate fields from model fields
+_FIELD_FACTORIES = (
+    "field_from_django_field",
+    "widget_from_django_field",
+    "widget_kwargs_for_field",
+)
+
+
+def _overrides_field_factories(resource_class):
+    """
+    Returns whether ``resource_class`` overrides a method which generates
+    fields (including the methods named in ``WIDGETS_MAP``) of the base model
+    resource, i.e. the first class in its MRO which is created by
+    :class:`ModelDeclarativeMetaclass`.
+    """
+    base = [
+        klass
+        for klass in resource_class.__mro__
+        if isinstance(klass, ModelDeclarativeMetaclass)
+    ][-1]
+    names = [
+        *_FIELD_FACTORIES,
+        *(
+            value
+            for value in resource_class.WIDGETS_MAP.values()
+            if isinstance(value, str)
+        ),
+    ]
+    return any(
+        _get_function(getattr(resource_class, name, None))
+        is not _get_function(getattr(base, name, None))
+        for name in names
+    )
+
+
 class DeclarativeMetaclass(type):
     def __new__(cls, name, bases, attrs):
         def _load_meta_options(base_, meta_):
             options = getattr(base_, "Meta", None)
+            if options is None:
+                return
 
             for option in [
                 option
@@ -34,13 +92,10 @@ class DeclarativeMetaclass(type):
         declared_fields = []
         meta = ResourceOptions()
 
-        # If this class is subclassing another Resource, add that Resource's
-        # fields. Note that we loop over the bases in *reverse*. This is
-        # necessary in order to preserve the correct order of fields.
+        # Collect the Meta options of the parent Resources.
+        # Their fields are added by _build_fields().
         for base in bases[::-1]:
-            if hasattr(base, "fields"):
-                declared_fields = list(base.fields.items()) + declared_fields
-                # Collect the Meta options
+            if hasattr(base, "_meta") or hasattr(base, "fields"):
                 # #1363 If there are any parent classes, set those options first
                 for parent in base.__bases__:
                     _load_meta_options(parent, meta)
@@ -54,19 +109,37 @@ class DeclarativeMetaclass(type):
                     field.column_name = field_name
                 declared_fields.append((field_name, field))
 
-        attrs["fields"] = OrderedDict(declared_fields)
         new_class = super().__new__(cls, name, bases, attrs)
         # add direct fields
         _load_meta_options(new_class, meta)
         new_class._meta = meta
+        new_class.fields = cls._build_fields(new_class, declared_fields)
 
         return new_class
 
+    def _build_fields(new_class, declared_fields):
+        """
+        Returns the fields of ``new_class``: the fields of its parent Resources
+        followed by the fields declared on the class.
+        """
+        fields = []
+
+        # If this class is subclassing another Resource, add that Resource's
+        # fields. Note that we loop over the bases in *reverse*. This is
+        # necessary in order to preserve the correct order of fields.
+        for base in new_class.__bases__[::-1]:
+            if hasattr(base, "fields"):
+                fields = list(base.fields.items()) + fields
+
+        return OrderedDict([*fields, *declared_fields])
+
 
 class ModelDeclarativeMetaclass(DeclarativeMetaclass):
     def __new__(cls, name, bases, attrs):
-        # Save the names of fields declared on this class
-        class_fields = {name for name, obj in attrs.items() if isinstance(obj, Field)}
+        # Save the fields declared on this class
+        class_fields = [
+            (name, obj) for name, obj in attrs.items() if isinstance(obj, Field)
+        ]
         new_class = super().__new__(cls, name, bases, attrs)
 
         opts = new_class._meta
@@ -74,103 +147,171 @@ class ModelDeclarativeMetaclass(DeclarativeMetaclass):
         if not opts.instance_loader_class:
             opts.instance_loader_class = ModelInstanceLoader
 
-        if opts.model:
-            model_opts = opts.model._meta
-
-            # #1693 check the fields explicitly declared as attributes of the Resource
-            # class.
-            # if 'fields' property is defined, declared fields can only be included
-            # if they appear in the 'fields' iterable.
-            declared_fields = {}
-            for field_name, field in new_class.fields.items():
-                column_name = field.column_name
+        if opts.model and opts.fields is not None:
+            # #1693 if 'fields' property is defined, declared fields can only be
+            # included if they appear in the 'fields' iterable.
+            for field_name, field in class_fields:
                 if (
-                    opts.fields is not None
-                    and field_name not in opts.fields
-                    and column_name not in opts.fields
+                    field_name not in opts.fields
+                    and field.column_name not in opts.fields
                 ):
                     # #2017 warn only if the unlisted field is
                     # part of the current class
-                    if field_name in class_fields:
-                        warnings.warn(
-                            f"{name}: ignoring field '{field_name}' because "
-                            "not declared in 'fields' whitelist",
-                            stacklevel=2,
-                        )
-                    continue
-                declared_fields[field_name] = field
+                    warnings.warn(
+                        f"{name}: ignoring field '{field_name}' because "
+                        "not declared in 'fields' whitelist",
+                        stacklevel=2,
+                    )
 
-            field_list = []
-            for f in sorted(model_opts.fields + model_opts.many_to_many):
-                if opts.fields is not None and f.name not in opts.fields:
+        return new_class
+
+    @staticmethod
+    def _get_related_django_field(model, field_name):
+        """
+        Returns the Django model field which ``field_name``, a path that follows
+        relationships (e.g. ``author__name``), refers to.
+        """
+        verbose_model_name = model.__name__
+        attrs = field_name.split("__")
+        for i, attr in enumerate(attrs):
+            verbose_path = ".".join([verbose_model_name] + attrs[0 : i + 1])
+
+            try:
+                f = model._meta.get_field(attr)
+            except FieldDoesNotExist as e:
+                logger.debug(e, exc_info=e)
+                raise FieldDoesNotExist(
+                    "%s: %s has no field named '%s'"
+                    % (verbose_path, model.__name__, attr)
+                )
+
+            if i < len(attrs) - 1:
+                # We're not at the last attribute yet, so check
+                # that we're looking at a relation, and move on to
+                # the next model.
+                if isinstance(f, ForeignObjectRel):
+                    model = get_related_model(f)
+                else:
+                    if get_related_model(f) is None:
+                        raise KeyError("%s is not a relation" % verbose_path)
+                    model = get_related_model(f)
+
+        if isinstance(f, ForeignObjectRel):
+            f = f.field
+        return f
+
+    def _build_fields(new_class, declared_fields):
+        fields = super()._build_fields(declared_fields)
+
+        opts = new_class._meta
+        if not opts.model:
+            return fields
+
+        model_opts = opts.model._meta
+
+        # #1693 check the fields explicitly declared as attributes of the Resource
+        # class.
+        # if 'fields' property is defined, declared fields can only be included
+        # if they appear in the 'fields' iterable.
+        declared_fields = {}
+        for field_name, field in fields.items():
+            column_name = field.column_name
+            if (
+                opts.fields is not None
+                and field_name not in opts.fields
+                and column_name not in opts.fields
+            ):
+                continue
+            declared_fields[field_name] = field
+
+        # (name, Django field, readonly) of the fields to generate
+        django_fields = []
+        field_list = []
+        for f in sorted(model_opts.fields + model_opts.many_to_many):
+            if opts.fields is not None and f.name not in opts.fields:
+                continue
+            if opts.exclude and f.name in opts.exclude:
+                continue
+
+            if f.name in declared_fields:
+                # If model field is declared in `ModelResource`,
+                # remove it from `declared_fields`
+                # to keep exact order of model fields
+                field_list.append((f.name, declared_fields.pop(f.name)))
+            else:
+                django_fields.append((f.name, f, False))
+                field_list.append((f.name, None))
+
+        # add fields that follow relationships
+        related_field_names = []
+        if opts.fields is not None:
+            for field_name in opts.fields:
+                if field_name in declared_fields:
                     continue
-                if opts.exclude and f.name in opts.exclude:
+                if field_name.find("__") == -1:
                     continue
 
-                if f.name in declared_fields:
-                    # If model field is declared in `ModelResource`,
-                    # remove it from `declared_fields`
-                    # to keep exact order of model fields
-                    field = declared_fields.pop(f.name)
-                else:
-                    field = new_class.field_from_django_field(f.name, f, readonly=False)
+                f = type(new_class)._get_related_django_field(opts.model, field_name)
+                django_fields.append((field_name, f, True))
+                related_field_names.append(field_name)
 
-                field_list.append(
-                    (
-                        f.name,
-                        field,
-                    )
-                )
+        generated_fields = new_class._get_generated_fields(django_fields)
 
-            # Order as model fields first then declared fields by default
-            new_class.fields = OrderedDict([*field_list, *declared_fields.items()])
-
-            # add fields that follow relationships
-            if opts.fields is not None:
-                field_list = []
-                for field_name in opts.fields:
-                    if field_name in declared_fields:
-                        continue
-                    if field_name.find("__") == -1:
-                        continue
-
-                    model = opts.model
-                    attrs = field_name.split("__")
-                    for i, attr in enumerate(attrs):
-                        verbose_path = ".".join(
-                            [opts.model.__name__] + attrs[0 : i + 1]
-                        )
-
-                        try:
-                            f = model._meta.get_field(attr)
-                        except FieldDoesNotExist as e:
-                            logger.debug(e, exc_info=e)
-                            raise FieldDoesNotExist(
-                                "%s: %s has no field named '%s'"
-                                % (verbose_path, model.__name__, attr)
-                            )
-
-                        if i < len(attrs) - 1:
-                            # We're not at the last attribute yet, so check
-                            # that we're looking at a relation, and move on to
-                            # the next model.
-                            if isinstance(f, ForeignObjectRel):
-                                model = get_related_model(f)
-                            else:
-                                if get_related_model(f) is None:
-                                    raise KeyError(
-                                        "%s is not a relation" % verbose_path
-                                    )
-                                model = get_related_model(f)
-
-                    if isinstance(f, ForeignObjectRel):
-                        f = f.field
-
-                    field = new_class.field_from_django_field(
-                        field_name, f, readonly=True
-                    )
-                    field_list.append((field_name, field))
+        # Order as model fields first then declared fields by default,
+        # followed by the fields that follow relationships
+        return OrderedDict(
+            [
+                *[
+                    (field_name, field or generated_fields[field_name])
+                    for field_name, field in field_list
+                ],
+                *declared_fields.items(),
+                *[
+                    (field_name, generated_fields[field_name])
+                    for field_name in related_field_names
+                ],
+            ]
+        )
 
-                new_class.fields.update(OrderedDict(field_list))
+    def _get_generated_fields(new_class, django_fields):
+        """
+        Returns a dict of the fields generated by
+        ``field_from_django_field()`` for ``django_fields``, a list of
+        ``(name, Django field, readonly)`` tuples.
 
-        return new_class
+        The fields are memoised only if the methods which generate them are
+        those of the base model resource, because an override may read other
+        attributes of the class.
+        """
+        opts = new_class._meta
+        key = generated_fields = None
+        if not _overrides_field_factories(new_class):
+            try:
+                key = (
+                    tuple(
+                        (field_name, readonly)
+                        for field_name, _, readonly in django_fields
+                    ),
+                    _freeze(opts.widgets or {}),
+                    opts.use_natural_foreign_keys,
+                    new_class.DEFAULT_RESOURCE_FIELD,
+                    _freeze(new_class.WIDGETS_MAP),
+                )
+                model_cache = _generated_fields_cache.setdefault(opts.model, {})
+                generated_fields = model_cache.get(key)
+            except TypeError:
+                # unhashable options (e.g. a list in Meta.widgets)
+                key = None
+
+        if generated_fields is None:
+            generated_fields = {
+                field_name: new_class.field_from_django_field(field_name, f, readonly)
+                for field_name, f, readonly in django_fields
+            }
+            if key is None:
+                return generated_fields
+            model_cache[key] = generated_fields
+
+        return {
+            field_name: copy(field) for field_name, field in generated_fields.items()
+        }
@@ -1,3 +1,5 @@
+from copy import copy
+
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.fields import NOT_PROVIDED
 from django.db.models.manager import Manager
@@ -73,6 +75,16 @@ class Field:
             return f"<{path}: {self.column_name}>"
         return "<%s>" % path
 
+    def __copy__(self):
+        """
+        Returns a shallow copy of the field with its own copy of the widget, so
+        that the copy can be changed independently of the original.
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.widget = copy(self.widget)
+        return clone
+
     def clean(self, row, **kwargs):
         """
         Translates the value stored in the imported datasource to an
@@ -101,8 +113,14 @@ class Field:
         """
         if self.attribute is None:
             return None
+        return self._get_attribute_value(instance, self.attribute.split("__"))
 
-        attrs = self.attribute.split("__")
+    @staticmethod
+    def _get_attribute_value(instance, attrs):
+        """
+        Follows the list of attribute names in ``attrs`` from ``instance`` and
+        returns the value.
+        """
         value = instance
 
         for attr in attrs:
@@ -130,17 +148,23 @@ class Field:
         be set to the value returned by :meth:`~import_export.fields.Field.clean`.
         """
         if not self.readonly:
-            attrs = self.attribute.split("__")
-            for attr in attrs[:-1]:
-                instance = getattr(instance, attr, None)
-            cleaned = self.clean(row, **kwargs)
-            if cleaned is not None or self.saves_null_values:
-                if not is_m2m:
-                    setattr(instance, attrs[-1], cleaned)
-                elif self.m2m_add:
-                    getattr(instance, attrs[-1]).add(*cleaned)
-                else:
-                    getattr(instance, attrs[-1]).set(cleaned)
+            self._save(instance, row, self.attribute.split("__"), is_m2m, **kwargs)
+
+    def _save(self, instance, row, attrs, is_m2m=False, **kwargs):
+        """
+        Sets the cleaned value on the instance by following the list of
+        attribute names in ``attrs``.
+        """
+        for attr in attrs[:-1]:
+            instance = getattr(instance, attr, None)
+        cleaned = self.clean(row, **kwargs)
+        if cleaned is not None or self.saves_null_values:
+            if not is_m2m:
+                setattr(instance, attrs[-1], cleaned)
+            elif self.m2m_add:
+                getattr(instance, attrs[-1]).add(*cleaned)
+            else:
+                getattr(instance, attrs[-1]).set(cleaned)
 
     def export(self, instance, **kwargs):
         """
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class FingerprintsConfig(AppConfig):
+    name = "import_export.fingerprints"
+    label = "import_export_fingerprints"
+    verbose_name = _("Import row fingerprints")
+    default_auto_field = "django.db.models.BigAutoField"
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="RowFingerprint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("resource", models.CharField(max_length=255, verbose_name="resource")),
+                (
+                    "import_id",
+                    models.CharField(max_length=255, verbose_name="import id"),
+                ),
+                ("digest", models.CharField(max_length=64, verbose_name="digest")),
+            ],
+            options={
+                "verbose_name": "row fingerprint",
+                "verbose_name_plural": "row fingerprints",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("resource", "import_id"),
+                        name="import_export_fingerprint_unique_row",
+                    )
+                ],
+            },
+        ),
+    ]
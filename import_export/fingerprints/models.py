@@ -0,0 +1,26 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class RowFingerprint(models.Model):
+    """
+    The digest of the last imported raw values of a row, keyed by resource and
+    import id.  See :class:`~import_export.fingerprints.stores.ModelFingerprintStore`.
+    """
+
+    resource = models.CharField(_("resource"), max_length=255)
+    import_id = models.CharField(_("import id"), max_length=255)
+    digest = models.CharField(_("digest"), max_length=64)
+
+    class Meta:
+        verbose_name = _("row fingerprint")
+        verbose_name_plural = _("row fingerprints")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["resource", "import_id"],
+                name="import_export_fingerprint_unique_row",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.resource} {self.import_id}"
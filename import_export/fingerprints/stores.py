@@ -0,0 +1,93 @@
+from django.db import connections
+
+from .models import RowFingerprint
+
+
+class BaseFingerprintStore:
+    """
+    Base abstract implementation of a row fingerprint store.
+
+    A fingerprint store records a digest of the raw values of each imported row,
+    keyed by import id, so that rows which are imported again unchanged can be
+    skipped.  See
+    :attr:`~import_export.options.ResourceOptions.fingerprint_store_class`.
+    """
+
+    def __init__(self, resource, using):
+        self.resource = resource
+        self.using = using
+
+    def get_fingerprints(self, import_ids):
+        """
+        Returns a ``dict`` of the stored digest of each of ``import_ids`` which is in
+        the store.
+        """
+        raise NotImplementedError
+
+    def set_fingerprints(self, fingerprints):
+        """
+        Stores ``fingerprints``, a ``dict`` which maps import ids to digests.
+        """
+        raise NotImplementedError
+
+    def invalidate(self):
+        """
+        Removes all fingerprints of the resource.
+        """
+        raise NotImplementedError
+
+
+class ModelFingerprintStore(BaseFingerprintStore):
+    """
+    Fingerprint store which saves fingerprints with the
+    :class:`~import_export.fingerprints.models.RowFingerprint` model.
+
+    Requires ``"import_export.fingerprints"`` in ``INSTALLED_APPS``.
+    """
+
+    #: The maximum number of import ids in each lookup query.
+    lookup_batch_size = 1000
+
+    def __init__(self, resource, using):
+        super().__init__(resource, using)
+        self.key = resource.get_fingerprint_key()
+
+    def get_queryset(self):
+        return RowFingerprint.objects.using(self.using).filter(resource=self.key)
+
+    def get_fingerprints(self, import_ids):
+        import_ids = list(import_ids)
+        fingerprints = {}
+        for i in range(0, len(import_ids), self.lookup_batch_size):
+            batch = import_ids[i : i + self.lookup_batch_size]
+            fingerprints.update(
+                self.get_queryset()
+                .filter(import_id__in=batch)
+                .values_list("import_id", "digest")
+            )
+        return fingerprints
+
+    def set_fingerprints(self, fingerprints):
+        max_length = RowFingerprint._meta.get_field("import_id").max_length
+        objs = [
+            RowFingerprint(resource=self.key, import_id=import_id, digest=digest)
+            for import_id, digest in fingerprints.items()
+            if len(import_id) <= max_length
+        ]
+        if not objs:
+            return
+        if connections[self.using].features.supports_update_conflicts_with_target:
+            RowFingerprint.objects.using(self.using).bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=["resource", "import_id"],
+                update_fields=["digest"],
+            )
+        else:
+            self.get_queryset().filter(
+                import_id__in=[obj.import_id for obj in objs]
+            ).delete()
+            RowFingerprint.objects.using(self.using).bulk_create(objs)
+
+    def invalidate(self):
+        self.get_queryset().delete()
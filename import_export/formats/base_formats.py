@@ -2,14 +2,19 @@
 # correct class for the file format.
 # e.g. add openpyxl imports to the XLSXFormat class
 # See issue 2004
+import csv
+import io
 import logging
 from functools import lru_cache
+from importlib.util import find_spec
 
 import tablib
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from tablib.formats import registry
 
+from ..columnar import ColumnarDataset
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,8 +68,17 @@ class Format:
         return False
 
 
+def _module_exists(name):
+    try:
+        return find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 class TablibFormat(Format):
     TABLIB_MODULE = None
+    #: Modules which must be installed for the format to be available.
+    REQUIRED_MODULES = ()
     CONTENT_TYPE = "application/octet-stream"
 
     def __init__(self, encoding=None):
@@ -74,18 +88,28 @@ class TablibFormat(Format):
         """
         Import and returns tablib module.
         """
-        if not self.TABLIB_MODULE:
+        return registry.get_format(self._get_format_key())
+
+    @classmethod
+    def _get_format_key(cls):
+        if not cls.TABLIB_MODULE:
             raise AttributeError("TABLIB_MODULE must be defined")
-        key = self.TABLIB_MODULE.split(".")[-1].replace("_", "")
-        return registry.get_format(key)
+        return cls.TABLIB_MODULE.split(".")[-1].replace("_", "")
 
     @classmethod
     def is_available(cls):
-        try:
-            cls().get_format()
-        except (tablib.core.UnsupportedFormat, ImportError):
+        """
+        Returns whether the tablib format module and the
+        :attr:`REQUIRED_MODULES` can be found.
+        The modules are looked up without being imported.  A format whose
+        module cannot be found is available if it is registered in tablib's
+        format registry.
+        """
+        key = cls._get_format_key()
+        # the registry holds the paths of the formats which are not loaded yet
+        if not _module_exists(cls.TABLIB_MODULE) and key not in registry._formats:
             return False
-        return True
+        return all(_module_exists(module) for module in cls.REQUIRED_MODULES)
 
     def get_title(self):
         return self.get_format().title
@@ -96,8 +120,18 @@ class TablibFormat(Format):
     def export_data(self, dataset, **kwargs):
         if getattr(settings, "IMPORT_EXPORT_ESCAPE_FORMULAE_ON_EXPORT", False) is True:
             self._escape_formulae(dataset)
+        if isinstance(dataset, ColumnarDataset):
+            return self.export_columnar_data(dataset, **kwargs)
         return dataset.export(self.get_title(), **kwargs)
 
+    def export_columnar_data(self, dataset, **kwargs):
+        """
+        Returns format representation for given
+        :class:`~import_export.columnar.ColumnarDataset`.
+        By default, it is converted to a ``tablib.Dataset`` to be exported.
+        """
+        return dataset.to_dataset().export(self.get_title(), **kwargs)
+
     def get_extension(self):
         return self.get_format().extensions[0]
 
@@ -114,6 +148,9 @@ class TablibFormat(Format):
         def _do_escape(s):
             return s.replace("=", "", 1) if s.startswith("=") else s
 
+        if isinstance(dataset, ColumnarDataset):
+            dataset.map_values(lambda cell: _do_escape(str(cell)))
+            return
         for r in dataset:
             row = dataset.lpop()
             row = [_do_escape(str(cell)) for cell in row]
@@ -133,10 +170,25 @@ class TextFormat(TablibFormat):
         return False
 
 
+def _export_delimited(dataset, default_delimiter, **kwargs):
+    # writes the rows of a ColumnarDataset as tablib's csv format does, without
+    # building a tablib.Dataset
+    stream = io.StringIO()
+    kwargs.setdefault("delimiter", default_delimiter)
+    writer = csv.writer(stream, **kwargs)
+    if dataset.headers:
+        writer.writerow(dataset.headers)
+    writer.writerows(dataset)
+    return stream.getvalue()
+
+
 class CSV(TextFormat):
     TABLIB_MODULE = "tablib.formats._csv"
     CONTENT_TYPE = "text/csv"
 
+    def export_columnar_data(self, dataset, **kwargs):
+        return _export_delimited(dataset, ",", **kwargs)
+
 
 class JSON(TextFormat):
     TABLIB_MODULE = "tablib.formats._json"
@@ -145,6 +197,7 @@ class JSON(TextFormat):
 
 class YAML(TextFormat):
     TABLIB_MODULE = "tablib.formats._yaml"
+    REQUIRED_MODULES = ("yaml",)
     # See https://stackoverflow.com/questions/332129/yaml-mime-type
     CONTENT_TYPE = "text/yaml"
 
@@ -153,9 +206,13 @@ class TSV(TextFormat):
     TABLIB_MODULE = "tablib.formats._tsv"
     CONTENT_TYPE = "text/tab-separated-values"
 
+    def export_columnar_data(self, dataset, **kwargs):
+        return _export_delimited(dataset, "\t", **kwargs)
+
 
 class ODS(TablibFormat):
     TABLIB_MODULE = "tablib.formats._ods"
+    REQUIRED_MODULES = ("odf",)
     CONTENT_TYPE = "application/vnd.oasis.opendocument.spreadsheet"
 
 
@@ -166,6 +223,7 @@ class HTML(TextFormat):
 
 class XLS(TablibFormat):
     TABLIB_MODULE = "tablib.formats._xls"
+    REQUIRED_MODULES = ("xlrd", "xlwt")
     CONTENT_TYPE = "application/vnd.ms-excel"
 
     def create_dataset(self, in_stream):
@@ -186,6 +244,7 @@ class XLS(TablibFormat):
 
 class XLSX(TablibFormat):
     TABLIB_MODULE = "tablib.formats._xlsx"
+    REQUIRED_MODULES = ("openpyxl",)
     CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
     def create_dataset(self, in_stream):
@@ -246,6 +305,9 @@ class XLSX(TablibFormat):
                 cell = ILLEGAL_CHARACTERS_RE.sub("\N{REPLACEMENT CHARACTER}", cell)
             return cell
 
+        if isinstance(dataset, ColumnarDataset):
+            dataset.map_values(_do_escape)
+            return
         for r in dataset:
             row = dataset.lpop()
             row = [_do_escape(cell) for cell in row]
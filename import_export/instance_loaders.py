@@ -1,3 +1,10 @@
+from .utils import (
+    get_lookup_fallback_queryset,
+    get_lookup_instance,
+    get_lookup_queryset,
+)
+
+
 class BaseInstanceLoader:
     """
     Base abstract implementation of instance loader.
@@ -28,7 +35,7 @@ class ModelInstanceLoader(BaseInstanceLoader):
                 field = self.resource.fields[key]
                 params[field.attribute] = field.clean(row)
             if params:
-                return self.get_queryset().get(**params)
+                return get_lookup_instance(self.get_queryset(), **params)
             else:
                 return None
         except self.resource._meta.model.DoesNotExist:
@@ -59,13 +66,20 @@ class CachedInstanceLoader(ModelInstanceLoader):
         self._duplicate_ids = set()
         if self.dataset.dict and self.pk_field.column_name in self.dataset.dict[0]:
             ids = [self.pk_field.clean(row) for row in self.dataset.dict]
-            qs = self.get_queryset().filter(**{"%s__in" % self.pk_field.attribute: ids})
+            self._add_instances(get_lookup_queryset(self.get_queryset()), ids)
+            fallback_queryset = get_lookup_fallback_queryset(self.get_queryset())
+            if fallback_queryset is not None:
+                missing_ids = [key for key in ids if key not in self.all_instances]
+                if missing_ids:
+                    self._add_instances(fallback_queryset, missing_ids)
 
-            for instance in qs:
-                key = self.pk_field.get_value(instance)
-                if key in self.all_instances:
-                    self._duplicate_ids.add(key)
-                self.all_instances[key] = instance
+    def _add_instances(self, queryset, ids):
+        qs = queryset.filter(**{"%s__in" % self.pk_field.attribute: ids})
+        for instance in qs:
+            key = self.pk_field.get_value(instance)
+            if key in self.all_instances:
+                self._duplicate_ids.add(key)
+            self.all_instances[key] = instance
 
     def get_instance(self, row):
         if self.all_instances:
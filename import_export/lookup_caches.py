@@ -0,0 +1,213 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.apps import apps
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save
+
+
+def _get_label(model):
+    # proxy models share the entries of their concrete model
+    return model._meta.concrete_model._meta.label
+
+
+def _get_query_models(queryset):
+    """
+    Returns the models of the tables read by ``queryset``: its model and the
+    models reached through the relations which it follows (e.g. by an
+    ``author__name`` lookup).
+    """
+    tables = {join.table_name for join in queryset.query.alias_map.values()}
+    tables.add(queryset.model._meta.db_table)
+    return [
+        model
+        for model in apps.get_models(include_auto_created=True)
+        if model._meta.db_table in tables
+    ]
+
+
+class LookupCache:
+    """
+    A process-wide cache of the instances of querysets, shared by the
+    :class:`~import_export.widgets.CachedForeignKeyWidget` instances which are
+    created with it, so that related tables are not reloaded by every import.
+
+    Entries are keyed by model, database and the SQL of the queryset, expire
+    after ``timeout`` seconds, and are evicted least recently used first once
+    there are more than ``maxsize`` entries.  The entries of a queryset are
+    invalidated when an instance of its model, or of a model reached through
+    the relations it follows (e.g. by an ``author__name`` lookup), sends
+    ``post_save`` or ``post_delete``.  Updates which do not send these signals
+    (such as ``QuerySet.update()``) are only seen once the entries expire.
+
+    Inside a transaction, the instances of a queryset are only cached once the
+    transaction is committed, and changes invalidate the entries again on
+    commit, so that rolled back data is not cached.
+
+    If ``cache_alias`` is set, the instances are stored in that cache of
+    Django's cache framework rather than in process memory, so that they are
+    shared between processes.  ``maxsize`` is then not used, and eviction is left
+    to the cache backend.
+
+    Cached instances are shared between imports and must not be modified.
+
+    :param maxsize: The maximum number of querysets cached in process memory.
+    :param timeout: The number of seconds after which an entry expires.
+    :param cache_alias: The alias of a cache from the ``CACHES`` setting.
+    """
+
+    def __init__(self, maxsize=128, timeout=300, cache_alias=None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self._lock = threading.Lock()
+        # key -> (expiry time, instances)
+        self._entries = OrderedDict()
+        # model label -> generation, changed when the model's entries are invalidated
+        self._generations = {}
+        self._connected_models = set()
+
+    def __copy__(self):
+        # a cache is shared by the widgets which use it
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def get_instances(self, queryset):
+        """
+        Returns a list of the instances of ``queryset``, evaluating it only if it
+        is not cached.
+        """
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return list(queryset)
+        models = _get_query_models(queryset)
+        labels = tuple(sorted({_get_label(model) for model in models}))
+        digest = hashlib.blake2b(
+            repr((queryset.db, sql, params)).encode(), digest_size=16
+        ).hexdigest()
+        for model in models:
+            self._connect(model)
+        if self.cache_alias is not None:
+            return self._get_shared_instances(queryset, labels, digest)
+
+        with self._lock:
+            generations = self._get_generations(labels)
+            key = (labels, generations, digest)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        instances = list(queryset)
+
+        def store():
+            with self._lock:
+                # not cached if a model was invalidated since the queryset was loaded
+                if self._get_generations(labels) == generations:
+                    self._entries[key] = (time.monotonic() + self.timeout, instances)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+
+        self._on_commit(store, queryset.db)
+        return instances
+
+    def _get_generations(self, labels):
+        return tuple(self._generations.get(label, 0) for label in labels)
+
+    def _on_commit(self, func, using):
+        # the changes of a transaction which is rolled back must not be cached
+        if connections[using].in_atomic_block:
+            transaction.on_commit(func, using=using)
+        else:
+            func()
+
+    def _get_generation_key(self, label):
+        return "import_export:lookup:%s" % label
+
+    def _get_shared_generations(self, cache, labels):
+        generations = []
+        for label in labels:
+            generation_key = self._get_generation_key(label)
+            generation = cache.get(generation_key)
+            if generation is None:
+                cache.add(generation_key, uuid.uuid4().hex, None)
+                generation = cache.get(generation_key)
+            generations.append(generation)
+        return generations
+
+    def _get_shared_instances(self, queryset, labels, digest):
+        cache = caches[self.cache_alias]
+        generations = self._get_shared_generations(cache, labels)
+        key = "import_export:lookup:%s:%s" % (
+            hashlib.blake2b(
+                repr((labels, generations)).encode(), digest_size=16
+            ).hexdigest(),
+            digest,
+        )
+        instances = cache.get(key)
+        if instances is None:
+            instances = list(queryset)
+
+            def store():
+                if self._get_shared_generations(cache, labels) == generations:
+                    cache.set(key, instances, self.timeout)
+
+            self._on_commit(store, queryset.db)
+        return instances
+
+    def _connect(self, model):
+        if model in self._connected_models:
+            return
+        with self._lock:
+            if model in self._connected_models:
+                return
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    self._on_change,
+                    sender=model,
+                    weak=False,
+                    dispatch_uid=("import_export_lookup_cache", id(self)),
+                )
+            self._connected_models.add(model)
+
+    def _on_change(self, sender, using=None, **kwargs):
+        self.invalidate(sender)
+        if using is not None and connections[using].in_atomic_block:
+            # entries may be filled with the data from before the change by other
+            # connections until it is committed
+            transaction.on_commit(lambda: self.invalidate(sender), using=using)
+
+    def invalidate(self, model):
+        """
+        Removes the cached instances of the querysets which read ``model``.
+        """
+        label = _get_label(model)
+        if self.cache_alias is not None:
+            caches[self.cache_alias].set(
+                self._get_generation_key(label), uuid.uuid4().hex, None
+            )
+        with self._lock:
+            self._generations[label] = self._generations.get(label, 0) + 1
+            for key in [key for key in self._entries if label in key[0]]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Removes all of the cached instances held in process memory.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+#: The lookup cache shared by the whole process.
+default_lookup_cache = LookupCache()
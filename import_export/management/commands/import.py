@@ -35,6 +35,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Raise errors if encountered during execution.",
         )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="""Skip the rows committed by an interrupted import of the same
+            data (requires a resource with a checkpoint store).""",
+        )
         parser.add_argument(
             "-n",
             "--dry-run",
@@ -58,6 +64,7 @@ class Command(BaseCommand):
         interactive = options["interactive"]
         dry_run = options.get("dry_run")
         raise_errors = options.get("raise_errors")
+        resume = options.get("resume")
         file_name = options.get("import_file_name")
         model_or_resource_class = options.get("resource")
         format_name = options.get("format")
@@ -69,6 +76,10 @@ class Command(BaseCommand):
                 raise CommandError("Import cancelled.")
 
         resource = get_resource_class(model_or_resource_class)()
+        if resume and resource.get_checkpoint_store() is None:
+            raise CommandError(
+                "--resume requires a resource with a checkpoint_store_class."
+            )
         format_class = get_format_class(format_name, file_name, encoding)
         if file_name == "-":
             if format_class.is_binary():
@@ -82,7 +93,7 @@ class Command(BaseCommand):
         dataset = format_class.create_dataset(data)
 
         result = resource.import_data(
-            dataset, dry_run=dry_run, raise_errors=raise_errors
+            dataset, dry_run=dry_run, raise_errors=raise_errors, resume=resume
         )
 
         if dry_run:
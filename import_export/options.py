@@ -75,11 +75,101 @@ class ResourceOptions:
 
     For the default ``skip_unchanged`` logic to work, the
     :attr:`~import_export.resources.ResourceOptions.skip_diff` must also be ``False``
-    (which is the default):
+    (which is the default), unless
+    :attr:`~import_export.options.ResourceOptions.skip_unchanged_hash` is enabled.
 
     Default value is ``False``.
     """
 
+    skip_unchanged_hash = False
+    """
+    If ``True`` (and ``skip_unchanged`` is enabled), unchanged rows are detected by
+    comparing a digest of the rendered values of the import fields before and
+    after the row is imported, as returned by
+    :meth:`~import_export.resources.Resource.get_instance_digest`.  No copy of the
+    instance is needed, so this works when ``skip_diff`` is ``True``.
+
+    Values are compared as rendered by each field's widget, so differences which
+    are not rendered (for example, beyond the precision of a date format) are
+    not detected.
+
+    Default value is ``False``.
+    """
+
+    fingerprint_store_class = None
+    """
+    A :class:`~import_export.fingerprints.stores.BaseFingerprintStore` subclass
+    which records a digest of the raw values of each imported row, keyed by its
+    ``import_id_fields`` values (see
+    :meth:`~import_export.resources.Resource.get_row_fingerprint`).  A row whose
+    digest matches the stored digest is recorded as skipped before its values are
+    cleaned or any instance is loaded, and
+    :meth:`~import_export.resources.Resource.before_import_row` and
+    :meth:`~import_export.resources.Resource.after_import_row` are not called for it.
+
+    The store is updated after each batch of rows is saved, and is not updated
+    by a dry run or once an import error has been reported.  Use
+    :meth:`~import_export.resources.Resource.invalidate_fingerprints` to import
+    every row again.
+
+    Default value is ``None`` (no fingerprint store).
+    """
+
+    duplicate_import_ids = None
+    """
+    Controls how rows whose ``import_id_fields`` values are repeated in the
+    dataset are imported.  The raw values of the import id columns are compared
+    before any row is imported, and rows whose import id columns are missing or
+    empty are never duplicates.
+
+    - ``None``: every row is imported in turn, so later rows update the
+      instance imported by earlier ones.
+    - ``"first"``: only the first of the rows is imported.
+    - ``"last"``: only the last of the rows is imported.
+    - ``"error"``: none of the rows is imported, and each is reported as invalid.
+
+    Rows which are not imported are listed in
+    :attr:`~import_export.results.Result.duplicate_rows`, and are reported as
+    skipped unless they are invalid.
+    :meth:`~import_export.resources.Resource.before_import_row` and
+    :meth:`~import_export.resources.Resource.after_import_row` are not called
+    for them.  This avoids saving an instance several times when ``use_bulk``
+    is enabled, where a repeated import id would otherwise be created (or
+    updated) once per row.
+
+    Default value is ``None``.
+    """
+
+    checkpoint_store_class = None
+    """
+    A :class:`~import_export.checkpoints.stores.BaseCheckpointStore` subclass
+    which records the progress of each import, keyed by a digest of the dataset
+    (see :meth:`~import_export.resources.Resource.get_dataset_fingerprint`).
+
+    If set, the rows of an import which is not a dry run are committed in
+    chunks of :attr:`checkpoint_batch_size` rows, each in its own transaction
+    with the number of its last row and the totals so far.  If an error is
+    reported (or a validation error, with ``rollback_on_validation_errors``),
+    the rows since the last checkpoint are rolled back and the import stops.
+    An import of the same dataset with ``resume=True`` (or the ``--resume``
+    option of the ``import`` management command) skips the committed rows.
+    The checkpoint is removed once every row is committed.
+
+    This parameter requires transactions, and
+    :meth:`~import_export.resources.Resource.before_import` and
+    :meth:`~import_export.resources.Resource.after_import` are called in
+    transactions of their own.
+
+    Default value is ``None`` (the rows are committed together).
+    """
+
+    checkpoint_batch_size = None
+    """
+    The number of rows committed in each transaction when
+    :attr:`checkpoint_store_class` is set.  Default value is ``None``, which
+    uses :attr:`batch_size`.  One of them must be a positive integer.
+    """
+
     report_skipped = True
     """
     Controls if the result reports skipped rows. Default value is ``True``.
@@ -94,10 +184,36 @@ class ResourceOptions:
     The default value is ``False``.
     """  # noqa: E501
 
+    validate_unique_in_batches = False
+    """
+    If ``True`` (and :attr:`clean_model_instances` is enabled), the unique
+    fields and unique constraints of the instances are validated by a
+    :class:`~import_export.unique_validators.BatchUniqueValidator`, with one
+    query per unique check for each batch of :attr:`batch_size` rows (or for
+    the whole dataset if it is ``None``) rather than for each row, and
+    duplicates within the dataset are reported as
+    validation errors.  The default value is ``False``.
+    """
+
     chunk_size = None
     """
-    Controls the chunk_size argument of Queryset.iterator or,
-    if prefetch_related is used, the per_page attribute of Paginator.
+    Controls the chunk_size argument of Queryset.iterator, which is also the
+    number of instances for which ``prefetch_related()`` lookups are fetched
+    at once.
+    """
+
+    optimize_export_queryset = True
+    """
+    Controls whether the export queryset is automatically optimized for the
+    exported fields.  If ``True``, the resource inspects the attribute paths and
+    widgets of each export field, and applies ``select_related()`` for foreign key
+    and one-to-one relations, and ``prefetch_related()`` for many-to-many
+    relations.  This avoids a database query per row for each related field.
+
+    Fields which are rendered by a ``dehydrate`` method are not inspected.
+    Set this value to ``False`` to export the queryset unaltered.
+
+    The default value is ``True``.
     """
 
     skip_diff = False
@@ -155,6 +271,42 @@ class ResourceOptions:
     This parameter is only used if ``use_bulk`` is ``True``.
     """
 
+    savepoint_batch_size = None
+    """
+    If set, and transactions are used but ``use_bulk`` is not enabled, this
+    number of rows is imported under a single savepoint rather than one
+    savepoint per row, saving the ``SAVEPOINT`` and ``RELEASE`` queries of the
+    other rows.
+
+    If a row of the group has an error, the savepoint is rolled back and each
+    row of the group is imported again under its own savepoint, so that only
+    the rows with errors are rolled back.  The rows of such a group are
+    therefore imported twice, and the hooks of the resource (such as
+    :meth:`~import_export.resources.Resource.before_import_row`) are called
+    twice for them.
+
+    With :attr:`checkpoint_store_class`, a group ends at the last row of its
+    checkpoint chunk, so that its rows are committed together.
+
+    Default value is ``None`` (one savepoint per row).
+    """
+
+    bulk_writer_classes = None
+    """
+    A dict which maps a database vendor (``connection.vendor``, such as
+    ``"postgresql"`` or ``"sqlite"``) to the
+    :class:`~import_export.bulk_writers.BaseBulkWriter` subclass which saves new
+    instances when ``use_bulk`` is enabled. The vendor is that of the connection
+    returned by
+    :meth:`~import_export.resources.Resource.get_db_connection_name`.
+    Vendors which are not in the dict use
+    :class:`~import_export.bulk_writers.ORMBulkWriter`, which calls
+    ``bulk_create()``.
+
+    Set to :data:`~import_export.bulk_writers.VENDOR_BULK_WRITER_CLASSES` to
+    use ``COPY FROM STDIN`` on PostgreSQL and ``executemany()`` on SQLite.
+    """
+
     force_init_instance = False
     """
     If ``True``, this parameter will prevent imports from checking the database for
@@ -163,6 +315,23 @@ class ResourceOptions:
     guaranteed to contain new instances.
     """
 
+    use_upsert = False
+    """
+    If ``True``, existing instances are not loaded during import. Each batch of
+    instances is saved with a single call to ``bulk_create()`` with
+    ``update_conflicts=True``: a row whose ``import_id_fields`` match an existing
+    object updates it, and any other row creates a new object.
+
+    This parameter requires ``use_bulk``, a database which supports
+    ``update_conflicts`` and a unique constraint on the ``import_id_fields``.
+    Rows cannot be deleted or skipped as unchanged, and many-to-many fields are
+    not saved.
+
+    Rows are reported as new or updated when a single import id field is used.
+    Otherwise every row is reported as new, and
+    :attr:`~import_export.results.Result.totals_approximate` is set.
+    """
+
     using_db = None
     """
     DB Connection name to use for db transactions. If not provided,
@@ -170,6 +339,29 @@ class ResourceOptions:
     ``DEFAULT_DB_ALIAS`` constant ("default") is used.
     """
 
+    using_read_db = None
+    """
+    DB Connection name of a database (such as a read replica) which exports
+    read from.  Imports keep reading and writing the database of
+    :attr:`using_db`, unless :attr:`dry_run_uses_read_db` is enabled.
+    If not provided, reads are routed by the database routers.
+    """
+
+    dry_run_uses_read_db = False
+    """
+    If ``True`` (and :attr:`using_read_db` is set), the instance loader and the
+    relation widgets look up instances in :attr:`using_read_db` during a dry
+    run.  Default value is ``False``.
+    """
+
+    read_db_fallback = True
+    """
+    If ``True``, instances which the instance loader and the relation widgets
+    do not find in :attr:`using_read_db` during a dry run are looked up in the
+    database of :attr:`using_db`, so that rows which have not reached a read
+    replica yet are found.  Default value is ``True``.
+    """
+
     store_row_values = False
     """
     If True, each row's raw data will be stored in each
@@ -189,6 +381,22 @@ class ResourceOptions:
     This is so that appropriate ``LogEntry`` instances can be created.
     """
 
+    use_columnar_export = False
+    """
+    If ``True``, :meth:`~import_export.resources.Resource.export` returns a
+    :class:`~import_export.columnar.ColumnarDataset` rather than a
+    ``tablib.Dataset``.  It stores the exported values column by column, and
+    stores repeated values once per column, which reduces the memory used by
+    exports which are held in memory.  The CSV and TSV formats are written from
+    it directly, and the other formats convert it to a ``tablib.Dataset`` when
+    exporting.
+
+    Overrides of :meth:`~import_export.resources.Resource.after_export` receive
+    the ``ColumnarDataset``, which supports appending rows but not the other
+    ``tablib.Dataset`` methods which modify a dataset.
+    Default value is ``False``.
+    """
+
     use_natural_foreign_keys = False
     """
     If ``True``, this value will be passed to all foreign
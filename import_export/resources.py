@@ -1,36 +1,62 @@
 import functools
+import hashlib
+import itertools
 import logging
+import sys
 import types
 from collections import OrderedDict
-from copy import deepcopy
+from collections.abc import Mapping, MutableMapping
+from copy import copy, deepcopy
 from html import escape
 from warnings import warn
 
 import tablib
-from diff_match_patch import diff_match_patch
 from django.conf import settings
-from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.exceptions import (
+    NON_FIELD_ERRORS,
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    ValidationError,
+)
 from django.core.management.color import no_style
-from django.core.paginator import Paginator
-from django.db import connections, router
+from django.db import connections, router, transaction
 from django.db.models import fields
 from django.db.models.fields.related import ForeignKey
+from django.db.models.fields.related_descriptors import ForeignKeyDeferredAttribute
 from django.db.models.query import QuerySet
+from django.db.models.query_utils import DeferredAttribute
 from django.db.transaction import TransactionManagementError, set_rollback
 from django.utils.encoding import force_str
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 
 from . import exceptions, widgets
+from .bulk_writers import ORMBulkWriter
+from .columnar import ColumnarDataset
 from .declarative import DeclarativeMetaclass, ModelDeclarativeMetaclass
 from .fields import Field
+from .instance_loaders import BaseInstanceLoader
 from .results import Error, Result, RowResult
-from .utils import atomic_if_using_transaction, get_related_model
+from .unique_validators import BatchUniqueValidator
+from .utils import (
+    atomic_if_using_transaction,
+    get_lookup_dbs,
+    get_lookup_queryset,
+    get_related_model,
+    using_lookup_db,
+)
 
 logger = logging.getLogger(__name__)
 # Set default logging handler to avoid "No handler found" warnings.
 logger.addHandler(logging.NullHandler())
 
+# The default Field implementations. Fields which use these can be imported and
+# exported with precompiled attribute paths (see _ImportPlan and
+# Resource._get_export_plan()).
+_field_get_value = Field.get_value
+_field_export = Field.export
+_field_save = Field.save
+
 
 def has_natural_foreign_key(model):
     """
@@ -51,6 +77,9 @@ class Diff:
         self.right = Diff._read_field_values(resource, instance)
 
     def as_html(self):
+        # diff_match_patch is only needed to render diffs
+        from diff_match_patch import diff_match_patch
+
         data = []
         dmp = diff_match_patch()
         for v1, v2 in zip(self.left, self.right):
@@ -67,8 +96,261 @@ class Diff:
     def _read_field_values(cls, resource, instance):
         return [
             f.export(instance, sort_json_keys=True)
-            for f in resource.get_import_fields()
+            for f in resource._get_import_plan().import_fields
+        ]
+
+
+@functools.cache
+def _get_array_field_class():
+    """
+    Returns the Postgres ``ArrayField`` class, or ``None`` if it cannot be
+    imported. The import is attempted once per process.
+    """
+    try:
+        from django.contrib.postgres.fields import ArrayField
+    except ImportError:
+        # ImportError: No module named psycopg2.extras
+        return None
+    return ArrayField
+
+
+class _FieldMap(MutableMapping):
+    """
+    The fields of a resource instance.
+
+    The class-level fields are shared until they are accessed through the
+    instance, at which point the field is copied (see ``Field.__copy__()``) so
+    that changes made by the instance never leak into the resource class or
+    into other instances.  Adding, replacing or removing fields only affects
+    the instance.
+
+    Supports the methods of ``OrderedDict`` which are not provided by
+    ``MutableMapping`` (such as ``copy()``, ``|`` and ``move_to_end()``).
+    """
+
+    def __init__(self, fields):
+        self._fields = OrderedDict(fields)
+        self._copied = set()
+
+    def __getitem__(self, key):
+        field = self._fields[key]
+        if key not in self._copied:
+            field = self._fields[key] = copy(field)
+            self._copied.add(key)
+        return field
+
+    def __setitem__(self, key, field):
+        self._fields[key] = field
+        self._copied.add(key)
+
+    def __delitem__(self, key):
+        del self._fields[key]
+        self._copied.discard(key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        return repr(OrderedDict(self.items()))
+
+    def __reversed__(self):
+        return reversed(self._fields)
+
+    def __or__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.copy() | other
+
+    def __ror__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return OrderedDict(other) | self.copy()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def copy(self):
+        """
+        Returns an ``OrderedDict`` of the fields, as a shallow copy of the
+        fields of a resource instance.
+        """
+        return OrderedDict(self.items())
+
+    def move_to_end(self, key, last=True):
+        self._fields.move_to_end(key, last=last)
+
+    def popitem(self, last=True):
+        if not self._fields:
+            raise KeyError("dictionary is empty")
+        key = next(reversed(self._fields) if last else iter(self._fields))
+        return key, self.pop(key)
+
+
+class _ImportPlan:
+    """
+    The import fields of a resource, resolved once per import so that each row
+    does not repeat the field lookups.
+
+    ``fields`` and ``m2m_fields`` are lists of ``(field, attrs)`` tuples, where
+    ``attrs`` is the field's split attribute path, or an empty tuple if the
+    field is never saved (it has no attribute, or is readonly).  ``attrs`` is
+    ``None`` if the resource's ``import_field()`` or the field's ``save()``
+    method is overridden, in which case the field is imported by calling
+    ``import_field()``.
+    """
+
+    def __init__(self, resource):
+        self.import_fields = resource.get_import_fields()
+        self.is_m2m = [
+            isinstance(field.widget, widgets.ManyToManyWidget)
+            for field in self.import_fields
         ]
+        self.fields = []
+        self.m2m_fields = []
+        self._skipped_fields = set()
+        uses_default_import_field = (
+            getattr(resource.import_field, "__func__", None) is Resource.import_field
+        )
+        for field, is_m2m in zip(self.import_fields, self.is_m2m):
+            attrs = None
+            if uses_default_import_field and type(field).save is _field_save:
+                if field.attribute and not field.readonly:
+                    attrs = tuple(field.attribute.split("__"))
+                else:
+                    attrs = ()
+            (self.m2m_fields if is_m2m else self.fields).append((field, attrs))
+
+    def log_skipped_field(self, field, row):
+        """
+        Logs why a field is not imported, once per import rather than per row.
+        """
+        if field in self._skipped_fields:
+            return
+        self._skipped_fields.add(field)
+        if not field.attribute:
+            logger.debug(f"skipping field '{field}' - field attribute is not defined")
+        elif field.column_name not in row:
+            logger.debug(
+                f"skipping field '{field}' "
+                f"- column name '{field.column_name}' is not present in row"
+            )
+
+
+class _NaturalKeyRenderer:
+    """
+    Renders a foreign key field of an export by the natural key of the related
+    instance.  :meth:`prepare` resolves the natural keys of the distinct related
+    ids of a chunk of instances with a single query, and the rendered natural
+    keys are memoised by id, so that each row renders from a dict lookup.
+    """
+
+    def __init__(self, field, relation, select_related, kwargs):
+        self.field = field
+        self.relation = relation
+        self.select_related = select_related
+        self.kwargs = kwargs
+        self.rendered = {}
+
+    def prepare(self, instances):
+        attname = self.relation.attname
+        target_field = self.relation.target_field
+        ids = {getattr(instance, attname) for instance in instances}
+        ids.difference_update(self.rendered)
+        ids.discard(None)
+        if not ids:
+            return
+        queryset = get_lookup_queryset(
+            self.field.widget.model.objects.select_related(*self.select_related)
+        ).filter(**{"%s__in" % target_field.name: ids})
+        for related in queryset:
+            self.rendered[getattr(related, target_field.attname)] = (
+                self.field.widget.render(related, **self.kwargs)
+            )
+
+    def __call__(self, instance):
+        try:
+            return self.rendered[getattr(instance, self.relation.attname)]
+        except KeyError:
+            # not prepared, or not visible to the related model's manager
+            return self.field.export(instance, **self.kwargs)
+
+
+class _CheckpointedImport:
+    """
+    Commits the rows of an import in chunks, each in its own transaction with
+    the checkpoint of its last row (see ``checkpoint_store_class``), so that an
+    interrupted import can be resumed after its last committed chunk.
+    """
+
+    def __init__(self, store, using, size, resume, rollback_on_validation_errors):
+        self.store = store
+        self.using = using
+        self.size = size
+        self.resume = resume
+        self.rollback_on_validation_errors = rollback_on_validation_errors
+        self.digest = None
+        # the number of the last committed row
+        self.row_number = 0
+        self._atomic = None
+
+    def begin(self, digest, result):
+        self.digest = digest
+        checkpoint = self.store.get_checkpoint(digest) if self.resume else None
+        if checkpoint is not None:
+            self.row_number, totals = checkpoint
+            result.totals.update(totals)
+        self._enter()
+
+    def commit(self, row_number, result):
+        """
+        Commits the rows up to ``row_number``, or rolls back the rows since the
+        last checkpoint if an error has been reported.  Returns ``False`` if the
+        rows were rolled back, and the import must stop.
+        """
+        if self._has_errors(result):
+            self._exit(rollback=True)
+            return False
+        self.store.set_checkpoint(self.digest, row_number, result.totals)
+        self._exit(rollback=False)
+        self.row_number = row_number
+        self._enter()
+        return True
+
+    def finish(self, result):
+        if self._atomic is None:
+            # stopped by commit()
+            return
+        if self._has_errors(result):
+            self._exit(rollback=True)
+        else:
+            self.store.delete_checkpoint(self.digest)
+            self._exit(rollback=False)
+
+    def abort(self, exc_info):
+        if self._atomic is not None:
+            self._exit(rollback=True, exc_info=exc_info)
+
+    def _has_errors(self, result):
+        return result.has_errors() or (
+            self.rollback_on_validation_errors and result.has_validation_errors()
+        )
+
+    def _enter(self):
+        self._atomic = transaction.atomic(using=self.using)
+        self._atomic.__enter__()
+
+    def _exit(self, rollback, exc_info=(None, None, None)):
+        atomic, self._atomic = self._atomic, None
+        if rollback:
+            set_rollback(True, using=self.using)
+        atomic.__exit__(*exc_info)
 
 
 class Resource(metaclass=DeclarativeMetaclass):
@@ -89,10 +371,11 @@ class Resource(metaclass=DeclarativeMetaclass):
         """
         # The fields class attribute is the *class-wide* definition of
         # fields. Because a particular *instance* of the class might want to
-        # alter self.fields, we create self.fields here by copying cls.fields.
-        # Instances should always modify self.fields; they should not modify
-        # cls.fields.
-        self.fields = deepcopy(self.fields)
+        # alter self.fields, we create self.fields here as a copy-on-write view
+        # of cls.fields: each field is copied the first time it is accessed
+        # through the instance. Instances should always modify self.fields;
+        # they should not modify cls.fields.
+        self.fields = _FieldMap(self.fields)
 
         # lists to hold model instances in memory when bulk operations are enabled
         self.create_instances = []
@@ -103,6 +386,24 @@ class Resource(metaclass=DeclarativeMetaclass):
         # (see ModelResource.after_import())
         self._pk_supplied_on_create = False
 
+        # the import plan of the import in progress (see import_data_inner())
+        self._import_plan = None
+
+        # the unique validator of the import in progress, when
+        # validate_unique_in_batches is enabled (see validate_instance())
+        self._unique_validator = None
+
+        # the checkpoints of the import in progress, when checkpoint_store_class
+        # is set (see import_data())
+        self._checkpoint = None
+
+        # the results of the rows in create_instances when use_upsert is enabled
+        self._upsert_row_results = []
+
+        # the digest of the row being imported before its values were imported,
+        # when skip_unchanged_hash is enabled (see skip_row())
+        self._original_digest = None
+
     @classmethod
     def get_result_class(self):
         """
@@ -138,6 +439,134 @@ class Resource(metaclass=DeclarativeMetaclass):
         else:
             return self._meta.using_db
 
+    @classmethod
+    def get_read_db_connection_name(self):
+        """
+        Returns the alias of the database which exports read from, or ``None``
+        if :attr:`~import_export.options.ResourceOptions.using_read_db` is not
+        set and reads are routed by the database routers.
+        """
+        return self._meta.using_read_db
+
+    def get_lookup_db_connection_name(self, dry_run=False):
+        """
+        Returns the alias of the database in which the instance loader and the
+        relation widgets look up instances during an import, or ``None`` if
+        :attr:`~import_export.options.ResourceOptions.using_read_db` is not set
+        and lookups are routed by the database routers.
+
+        Lookups use the database returned by :meth:`get_db_connection_name`,
+        unless ``dry_run`` is set and
+        :attr:`~import_export.options.ResourceOptions.dry_run_uses_read_db` is
+        enabled.
+        """
+        read_db = self.get_read_db_connection_name()
+        if read_db is None:
+            return None
+        if dry_run and self._meta.dry_run_uses_read_db:
+            return read_db
+        return self.get_db_connection_name()
+
+    def _get_lookup_dbs(self, dry_run):
+        # the lookup database and the database of the instances missing from it
+        using = self.get_lookup_db_connection_name(dry_run)
+        fallback = self.get_db_connection_name()
+        if using is None or using == fallback or not self._meta.read_db_fallback:
+            fallback = None
+        return using, fallback
+
+    def get_bulk_writer(self):
+        """
+        Returns the bulk writer used by :meth:`bulk_create`, chosen by the vendor
+        of the connection returned by :meth:`get_db_connection_name`.
+        """
+        using = self.get_db_connection_name()
+        writer_classes = self._meta.bulk_writer_classes or {}
+        writer_class = writer_classes.get(connections[using].vendor, ORMBulkWriter)
+        return writer_class(self, using)
+
+    def get_fingerprint_store(self):
+        """
+        Returns the fingerprint store of the resource, or ``None`` if
+        ``fingerprint_store_class`` is not set.
+        """
+        if self._meta.fingerprint_store_class is None:
+            return None
+        return self._meta.fingerprint_store_class(self, self.get_db_connection_name())
+
+    def get_fingerprint_key(self):
+        """
+        Returns the key which identifies the resource in the fingerprint store.
+        Defaults to the dotted path of the resource class.
+        """
+        return "%s.%s" % (type(self).__module__, type(self).__qualname__)
+
+    def get_checkpoint_store(self):
+        """
+        Returns the checkpoint store of the resource, or ``None`` if
+        ``checkpoint_store_class`` is not set.
+        """
+        if self._meta.checkpoint_store_class is None:
+            return None
+        return self._meta.checkpoint_store_class(self, self.get_db_connection_name())
+
+    def get_checkpoint_key(self):
+        """
+        Returns the key which identifies the resource in the checkpoint store.
+        Defaults to the dotted path of the resource class.
+        """
+        return "%s.%s" % (type(self).__module__, type(self).__qualname__)
+
+    def get_dataset_fingerprint(self, dataset):
+        """
+        Returns a digest of the headers and the raw values of ``dataset``, which
+        identifies the dataset in the checkpoint store.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(dataset.headers).encode())
+        for data_row in dataset:
+            digest.update(repr(tuple(data_row)).encode())
+        return digest.hexdigest()
+
+    def get_row_fingerprint(self, row):
+        """
+        Returns an ``(import_id, digest)`` tuple for ``row``, where ``import_id``
+        is built from the raw values of the ``import_id_fields`` columns and
+        ``digest`` is a digest of all of the raw values of the row.
+
+        Returns ``(None, None)`` if an import id field is not a field of the
+        resource, or if an import id column is missing or empty.
+        """
+        import_id = self._get_row_import_id(row)
+        if import_id is None:
+            return None, None
+        digest = hashlib.blake2b(digest_size=16)
+        for item in row.items():
+            digest.update(repr(item).encode())
+        return import_id, digest.hexdigest()
+
+    def _get_row_import_id(self, row):
+        # the raw values of the import id columns, or None if one is missing
+        import_id = []
+        for field_name in self.get_import_id_fields():
+            if field_name not in self.fields:
+                # reported by _check_import_id_fields() unless it is the default
+                return None
+            value = row.get(self.fields[field_name].column_name)
+            if value is None or value == "":
+                return None
+            import_id.append(str(value))
+        return "\x1f".join(import_id)
+
+    def invalidate_fingerprints(self):
+        """
+        Removes the fingerprints of the resource from the fingerprint store, so
+        that every row is imported by the next import.
+        """
+        store = self.get_fingerprint_store()
+        if store is not None:
+            store.invalidate()
+
     def get_use_transactions(self):
         if self._meta.use_transactions is None:
             return getattr(settings, "IMPORT_EXPORT_USE_TRANSACTIONS", True)
@@ -185,9 +614,13 @@ class Resource(metaclass=DeclarativeMetaclass):
         """
         Either fetches an already existing instance or initializes a new one.
         """
-        if not self._meta.force_init_instance:
+        if not self._meta.force_init_instance and not self._meta.use_upsert:
             instance = self.get_instance(instance_loader, row)
             if instance:
+                if get_lookup_dbs()[0] is not None:
+                    # saved to the database of the import, not the one it was
+                    # looked up in
+                    instance._state.db = self.get_db_connection_name()
                 return instance, False
         return self.init_instance(row), True
 
@@ -213,11 +646,12 @@ class Resource(metaclass=DeclarativeMetaclass):
         self, using_transactions, dry_run, raise_errors, batch_size=None, result=None
     ):
         """
-        Creates objects by calling ``bulk_create``.
+        Creates objects with the bulk writer returned by
+        :meth:`get_bulk_writer`.
         """
         if len(self.create_instances) > 0 and (using_transactions or not dry_run):
             try:
-                self._meta.model.objects.bulk_create(
+                self.get_bulk_writer().write(
                     self.create_instances, batch_size=batch_size
                 )
             except Exception as e:
@@ -225,6 +659,127 @@ class Resource(metaclass=DeclarativeMetaclass):
             finally:
                 self.create_instances.clear()
 
+    def bulk_upsert(
+        self,
+        using_transactions,
+        dry_run,
+        raise_errors,
+        batch_size=None,
+        result=None,
+        headers=None,
+    ):
+        """
+        Creates or updates objects by calling ``bulk_create`` with
+        ``update_conflicts=True``. Used instead of :meth:`bulk_create` when
+        ``use_upsert`` is enabled.
+
+        :param headers: The headers of the imported dataset.
+          If set, only the fields of these columns are updated.
+        """
+        row_results, self._upsert_row_results = self._upsert_row_results, []
+        if len(self.create_instances) > 0:
+            try:
+                self._classify_upserted_rows(row_results, result)
+                if using_transactions or not dry_run:
+                    self._meta.model.objects.bulk_create(
+                        self.create_instances,
+                        batch_size=batch_size,
+                        **self.get_bulk_upsert_options(headers),
+                    )
+            except Exception as e:
+                self.handle_import_error(result, e, raise_errors)
+            finally:
+                self.create_instances.clear()
+
+    def get_bulk_upsert_options(self, headers=None):
+        """
+        Returns the conflict handling options passed to ``bulk_create()`` when
+        ``use_upsert`` is enabled.
+        The fields returned by :meth:`get_bulk_update_fields` which are concrete
+        model fields are updated on conflict, except for fields whose column is
+        not in ``headers`` (so that values missing from the dataset are not
+        overwritten with defaults).
+        """
+        model_opts = self._meta.model._meta
+        unique_fields = [self.fields[f].attribute for f in self.get_import_id_fields()]
+        bulk_update_fields = self.get_bulk_update_fields()
+        if headers is not None:
+            imported_attributes = {
+                field.attribute
+                for field in self.fields.values()
+                if field.column_name in headers
+            }
+            bulk_update_fields = [
+                attribute
+                for attribute in bulk_update_fields
+                if attribute in imported_attributes
+            ]
+        update_fields = []
+        for attribute in bulk_update_fields:
+            try:
+                model_field = model_opts.get_field(attribute)
+            except FieldDoesNotExist:
+                continue
+            if (
+                model_field.concrete
+                and not model_field.many_to_many
+                and not model_field.primary_key
+                and attribute not in unique_fields
+            ):
+                update_fields.append(attribute)
+
+        if not update_fields:
+            # there is nothing to update, so existing rows are left as they are
+            return {"ignore_conflicts": True}
+        options = {"update_conflicts": True, "update_fields": update_fields}
+        connection = connections[self.get_db_connection_name()]
+        if connection.features.supports_update_conflicts_with_target:
+            options["unique_fields"] = unique_fields
+        return options
+
+    def _classify_upserted_rows(self, row_results, result):
+        """
+        Reports the rows in ``row_results`` which update an existing object as
+        updated. Upserted rows are reported as new until the batch is saved, and
+        are left as new (with approximate totals) if the existing objects cannot
+        be identified by a single import id field.
+        """
+        key_field = None
+        import_id_fields = self.get_import_id_fields()
+        if len(import_id_fields) == 1 and len(row_results) == len(
+            self.create_instances
+        ):
+            attribute = self.fields[import_id_fields[0]].attribute
+            try:
+                key_field = self._meta.model._meta.get_field(attribute)
+            except FieldDoesNotExist:
+                pass
+        if key_field is None or not key_field.concrete or key_field.many_to_many:
+            if result is not None:
+                result.totals_approximate = True
+            return
+
+        # the column value (e.g. the pk of a foreign key's related object)
+        attname = key_field.attname
+        keys = [
+            key_field.to_python(getattr(instance, attname))
+            for instance in self.create_instances
+        ]
+        lookup_keys = list({key for key in keys if key is not None})
+        existing = set()
+        for i in range(0, len(lookup_keys), 1000):
+            existing.update(
+                self._meta.model.objects.filter(
+                    **{f"{attname}__in": lookup_keys[i : i + 1000]}
+                ).values_list(attname, flat=True)
+            )
+        for row_result, key in zip(row_results, keys):
+            if key in existing:
+                row_result.import_type = RowResult.IMPORT_TYPE_UPDATE
+                if result is not None:
+                    result.totals[RowResult.IMPORT_TYPE_NEW] -= 1
+                    result.totals[RowResult.IMPORT_TYPE_UPDATE] += 1
+
     def bulk_update(
         self, using_transactions, dry_run, raise_errors, batch_size=None, result=None
     ):
@@ -270,19 +825,30 @@ class Resource(metaclass=DeclarativeMetaclass):
         If the ``clean_model_instances`` option is False, the instances's
         ``full_clean()`` method is not called, and only the errors raised by
         ``import_instance()`` are re-raised.
+
+        If the ``validate_unique_in_batches`` option is True, uniqueness is
+        validated by the import's
+        :class:`~import_export.unique_validators.BatchUniqueValidator`.
         """
         if import_validation_errors is None:
             errors = {}
         else:
             errors = import_validation_errors.copy()
         if self._meta.clean_model_instances:
+            unique_validator = self._unique_validator if validate_unique else None
+            full_clean_kwargs = {}
+            if unique_validator is not None and unique_validator.validates_constraints:
+                full_clean_kwargs["validate_constraints"] = False
             try:
                 instance.full_clean(
                     exclude=errors.keys(),
-                    validate_unique=validate_unique,
+                    validate_unique=validate_unique and unique_validator is None,
+                    **full_clean_kwargs,
                 )
             except ValidationError as e:
                 errors = e.update_error_dict(errors)
+            if unique_validator is not None:
+                errors = unique_validator.validate(instance, errors)
 
         if errors:
             raise ValidationError(errors)
@@ -433,6 +999,16 @@ class Resource(metaclass=DeclarativeMetaclass):
             return
         field.save(instance, row, is_m2m, **kwargs)
 
+    def _get_import_plan(self):
+        """
+        Returns the plan of the import in progress, or a new plan if called
+        outside of :meth:`import_data`.
+        """
+        plan = getattr(self, "_import_plan", None)
+        if plan is None:
+            plan = _ImportPlan(self)
+        return plan
+
     def get_import_fields(self):
         import_fields = []
         missing = object()
@@ -465,13 +1041,31 @@ class Resource(metaclass=DeclarativeMetaclass):
             See :meth:`import_row`
         """
         errors = {}
-        for field in self.get_import_fields():
-            if isinstance(field.widget, widgets.ManyToManyWidget):
-                continue
+        plan = self._get_import_plan()
+        for field, attrs in plan.fields:
             try:
-                self.import_field(field, instance, row, **kwargs)
+                if attrs is None:
+                    self.import_field(field, instance, row, **kwargs)
+                elif attrs and field.column_name in row:
+                    field._save(instance, row, attrs, **kwargs)
+                else:
+                    plan.log_skipped_field(field, row)
             except ValueError as e:
                 errors[field.attribute] = ValidationError(force_str(e), code="invalid")
+        for field, attrs in plan.m2m_fields:
+            # unknown values are reported before the instance is saved; the
+            # instances are cached by the widget for save_m2m()
+            if (
+                isinstance(field.widget, widgets.CachedManyToManyWidget)
+                and field.attribute
+                and field.column_name in row
+            ):
+                try:
+                    field.clean(row, **kwargs)
+                except ValueError as e:
+                    errors[field.attribute] = ValidationError(
+                        force_str(e), code="invalid"
+                    )
         if errors:
             raise ValidationError(errors)
 
@@ -497,10 +1091,14 @@ class Resource(metaclass=DeclarativeMetaclass):
             # for bulk operations)
             pass
         else:
-            for field in self.get_import_fields():
-                if not isinstance(field.widget, widgets.ManyToManyWidget):
-                    continue
-                self.import_field(field, instance, row, True)
+            plan = self._get_import_plan()
+            for field, attrs in plan.m2m_fields:
+                if attrs is None:
+                    self.import_field(field, instance, row, True)
+                elif attrs and field.column_name in row:
+                    field._save(instance, row, attrs, True)
+                else:
+                    plan.log_skipped_field(field, row)
 
     def for_delete(self, row, instance):
         """
@@ -520,10 +1118,11 @@ class Resource(metaclass=DeclarativeMetaclass):
         Returns ``True`` if ``row`` importing should be skipped.
 
         Default implementation returns ``False`` unless skip_unchanged == True
-        and skip_diff == False.
+        and skip_diff == False, or skip_unchanged == True and
+        skip_unchanged_hash == True.
 
-        If skip_diff is True, then no comparisons can be made because ``original``
-        will be None.
+        If skip_diff is True, then ``original`` will be None, and comparisons can
+        only be made by digest (see :meth:`get_instance_digest`).
 
         When left unspecified, skip_diff and skip_unchanged both default to ``False``,
         and rows are never skipped.
@@ -554,16 +1153,20 @@ class Resource(metaclass=DeclarativeMetaclass):
         :param import_validation_errors: A ``dict`` containing key / value data for any
           identified validation errors.
         """
-        if (
-            not self._meta.skip_unchanged
-            or self._meta.skip_diff
-            or import_validation_errors
-        ):
+        if not self._meta.skip_unchanged or import_validation_errors:
             return False
-        for field in self.get_import_fields():
+        if self._meta.skip_unchanged_hash:
+            return (
+                self._original_digest is not None
+                and self.get_instance_digest(instance, row) == self._original_digest
+            )
+        if self._meta.skip_diff:
+            return False
+        plan = self._get_import_plan()
+        for field, is_m2m in zip(plan.import_fields, plan.is_m2m):
             # For fields that are models.fields.related.ManyRelatedManager
             # we need to compare the results
-            if isinstance(field.widget, widgets.ManyToManyWidget):
+            if is_m2m:
                 # #1437 - handle m2m field not present in import file
                 if field.column_name not in row.keys():
                     continue
@@ -584,6 +1187,44 @@ class Resource(metaclass=DeclarativeMetaclass):
                 return False
         return True
 
+    def get_instance_digest(self, instance, row, original=False):
+        """
+        Returns a digest of the values of the import fields of ``instance``, as
+        rendered by each field's widget.  Used by :meth:`skip_row` when
+        ``skip_unchanged_hash`` is enabled.
+
+        Many-to-many fields are included only if their column is in ``row``.
+        Their values are cleaned from ``row``, because they have not been written
+        to ``instance`` during import, unless ``original`` is ``True``.
+
+        :param instance: A model instance.
+
+        :param row: A ``dict`` containing key / value data for the row being
+          imported.
+
+        :param original: If ``True``, many-to-many values are read from the
+          persisted ``instance`` rather than from ``row``.
+        """
+        plan = self._get_import_plan()
+        digest = hashlib.blake2b(digest_size=16)
+        for field, is_m2m in zip(plan.import_fields, plan.is_m2m):
+            if is_m2m:
+                if field.column_name not in row.keys():
+                    continue
+                if not original:
+                    value = sorted(v.pk for v in field.clean(row))
+                elif instance.pk is None:
+                    value = []
+                else:
+                    value = sorted(
+                        field.get_value(instance).values_list("pk", flat=True)
+                    )
+            else:
+                value = field.widget.render(field.get_value(instance))
+            digest.update(repr(value).encode())
+            digest.update(b"\x1f")
+        return digest.hexdigest()
+
     def get_diff_headers(self):
         """
         Diff representation headers.
@@ -696,6 +1337,7 @@ class Resource(metaclass=DeclarativeMetaclass):
         if self._meta.store_row_values:
             row_result.row_values = row
         original = None
+        self._original_digest = None
         try:
             self.before_import_row(row, **kwargs)
             instance, new = self.get_or_init_instance(instance_loader, row)
@@ -718,11 +1360,18 @@ class Resource(metaclass=DeclarativeMetaclass):
                     if self._meta.store_instance:
                         # create a copy before deletion so id fields are retained
                         row_result.instance = deepcopy(instance)
+                    if self._unique_validator is not None and not self._meta.use_bulk:
+                        # before the instance's pk is cleared by delete()
+                        self._unique_validator.release(instance)
                     self.delete_instance(instance, row, **kwargs)
                     if not skip_diff:
                         diff.compare_with(self, None)
             else:
                 import_validation_errors = {}
+                if self._meta.skip_unchanged and self._meta.skip_unchanged_hash:
+                    self._original_digest = self.get_instance_digest(
+                        instance, row, original=True
+                    )
                 try:
                     self.import_instance(instance, row, **kwargs)
                 except ValidationError as e:
@@ -739,6 +1388,11 @@ class Resource(metaclass=DeclarativeMetaclass):
                     self.validate_instance(instance, import_validation_errors)
                     self.save_instance(instance, new, row, **kwargs)
                     self.save_m2m(instance, row, **kwargs)
+                    if self._unique_validator is not None:
+                        # instances are saved later when use_bulk is enabled
+                        self._unique_validator.add(
+                            instance, release=not self._meta.use_bulk
+                        )
                 row_result.add_instance_info(instance)
                 if self._meta.store_instance:
                     row_result.instance = instance
@@ -766,6 +1420,7 @@ class Resource(metaclass=DeclarativeMetaclass):
 
         return row_result
 
+    @widgets._number_codec_scope()
     def import_data(
         self,
         dataset,
@@ -774,6 +1429,7 @@ class Resource(metaclass=DeclarativeMetaclass):
         use_transactions=None,
         collect_failed_rows=False,
         rollback_on_validation_errors=False,
+        resume=False,
         **kwargs,
     ):
         r"""
@@ -802,6 +1458,10 @@ class Resource(metaclass=DeclarativeMetaclass):
         :param dry_run: If ``dry_run`` is set, or an error occurs, if a transaction
             is being used, it will be rolled back.
 
+        :param resume: If ``True``, the rows of ``dataset`` which were committed
+            by an interrupted import are skipped (see
+            :attr:`~import_export.options.ResourceOptions.checkpoint_store_class`).
+
         :param \**kwargs:
             Metadata which may be associated with the import.
         """
@@ -825,6 +1485,65 @@ class Resource(metaclass=DeclarativeMetaclass):
         ):
             raise ValueError("Batch size must be a positive integer")
 
+        if self._meta.savepoint_batch_size is not None and (
+            not isinstance(self._meta.savepoint_batch_size, int)
+            or self._meta.savepoint_batch_size < 1
+        ):
+            raise ValueError("Savepoint batch size must be a positive integer")
+
+        if self._meta.duplicate_import_ids not in (None, "first", "last", "error"):
+            raise ValueError(
+                "duplicate_import_ids must be None, 'first', 'last' or 'error'"
+            )
+
+        if self._meta.use_upsert:
+            if not self._meta.use_bulk:
+                raise ImproperlyConfigured("use_upsert requires use_bulk to be enabled")
+            if not connection.features.supports_update_conflicts:
+                raise ImproperlyConfigured(
+                    "use_upsert is not supported by the database backend"
+                )
+
+        checkpoint_store = self.get_checkpoint_store()
+        if resume and checkpoint_store is None:
+            raise ImproperlyConfigured("resume requires checkpoint_store_class")
+        if checkpoint_store is not None:
+            checkpoint_batch_size = (
+                self._meta.checkpoint_batch_size or self._meta.batch_size
+            )
+            if not isinstance(checkpoint_batch_size, int) or checkpoint_batch_size < 1:
+                raise ValueError(
+                    "checkpoint_store_class requires checkpoint_batch_size or "
+                    "batch_size to be a positive integer"
+                )
+        if checkpoint_store is not None and not dry_run:
+            if not using_transactions:
+                raise ImproperlyConfigured(
+                    "checkpoint_store_class requires the use of transactions"
+                )
+            # each chunk of rows is committed in its own transaction
+            self._checkpoint = _CheckpointedImport(
+                checkpoint_store,
+                db_connection,
+                checkpoint_batch_size,
+                resume,
+                rollback_on_validation_errors,
+            )
+            try:
+                return self.import_data_inner(
+                    dataset,
+                    dry_run,
+                    raise_errors,
+                    using_transactions,
+                    collect_failed_rows,
+                    **kwargs,
+                )
+            except BaseException:
+                self._checkpoint.abort(sys.exc_info())
+                raise
+            finally:
+                self._checkpoint = None
+
         with atomic_if_using_transaction(using_transactions, using=db_connection):
             result = self.import_data_inner(
                 dataset,
@@ -865,7 +1584,55 @@ class Resource(metaclass=DeclarativeMetaclass):
         except Exception as e:
             self.handle_import_error(result, e, raise_errors)
 
-        instance_loader = self._meta.instance_loader_class(self, dataset)
+        with using_lookup_db(*self._get_lookup_dbs(dry_run)):
+            if self._meta.use_upsert:
+                # existing instances are not loaded (see get_or_init_instance())
+                instance_loader = BaseInstanceLoader(self, dataset)
+            else:
+                instance_loader = self._meta.instance_loader_class(self, dataset)
+            self._prefetch_widget_values(dataset)
+            self._import_plan = _ImportPlan(self)
+            self._unique_validator = (
+                BatchUniqueValidator(self)
+                if self._meta.clean_model_instances
+                and self._meta.validate_unique_in_batches
+                else None
+            )
+            try:
+                self._import_rows(
+                    dataset,
+                    result,
+                    instance_loader,
+                    dry_run,
+                    raise_errors,
+                    using_transactions,
+                    collect_failed_rows,
+                    **kwargs,
+                )
+            finally:
+                self._import_plan = None
+                self._unique_validator = None
+
+        try:
+            with atomic_if_using_transaction(using_transactions, using=db_connection):
+                self.after_import(dataset, result, **kwargs)
+        except Exception as e:
+            self.handle_import_error(result, e, raise_errors)
+
+        return result
+
+    def _import_rows(
+        self,
+        dataset,
+        result,
+        instance_loader,
+        dry_run,
+        raise_errors,
+        using_transactions,
+        collect_failed_rows,
+        **kwargs,
+    ):
+        db_connection = self.get_db_connection_name()
 
         # Update the total in case the dataset was altered by before_import()
         result.total_rows = len(dataset)
@@ -873,23 +1640,116 @@ class Resource(metaclass=DeclarativeMetaclass):
         if collect_failed_rows:
             result.add_dataset_headers(dataset.headers)
 
+        if self._meta.use_upsert:
+            bulk_create = functools.partial(self.bulk_upsert, headers=dataset.headers)
+            self._upsert_row_results = []
+        else:
+            bulk_create = self.bulk_create
+
+        fingerprint_store = self.get_fingerprint_store()
+        unchanged_rows = set()
+        if fingerprint_store is not None:
+            row_fingerprints = [
+                self.get_row_fingerprint(OrderedDict(zip(dataset.headers, data_row)))
+                for data_row in dataset
+            ]
+            stored_fingerprints = fingerprint_store.get_fingerprints(
+                {import_id for import_id, _ in row_fingerprints if import_id}
+            )
+            unchanged_rows = {
+                i
+                for i, (import_id, digest) in enumerate(row_fingerprints, 1)
+                if import_id is not None
+                and stored_fingerprints.get(import_id) == digest
+            }
+            pending_fingerprints = {}
+
+        duplicate_rows = self._get_duplicate_rows(dataset)
+
+        savepoint_batch_size = None
+        if using_transactions and not self._meta.use_bulk:
+            savepoint_batch_size = self._meta.savepoint_batch_size
+        imported_rows = {}
+        # the number of the last row of the current savepoint group
+        group_end = 0
+
+        checkpoint = getattr(self, "_checkpoint", None)
+        if checkpoint is not None:
+            checkpoint.begin(self.get_dataset_fingerprint(dataset), result)
+
         for i, data_row in enumerate(dataset, 1):
+            if checkpoint is not None:
+                if i <= checkpoint.row_number:
+                    # committed by an earlier import of the dataset
+                    continue
+                if i - 1 - checkpoint.row_number == checkpoint.size:
+                    self._save_bulk_instances(
+                        bulk_create, using_transactions, dry_run, raise_errors, result
+                    )
+                    if fingerprint_store is not None:
+                        self._store_fingerprints(
+                            fingerprint_store, pending_fingerprints, dry_run, result
+                        )
+                    if not checkpoint.commit(i - 1, result):
+                        break
             row = OrderedDict(zip(dataset.headers, data_row))
-            with atomic_if_using_transaction(
-                using_transactions and not self._meta.use_bulk, using=db_connection
-            ):
+            if savepoint_batch_size is None:
+                self._prefetch_unique_values(dataset, i)
+            elif i > group_end:
+                group_end = min(i + savepoint_batch_size - 1, len(dataset))
+                if checkpoint is not None:
+                    # a group must not span two checkpoint chunks, which are
+                    # committed separately
+                    group_end = min(group_end, checkpoint.row_number + checkpoint.size)
                 kwargs.update(
-                    {
-                        "dry_run": dry_run,
-                        "using_transactions": using_transactions,
-                        "row_number": i,
-                    }
+                    {"dry_run": dry_run, "using_transactions": using_transactions}
                 )
-                row_result = self.import_row(
-                    row,
+                imported_rows = self._import_row_group(
+                    dataset,
+                    range(i, group_end + 1),
+                    unchanged_rows.union(duplicate_rows),
                     instance_loader,
                     **kwargs,
                 )
+            if fingerprint_store is not None:
+                import_id, digest = row_fingerprints[i - 1]
+                if i in unchanged_rows:
+                    row_result = self.get_row_result_class()()
+                    row_result.import_type = RowResult.IMPORT_TYPE_SKIP
+                    result.increment_row_result_total(row_result)
+                    if self._meta.report_skipped:
+                        result.append_row_result(row_result)
+                    continue
+            if i in duplicate_rows:
+                row_result = self._get_duplicate_row_result(row, i, *duplicate_rows[i])
+                result.append_duplicate_row(i, duplicate_rows[i][0])
+            elif i in imported_rows:
+                row, row_result = imported_rows.pop(i)
+            else:
+                with atomic_if_using_transaction(
+                    using_transactions and not self._meta.use_bulk,
+                    using=db_connection,
+                ):
+                    kwargs.update(
+                        {
+                            "dry_run": dry_run,
+                            "using_transactions": using_transactions,
+                            "row_number": i,
+                        }
+                    )
+                    row_result = self.import_row(
+                        row,
+                        instance_loader,
+                        **kwargs,
+                    )
+            if (
+                self._meta.use_upsert
+                and row_result.import_type == RowResult.IMPORT_TYPE_NEW
+            ):
+                # reported as new or updated when the batch is saved
+                self._upsert_row_results.append(row_result)
+            result.increment_row_result_total(row_result)
+
             if self._meta.use_bulk:
                 # persist a batch of rows
                 # because this is a batch, any exceptions are logged and not associated
@@ -898,7 +1758,7 @@ class Resource(metaclass=DeclarativeMetaclass):
                     with atomic_if_using_transaction(
                         using_transactions, using=db_connection
                     ):
-                        self.bulk_create(
+                        bulk_create(
                             using_transactions,
                             dry_run,
                             raise_errors,
@@ -924,8 +1784,6 @@ class Resource(metaclass=DeclarativeMetaclass):
                             using_transactions, dry_run, raise_errors, result=result
                         )
 
-            result.increment_row_result_total(row_result)
-
             if row_result.errors:
                 result.append_error_row(i, row, row_result.errors)
                 if collect_failed_rows:
@@ -948,12 +1806,54 @@ class Resource(metaclass=DeclarativeMetaclass):
             ):
                 result.append_row_result(row_result)
 
+            if fingerprint_store is not None:
+                if (
+                    import_id is not None
+                    and i not in duplicate_rows
+                    and row_result.import_type
+                    in (
+                        RowResult.IMPORT_TYPE_NEW,
+                        RowResult.IMPORT_TYPE_UPDATE,
+                        RowResult.IMPORT_TYPE_SKIP,
+                    )
+                ):
+                    pending_fingerprints[import_id] = digest
+                # fingerprints are stored once the instances of their rows are
+                # saved, or at the end of the import if there are no batches
+                if (
+                    self._meta.batch_size
+                    and len(pending_fingerprints) >= self._meta.batch_size
+                    and not (
+                        self.create_instances
+                        or self.update_instances
+                        or self.delete_instances
+                    )
+                ):
+                    self._store_fingerprints(
+                        fingerprint_store, pending_fingerprints, dry_run, result
+                    )
+
+        # bulk persist any instances which are still pending
+        self._save_bulk_instances(
+            bulk_create, using_transactions, dry_run, raise_errors, result
+        )
+
+        if fingerprint_store is not None:
+            self._store_fingerprints(
+                fingerprint_store, pending_fingerprints, dry_run, result
+            )
+
+        if checkpoint is not None:
+            checkpoint.finish(result)
+
+    def _save_bulk_instances(
+        self, bulk_create, using_transactions, dry_run, raise_errors, result
+    ):
         if self._meta.use_bulk:
-            # bulk persist any instances which are still pending
-            with atomic_if_using_transaction(using_transactions, using=db_connection):
-                self.bulk_create(
-                    using_transactions, dry_run, raise_errors, result=result
-                )
+            with atomic_if_using_transaction(
+                using_transactions, using=self.get_db_connection_name()
+            ):
+                bulk_create(using_transactions, dry_run, raise_errors, result=result)
                 self.bulk_update(
                     using_transactions, dry_run, raise_errors, result=result
                 )
@@ -961,13 +1861,110 @@ class Resource(metaclass=DeclarativeMetaclass):
                     using_transactions, dry_run, raise_errors, result=result
                 )
 
-        try:
-            with atomic_if_using_transaction(using_transactions, using=db_connection):
-                self.after_import(dataset, result, **kwargs)
-        except Exception as e:
-            self.handle_import_error(result, e, raise_errors)
+    def _prefetch_unique_values(self, dataset, number):
+        # the unique values of each batch are loaded before its first row
+        if self._unique_validator is None:
+            return
+        # without a batch size, the dataset is a single batch
+        batch_size = self._meta.batch_size or len(dataset)
+        if (number - 1) % batch_size == 0:
+            self._unique_validator.prefetch(
+                [
+                    OrderedDict(zip(dataset.headers, batch_row))
+                    for batch_row in dataset[number - 1 : number - 1 + batch_size]
+                ]
+            )
 
-        return result
+    def _import_row_group(
+        self, dataset, numbers, skipped_rows, instance_loader, **kwargs
+    ):
+        """
+        Imports the rows ``numbers`` of ``dataset`` (other than ``skipped_rows``)
+        under a single savepoint, and returns a dict which maps the number of
+        each imported row to a ``(row, row_result)`` tuple.
+
+        If a row has an error, the savepoint is rolled back and the rows are
+        imported again, each under its own savepoint, so that only the rows
+        with errors are rolled back.
+        """
+        db_connection = self.get_db_connection_name()
+        imported_rows = {}
+        with atomic_if_using_transaction(True, using=db_connection):
+            for number in numbers:
+                self._prefetch_unique_values(dataset, number)
+                if number in skipped_rows:
+                    continue
+                row = OrderedDict(zip(dataset.headers, dataset[number - 1]))
+                kwargs["row_number"] = number
+                row_result = self.import_row(row, instance_loader, **kwargs)
+                imported_rows[number] = (row, row_result)
+                if row_result.errors or connections[db_connection].needs_rollback:
+                    set_rollback(True, using=db_connection)
+                    break
+            else:
+                return imported_rows
+
+        if self._unique_validator is not None:
+            # the values of the rolled back instances are no longer taken
+            self._unique_validator = BatchUniqueValidator(self)
+        imported_rows = {}
+        for number in numbers:
+            if number in skipped_rows:
+                continue
+            row = OrderedDict(zip(dataset.headers, dataset[number - 1]))
+            kwargs["row_number"] = number
+            with atomic_if_using_transaction(True, using=db_connection):
+                row_result = self.import_row(row, instance_loader, **kwargs)
+            imported_rows[number] = (row, row_result)
+        return imported_rows
+
+    def _get_duplicate_rows(self, dataset):
+        """
+        Returns a dict which maps the number of each row which is not imported
+        because of ``duplicate_import_ids`` to a ``(kept_number, numbers)``
+        tuple, where ``kept_number`` is the number of the row with the same
+        import id which is imported (or ``None``), and ``numbers`` are the
+        numbers of all of the rows with the import id.
+        """
+        policy = self._meta.duplicate_import_ids
+        if policy is None or not dataset.headers:
+            return {}
+        numbers_by_import_id = {}
+        for i, data_row in enumerate(dataset, 1):
+            import_id = self._get_row_import_id(dict(zip(dataset.headers, data_row)))
+            if import_id is not None:
+                numbers_by_import_id.setdefault(import_id, []).append(i)
+        duplicate_rows = {}
+        for numbers in numbers_by_import_id.values():
+            if len(numbers) == 1:
+                continue
+            kept_number = {"first": numbers[0], "last": numbers[-1]}.get(policy)
+            for number in numbers:
+                if number != kept_number:
+                    duplicate_rows[number] = (kept_number, numbers)
+        return duplicate_rows
+
+    def _get_duplicate_row_result(self, row, number, kept_number, numbers):
+        row_result = self.get_row_result_class()()
+        if self._meta.store_row_values:
+            row_result.row_values = row
+        if kept_number is not None:
+            row_result.import_type = RowResult.IMPORT_TYPE_SKIP
+            return row_result
+        import_id_fields = self.get_import_id_fields()
+        key = import_id_fields[0] if len(import_id_fields) == 1 else NON_FIELD_ERRORS
+        message = _("The import id of this row is repeated in rows %(rows)s.") % {
+            "rows": ", ".join(str(n) for n in numbers if n != number)
+        }
+        row_result.import_type = RowResult.IMPORT_TYPE_INVALID
+        row_result.validation_error = ValidationError({key: [message]})
+        return row_result
+
+    def _store_fingerprints(self, fingerprint_store, fingerprints, dry_run, result):
+        # once an error has been reported, the saved state of later rows is unknown
+        if fingerprints and not dry_run and not result.base_errors:
+            fingerprint_store.set_fingerprints(fingerprints)
+        fingerprints.clear()
 
     def get_import_order(self):
         return self._get_ordered_field_names("import_order")
@@ -1025,6 +2022,17 @@ class Resource(metaclass=DeclarativeMetaclass):
             return method(instance)
         return field.export(instance, **kwargs)
 
+    def optimize_export_queryset(self, queryset, export_fields):
+        """
+        Returns the queryset to be iterated by the export. Implemented in
+        :meth:`import_export.resources.ModelResource.optimize_export_queryset`.
+
+        :param queryset: The (filtered) queryset for export.
+
+        :param export_fields: The list of fields which will be exported.
+        """
+        return queryset
+
     def get_export_fields(self, selected_fields=None):
         fields_ = selected_fields if selected_fields else self.fields
         export_fields = []
@@ -1075,45 +2083,174 @@ class Resource(metaclass=DeclarativeMetaclass):
     def iter_queryset(self, queryset):
         if not isinstance(queryset, QuerySet):
             yield from queryset
-        elif queryset._prefetch_related_lookups:
-            # Django's queryset.iterator ignores prefetch_related which might result
-            # in an excessive amount of db calls. Therefore we use pagination
-            # as a work-around
-            if not queryset.query.order_by:
-                # Paginator() throws a warning if there is no sorting
-                # attached to the queryset
-                queryset = queryset.order_by("pk")
-            paginator = Paginator(queryset, self.get_chunk_size())
-            for index in range(paginator.num_pages):
-                yield from paginator.get_page(index + 1)
         else:
+            # prefetch_related() lookups are fetched for each chunk
             yield from queryset.iterator(chunk_size=self.get_chunk_size())
 
+    @widgets._number_codec_scope()
     def export(self, queryset=None, **kwargs):
         """
         Exports a resource.
 
         :param queryset: The queryset for export (optional).
 
-        :returns: A ``tablib.Dataset``.
+        :returns: A ``tablib.Dataset``, or a
+          :class:`~import_export.columnar.ColumnarDataset` if
+          :attr:`~import_export.options.ResourceOptions.use_columnar_export` is
+          enabled.
         """
         self.before_export(queryset, **kwargs)
 
         if queryset is None:
             queryset = self.get_queryset()
         queryset = self.filter_export(queryset, **kwargs)
+        read_db = self.get_read_db_connection_name()
+        if read_db is not None:
+            queryset = queryset.using(read_db)
         export_fields = kwargs.get("export_fields", None)
+        fields_ = self.get_export_fields(export_fields)
+        queryset = self.optimize_export_queryset(queryset, fields_)
         headers = self.get_export_headers(selected_fields=export_fields)
-        dataset = tablib.Dataset(headers=headers)
-
-        for obj in self.iter_queryset(queryset):
-            r = self.export_resource(obj, selected_fields=export_fields, **kwargs)
-            dataset.append(r)
+        if self._meta.use_columnar_export:
+            dataset = ColumnarDataset(headers=headers)
+        else:
+            dataset = tablib.Dataset(headers=headers)
+
+        # related instances are read from the database of the queryset
+        with using_lookup_db(read_db):
+            values_lookups = self._get_export_values_lookups(queryset, fields_)
+            if values_lookups is not None:
+                for r in self._iter_export_values(
+                    queryset, fields_, values_lookups, **kwargs
+                ):
+                    dataset.append(r)
+            elif self._uses_default_export_methods():
+                plan = self._get_export_plan(fields_, **kwargs)
+                renderers = [p for p in plan if isinstance(p, _NaturalKeyRenderer)]
+                if renderers:
+                    objs = self.iter_queryset(queryset)
+                    while chunk := list(itertools.islice(objs, self.get_chunk_size())):
+                        for renderer in renderers:
+                            renderer.prepare(chunk)
+                        for obj in chunk:
+                            dataset.append([export_value(obj) for export_value in plan])
+                else:
+                    for obj in self.iter_queryset(queryset):
+                        dataset.append([export_value(obj) for export_value in plan])
+            else:
+                for obj in self.iter_queryset(queryset):
+                    r = self.export_resource(
+                        obj, selected_fields=export_fields, **kwargs
+                    )
+                    dataset.append(r)
 
         self.after_export(queryset, dataset, **kwargs)
 
         return dataset
 
+    def _get_export_values_lookups(self, queryset, export_fields):
+        """
+        Returns the list of ``values_list()`` lookups (one per field, ``None`` if
+        the field has no attribute) if the export can be run without creating
+        model instances, otherwise ``None``.
+        Implemented in :class:`~import_export.resources.ModelResource`.
+        """
+        return None
+
+    def _iter_export_values(self, queryset, fields, values_lookups, **kwargs):
+        """
+        Yields export rows by rendering the tuples returned by ``values_list()``.
+        """
+        lookups = list(dict.fromkeys(v for v in values_lookups if v is not None))
+        indexes = [
+            lookups.index(lookup) if lookup is not None else None
+            for lookup in values_lookups
+        ]
+        if queryset.query.distinct:
+            # DISTINCT applies to the selected columns, so the pk is selected
+            # (but not exported) to keep rows with equal values
+            lookups.append("pk")
+        renders = [field.widget.render for field in fields]
+        queryset = queryset.prefetch_related(None).values_list(*lookups)
+        for values in self.iter_queryset(queryset):
+            yield [
+                render(values[i] if i is not None else None, **kwargs)
+                for render, i in zip(renders, indexes)
+            ]
+
+    def _uses_default_export_methods(self):
+        """
+        Returns ``True`` if neither ``export_resource()`` nor ``export_field()``
+        have been overridden, meaning that rows can be exported with a plan
+        which is compiled once per export.
+        """
+        return (
+            getattr(self.export_resource, "__func__", None) is Resource.export_resource
+            and getattr(self.export_field, "__func__", None) is Resource.export_field
+        )
+
+    def _get_export_plan(self, fields, **kwargs):
+        """
+        Returns a list of callables, one per field, which take an instance and
+        return the exported value.  This is the equivalent of calling
+        :meth:`export_field` for each field, with the dehydrate method,
+        attribute path and widget resolved once rather than per row.
+        """
+        plan = []
+        for field in fields:
+            dehydrate_method = field.get_dehydrate_method(self.get_field_name(field))
+            if callable(dehydrate_method):
+                method = dehydrate_method
+            else:
+                method = getattr(self, dehydrate_method, None)
+
+            if method is not None:
+                plan.append(method)
+            elif (
+                type(field).get_value is not _field_get_value
+                or type(field).export is not _field_export
+            ):
+                plan.append(functools.partial(field.export, **kwargs))
+            elif (relation := self._get_natural_key_relation(field)) is not None:
+                plan.append(
+                    _NaturalKeyRenderer(
+                        field,
+                        relation,
+                        [
+                            f.name
+                            for f in self._get_natural_key_relations(field.widget.model)
+                        ],
+                        kwargs,
+                    )
+                )
+            else:
+                plan.append(
+                    functools.partial(
+                        self._export_attribute_value,
+                        tuple(field.attribute.split("__")) if field.attribute else (),
+                        field.widget.render,
+                        kwargs,
+                    )
+                )
+        return plan
+
+    def _get_natural_key_relation(self, field):
+        """
+        Returns the foreign key of the model which ``field`` renders by natural
+        key, if the natural keys can be resolved in batches, otherwise ``None``.
+        Implemented in :class:`~import_export.resources.ModelResource`.
+        """
+        return None
+
+    @staticmethod
+    def _export_attribute_value(attrs, render, kwargs, instance):
+        value = Field._get_attribute_value(instance, attrs) if attrs else None
+        return render(value, **kwargs)
+
+    def _has_dehydrate_method(self, field):
+        dehydrate_method = field.get_dehydrate_method(self.get_field_name(field))
+        return callable(dehydrate_method) or hasattr(self, dehydrate_method)
+
     def _select_field(self, target_field_name):
         # select field from fields based on either declared name or column name
         missing = object()
@@ -1145,6 +2282,18 @@ class Resource(metaclass=DeclarativeMetaclass):
                 declared_fields.append(field_name)
         return tuple(order) + tuple(declared_fields)
 
+    def _prefetch_widget_values(self, dataset):
+        """
+        Passes the column values of the dataset to any widget which supports
+        prefetching of related instances, e.g.
+        :class:`~import_export.widgets.CachedManyToManyWidget`.
+        """
+        headers = dataset.headers or []
+        for field in self.fields.values():
+            prefetch = getattr(field.widget, "prefetch", None)
+            if callable(prefetch) and field.column_name in headers:
+                prefetch(dataset[field.column_name])
+
     def _is_using_transactions(self, kwargs):
         return kwargs.get("using_transactions", False)
 
@@ -1290,14 +2439,8 @@ class ModelResource(Resource, metaclass=ModelDeclarativeMetaclass):
                         result = getattr(cls, result)(f)
                     break
 
-            try:
-                from django.contrib.postgres.fields import ArrayField
-            except ImportError:
-                # ImportError: No module named psycopg2.extras
-                class ArrayField:
-                    pass
-
-            if isinstance(f, ArrayField):
+            ArrayField = _get_array_field_class()
+            if ArrayField is not None and isinstance(f, ArrayField):
                 return widgets.SimpleArrayWidget
 
         return result
@@ -1359,6 +2502,218 @@ class ModelResource(Resource, metaclass=ModelDeclarativeMetaclass):
         """
         return self._meta.model.objects.all()
 
+    def optimize_export_queryset(self, queryset, export_fields):
+        """
+        Adds ``select_related()`` and ``prefetch_related()`` lookups for the
+        relations which are followed when ``export_fields`` are exported.
+        This is disabled if
+        :attr:`~import_export.options.ResourceOptions.optimize_export_queryset`
+        is ``False``.
+
+        Querysets which return values rather than model instances, which are
+        combined (e.g. ``union()``), or which are not ``QuerySet`` instances are
+        returned unaltered.  Lookups are not prefetched for sliced querysets.
+
+        :param queryset: The (filtered) queryset for export.
+
+        :param export_fields: The list of fields which will be exported.
+        """
+        if (
+            not self._meta.optimize_export_queryset
+            or not isinstance(queryset, QuerySet)
+            or queryset._fields is not None
+            or queryset.query.combinator
+        ):
+            return queryset
+        select_related, prefetch_related = self._get_export_related_lookups(
+            queryset.model, export_fields
+        )
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related and not queryset.query.is_sliced:
+            existing = {
+                getattr(lookup, "prefetch_to", lookup)
+                for lookup in queryset._prefetch_related_lookups
+            }
+            prefetch_related = [p for p in prefetch_related if p not in existing]
+            if prefetch_related:
+                queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def _get_export_related_lookups(self, model, export_fields):
+        """
+        Returns a tuple of ``select_related`` and ``prefetch_related`` lookups
+        for the relations followed when rendering ``export_fields``.
+        """
+        select_related = []
+        prefetch_related = []
+        for field in export_fields:
+            if not field.attribute or self._has_dehydrate_method(field):
+                continue
+            if (
+                self._uses_default_export_methods()
+                and type(field).get_value is _field_get_value
+                and type(field).export is _field_export
+                and self._get_natural_key_relation(field) is not None
+            ):
+                # natural keys are resolved in batches (see _NaturalKeyRenderer)
+                continue
+            attrs = field.attribute.split("__")
+            paths = [attrs]
+            widget = field.widget
+            if isinstance(widget, widgets.ForeignKeyWidget) and not widget.key_is_id:
+                if widget.use_natural_foreign_keys:
+                    paths += [
+                        attrs + [f.name]
+                        for f in self._get_natural_key_relations(widget.model)
+                    ]
+                else:
+                    paths.append(attrs + widget.field.split("__"))
+            for path in paths:
+                lookup, is_prefetch = self._get_related_lookup(model, path)
+                if not lookup:
+                    continue
+                lookups = prefetch_related if is_prefetch else select_related
+                if lookup not in lookups:
+                    lookups.append(lookup)
+        return select_related, prefetch_related
+
+    @classmethod
+    def _get_related_lookup(cls, model, attrs):
+        """
+        Follows ``attrs`` from ``model`` for as long as they are model relations.
+
+        :returns: A tuple of the traversed lookup path (or ``None``) and a
+          boolean indicating whether the path must be prefetched (i.e. it
+          crosses a multi-valued or generic relation).
+        """
+        related = []
+        is_prefetch = False
+        for attr in attrs:
+            try:
+                f = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not f.is_relation or f.name != attr:
+                # concrete value, or a foreign key's attname (e.g. 'author_id')
+                break
+            related.append(attr)
+            if f.many_to_many or f.one_to_many:
+                is_prefetch = True
+            if f.related_model is None:
+                # generic foreign keys can only be prefetched
+                is_prefetch = True
+                break
+            model = f.related_model
+        return ("__".join(related) or None), is_prefetch
+
+    def _get_export_values_lookups(self, queryset, export_fields):
+        """
+        Exports can be read with ``values_list()`` rather than by creating model
+        instances when every export field reads a single-valued model column
+        (following forward relations if required), is rendered by its widget
+        alone, and when neither the resource nor the fields customize how values
+        are read.
+        """
+        if (
+            not isinstance(queryset, QuerySet)
+            or queryset._fields is not None
+            or queryset.query.combinator
+            or not self._uses_default_export_methods()
+        ):
+            return None
+        lookups = []
+        for field in export_fields:
+            if (
+                type(field).get_value is not _field_get_value
+                or type(field).export is not _field_export
+                or self._has_dehydrate_method(field)
+            ):
+                return None
+            if not field.attribute:
+                lookups.append(None)
+                continue
+            if isinstance(
+                field.widget, (widgets.ForeignKeyWidget, widgets.ManyToManyWidget)
+            ) and not getattr(field.widget, "key_is_id", False):
+                return None
+            if not self._is_values_lookup(queryset, field.attribute):
+                return None
+            lookups.append(field.attribute)
+        return lookups
+
+    @classmethod
+    def _is_values_lookup(cls, queryset, attribute):
+        """
+        Returns ``True`` if reading ``attribute`` with ``values_list()`` returns
+        the same value as reading it from a model instance.
+        """
+        if attribute == "pk" or attribute in queryset.query.annotations:
+            return True
+        model = queryset.model
+        attrs = attribute.split("__")
+        for i, attr in enumerate(attrs):
+            is_last = i == len(attrs) - 1
+            try:
+                f = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                return is_last and attr == "pk"
+            if is_last:
+                # values which are read through a custom descriptor (e.g. files)
+                # differ from the raw column value
+                return (
+                    f.concrete
+                    and not f.many_to_many
+                    and (not f.is_relation or f.attname == attr)
+                    and f.descriptor_class
+                    in (DeferredAttribute, ForeignKeyDeferredAttribute)
+                )
+            if not (f.many_to_one or f.one_to_one) or f.related_model is None:
+                return False
+            model = f.related_model
+        return False
+
+    def _get_natural_key_relation(self, field):
+        widget = field.widget
+        if (
+            not isinstance(widget, widgets.ForeignKeyWidget)
+            or not widget.use_natural_foreign_keys
+            or widget.key_is_id
+            or type(widget).render is not widgets.ForeignKeyWidget.render
+            or not field.attribute
+            or "__" in field.attribute
+        ):
+            return None
+        try:
+            f = self._meta.model._meta.get_field(field.attribute)
+        except FieldDoesNotExist:
+            return None
+        if (
+            (f.many_to_one or f.one_to_one)
+            and f.concrete
+            and f.related_model is widget.model
+        ):
+            return f
+        return None
+
+    @classmethod
+    def _get_natural_key_relations(cls, model):
+        """
+        Returns the forward relations of ``model`` which point to models declared
+        in ``natural_key.dependencies``.
+        """
+        dependencies = {
+            d.lower() for d in getattr(model.natural_key, "dependencies", [])
+        }
+        return [
+            f
+            for f in model._meta.get_fields()
+            if (f.many_to_one or f.one_to_one)
+            and f.concrete
+            and f.related_model is not None
+            and f.related_model._meta.label_lower in dependencies
+        ]
+
     def init_instance(self, row=None):
         """
         Initializes a new Django model.
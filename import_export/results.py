@@ -197,6 +197,22 @@ class ErrorRow:
         self.errors = errors
 
 
+class DuplicateRow:
+    """A row which was not imported because its import id is repeated in the
+    dataset (see
+    :attr:`~import_export.options.ResourceOptions.duplicate_import_ids`)."""
+
+    def __init__(self, number, kept_number):
+        #: The number of the row.
+        self.number = number
+        #: The number of the row with the same import id which was imported
+        #: instead, or ``None`` if none of them was imported.
+        self.kept_number = kept_number
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(row={self.number}, kept={self.kept_number})>"
+
+
 class Result:
     def __init__(self, *args, **kwargs):
         super().__init__()
@@ -208,6 +224,9 @@ class Result:
         self.invalid_rows = []
         #: The collection of rows which had generic errors.
         self.error_rows = []
+        #: The collection of rows which were not imported because their import id
+        #: is repeated in the dataset.
+        self.duplicate_rows = []
         #: A custom Dataset containing only failed rows and associated errors.
         self.failed_dataset = Dataset()
         self.totals = OrderedDict(
@@ -221,6 +240,9 @@ class Result:
             ]
         )
         self.total_rows = 0
+        #: ``True`` if the new and update totals could not be told apart
+        #: (see :attr:`~import_export.options.ResourceOptions.use_upsert`).
+        self.totals_approximate = False
 
     def valid_rows(self):
         return [r for r in self.rows if r.import_type in RowResult.valid_import_types]
@@ -254,6 +276,9 @@ class Result:
     def append_error_row(self, number, row, errors):
         self.error_rows.append(ErrorRow(number=number, errors=errors))
 
+    def append_duplicate_row(self, number, kept_number):
+        self.duplicate_rows.append(DuplicateRow(number=number, kept_number=kept_number))
+
     def increment_row_result_total(self, row_result):
         if row_result.import_type:
             self.totals[row_result.import_type] += 1
@@ -1,4 +1,3 @@
-from diff_match_patch import diff_match_patch
 from django import template
 
 register = template.Library()
@@ -6,6 +5,8 @@ register = template.Library()
 
 @register.simple_tag
 def compare_values(value1, value2):
+    from diff_match_patch import diff_match_patch
+
     dmp = diff_match_patch()
     diff = dmp.diff_main(value1, value2)
     dmp.diff_cleanupSemantic(diff)
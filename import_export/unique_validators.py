@@ -0,0 +1,323 @@
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import connections, router
+from django.db.models import Model, Q, UniqueConstraint
+
+from . import widgets
+
+
+def _normalize(field, value):
+    if isinstance(value, Model):
+        value = getattr(value, field.target_field.attname)
+    try:
+        return field.to_python(value)
+    except ValidationError:
+        return value
+
+
+class _UniqueCheck:
+    """
+    The values of a set of unique fields which are known to be taken, either
+    by rows of the database or by instances saved by the import.
+    """
+
+    def __init__(self, model_class, field_names, using=None):
+        self.model_class = model_class
+        self.field_names = tuple(field_names)
+        self.fields = [model_class._meta.get_field(name) for name in field_names]
+        self.using = using
+        self.interprets_empty_strings_as_nulls = connections[
+            using or router.db_for_read(model_class)
+        ].features.interprets_empty_strings_as_nulls
+        # key -> pk of the database row, or the instance saved by the import
+        self.owners = {}
+        # keys whose database rows have been loaded
+        self.fetched = set()
+        # pk -> key, for the owners with a pk
+        self.keys_by_pk = {}
+        self.sources = None
+
+    def get_queryset(self):
+        manager = self.model_class._default_manager
+        return manager.using(self.using) if self.using else manager.all()
+
+    def get_key(self, instance, skip_pk=False):
+        """
+        Returns the normalized values of the fields of ``instance``, or ``None``
+        if the instance can not violate the check.
+        """
+        key = []
+        for field in self.fields:
+            value = getattr(instance, field.attname)
+            if value is None or (
+                value == "" and self.interprets_empty_strings_as_nulls
+            ):
+                return None
+            if (
+                skip_pk
+                and field in self.model_class._meta.pk_fields
+                and not instance._state.adding
+            ):
+                # as validate_unique(), primary keys are not checked when editing
+                return None
+            key.append(_normalize(field, value))
+        return tuple(key)
+
+    def prefetch(self, resource, rows):
+        if self.sources is None:
+            self.sources = self._get_sources(resource, rows[0].keys() if rows else ())
+        if not self.sources:
+            return
+        keys = set()
+        for row in rows:
+            try:
+                key = tuple(
+                    _normalize(model_field, field.clean(row))
+                    for model_field, field in zip(self.fields, self.sources)
+                )
+            except Exception:
+                # the row fails to import, or is checked when it is validated
+                continue
+            if None not in key:
+                keys.add(key)
+        keys.difference_update(self.fetched)
+        if not keys:
+            return
+        if len(self.field_names) == 1:
+            query = Q(**{"%s__in" % self.field_names[0]: [key[0] for key in keys]})
+        else:
+            query = Q()
+            for key in keys:
+                query |= Q(**dict(zip(self.field_names, key)))
+        attnames = [field.attname for field in self.fields]
+        for pk, *values in (
+            self.get_queryset().filter(query).values_list("pk", *attnames)
+        ):
+            key = tuple(
+                _normalize(field, value) for field, value in zip(self.fields, values)
+            )
+            self.owners.setdefault(key, pk)
+            self.keys_by_pk[pk] = key
+        self.fetched.update(keys)
+
+    def _get_sources(self, resource, headers):
+        # the import field which sets each of the fields of the check
+        sources = []
+        import_fields = resource.get_import_fields()
+        for model_field in self.fields:
+            for field in import_fields:
+                if (
+                    field.attribute in (model_field.name, model_field.attname)
+                    and field.column_name in headers
+                    and not isinstance(field.widget, widgets.ManyToManyWidget)
+                    and (
+                        not isinstance(field.widget, widgets.ForeignKeyWidget)
+                        or isinstance(field.widget, widgets.CachedForeignKeyWidget)
+                    )
+                ):
+                    sources.append(field)
+                    break
+            else:
+                return []
+        return sources
+
+    def is_violated(self, instance, skip_pk=False):
+        key = self.get_key(instance, skip_pk=skip_pk)
+        if key is None:
+            return False
+        pk = instance._get_pk_val(self.model_class._meta)
+        if key in self.owners:
+            owner = self.owners[key]
+            if isinstance(owner, Model):
+                if owner is instance:
+                    return False
+                owner = owner._get_pk_val(self.model_class._meta)
+            return owner is None or instance._state.adding or owner != pk
+        if key in self.fetched:
+            return False
+        queryset = self.get_queryset().filter(**dict(zip(self.field_names, key)))
+        if not instance._state.adding and instance._is_pk_set(self.model_class._meta):
+            queryset = queryset.exclude(pk=pk)
+        return queryset.exists()
+
+    def add(self, instance, release):
+        pk = instance._get_pk_val(self.model_class._meta)
+        key = self.get_key(instance)
+        if release and pk is not None:
+            old_key = self.keys_by_pk.pop(pk, None)
+            if old_key is not None and old_key != key:
+                self.owners.pop(old_key, None)
+        if key is not None:
+            self.owners[key] = instance
+            if pk is not None:
+                self.keys_by_pk[pk] = key
+
+    def release(self, instance):
+        old_key = self.keys_by_pk.pop(
+            instance._get_pk_val(self.model_class._meta), None
+        )
+        if old_key is not None:
+            self.owners.pop(old_key, None)
+
+
+class BatchUniqueValidator:
+    """
+    Validates the unique fields, ``unique_together`` and the unique constraints
+    of the instances of an import, as ``full_clean()`` does, with one query per
+    check for each batch of rows rather than for each row.
+
+    :meth:`prefetch` loads the database rows which share the values of the
+    unique fields of a batch of rows, cleaned by the import fields which set
+    them.  Values which are only known once the instance is imported (e.g. set
+    by ``before_import_row()``) are checked with a query, as ``full_clean()``
+    does.  Instances which are saved by the import are tracked in memory, so
+    that duplicates within the dataset are reported before they are saved.
+
+    Values are compared in Python.  A database which compares values
+    differently (e.g. with a case-insensitive collation) may report a
+    duplicate which is not reported here.
+
+    Used when :attr:`~import_export.options.ResourceOptions.validate_unique_in_batches`
+    is enabled.
+    """
+
+    def __init__(self, resource):
+        self.resource = resource
+        self._checks = {}
+        model = resource._meta.model
+        # the unique constraints which are checked by field values
+        self.constraints = [
+            (model_class, constraint)
+            for model_class in [model, *model._meta.all_parents]
+            for constraint in model_class._meta.constraints
+            if isinstance(constraint, UniqueConstraint)
+            and constraint.fields
+            and constraint.condition is None
+            and constraint.nulls_distinct is not False
+            and not any(
+                model_class._meta.get_field(name).generated
+                for name in constraint.fields
+            )
+        ]
+        self.unique_checks = self._get_unique_checks(model)
+
+    @property
+    def validates_constraints(self):
+        """
+        Whether :meth:`validate` validates the model's constraints, so that
+        ``full_clean()`` must be called with ``validate_constraints=False``.
+        """
+        return bool(self.constraints)
+
+    def _get_unique_checks(self, model):
+        # the checks of validate_unique(), for an instance with no excluded fields
+        unique_checks, _ = model.__new__(model)._get_unique_checks()
+        return [
+            self._get_check(model_class, field_names)
+            for model_class, field_names in unique_checks
+        ]
+
+    def _get_check(self, model_class, field_names, using=None):
+        key = (model_class, tuple(field_names), using)
+        check = self._checks.get(key)
+        if check is None:
+            check = self._checks[key] = _UniqueCheck(model_class, field_names, using)
+        return check
+
+    def _get_constraint_check(self, model_class, constraint):
+        return self._get_check(
+            model_class, constraint.fields, router.db_for_write(model_class)
+        )
+
+    def prefetch(self, rows):
+        """
+        Loads the database rows which may conflict with ``rows``, a list of
+        dicts of the rows of a batch.
+        """
+        for check in self.unique_checks:
+            check.prefetch(self.resource, rows)
+        for model_class, constraint in self.constraints:
+            self._get_constraint_check(model_class, constraint).prefetch(
+                self.resource, rows
+            )
+
+    def validate(self, instance, errors):
+        """
+        Adds the errors which ``validate_unique()`` (and
+        ``validate_constraints()``, if :attr:`validates_constraints`) would
+        raise for ``instance`` to ``errors``, a dict of the errors raised so far,
+        and returns it.
+        """
+        exclude = {name for name in errors if name != NON_FIELD_ERRORS}
+        unique_checks, date_checks = instance._get_unique_checks(exclude=exclude)
+        unique_errors = {}
+        for model_class, field_names in unique_checks:
+            check = self._get_check(model_class, field_names)
+            if check.is_violated(instance, skip_pk=True):
+                key = field_names[0] if len(field_names) == 1 else NON_FIELD_ERRORS
+                unique_errors.setdefault(key, []).append(
+                    instance.unique_error_message(model_class, field_names)
+                )
+        for key, date_errors in instance._perform_date_checks(date_checks).items():
+            unique_errors.setdefault(key, []).extend(date_errors)
+        if unique_errors:
+            errors = ValidationError(unique_errors).update_error_dict(errors)
+
+        if not self.validates_constraints:
+            return errors
+        exclude.update(name for name in errors if name != NON_FIELD_ERRORS)
+        batched = {id(constraint) for _, constraint in self.constraints}
+        using = router.db_for_write(instance.__class__, instance=instance)
+        constraint_errors = {}
+        for model_class, model_constraints in instance.get_constraints():
+            for constraint in model_constraints:
+                try:
+                    if id(constraint) not in batched:
+                        constraint.validate(
+                            model_class, instance, exclude=exclude, using=using
+                        )
+                    elif not any(name in exclude for name in constraint.fields):
+                        self._validate_constraint(model_class, constraint, instance)
+                except ValidationError as e:
+                    if (
+                        getattr(e, "code", None) == "unique"
+                        and len(constraint.fields) == 1
+                    ):
+                        constraint_errors.setdefault(constraint.fields[0], []).append(e)
+                    else:
+                        constraint_errors = e.update_error_dict(constraint_errors)
+        if constraint_errors:
+            errors = ValidationError(constraint_errors).update_error_dict(errors)
+        return errors
+
+    def _validate_constraint(self, model_class, constraint, instance):
+        # raises the error of UniqueConstraint.validate()
+        if not self._get_constraint_check(model_class, constraint).is_violated(
+            instance
+        ):
+            return
+        if constraint.violation_error_message == (
+            constraint.default_violation_error_message
+        ):
+            message = instance.unique_error_message(model_class, constraint.fields)
+            raise ValidationError(message, code=message.code)
+        raise ValidationError(
+            constraint.get_violation_error_message(),
+            code=constraint.violation_error_code,
+        )
+
+    def add(self, instance, release=True):
+        """
+        Records the values of the unique fields of ``instance``, which is saved
+        (or queued to be saved) by the import.  If ``release`` is set, the
+        instance has been saved, and its previous values are free.
+        """
+        for check in self._checks.values():
+            check.add(instance, release)
+
+    def release(self, instance):
+        """
+        Frees the values of the unique fields of ``instance``, which has been
+        deleted by the import.
+        """
+        for check in self._checks.values():
+            check.release(instance)
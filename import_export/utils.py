@@ -1,5 +1,12 @@
+import contextlib
+import contextvars
+
 from django.db import transaction
 
+# the database of the lookups of the import or export in progress, and the
+# database which is queried for the instances which are not found in it
+_lookup_db = contextvars.ContextVar("import_export_lookup_db", default=(None, None))
+
 
 class atomic_if_using_transaction:
     """Context manager wraps `atomic` if `using_transactions`.
@@ -29,3 +36,53 @@ class atomic_if_using_transaction:
 def get_related_model(field):
     if hasattr(field, "related_model"):
         return field.related_model
+
+
+@contextlib.contextmanager
+def using_lookup_db(using, fallback=None):
+    """Context manager which routes the lookups made by the instance loaders and
+    the relation widgets to the database ``using`` (see
+    :meth:`~import_export.resources.Resource.get_lookup_db_connection_name`).
+
+    If ``fallback`` is set, instances which are not found in ``using`` (such as
+    rows which have not reached a read replica yet) are looked up in
+    ``fallback``.  If ``using`` is ``None``, lookups are routed by the database
+    routers.
+    """
+    token = _lookup_db.set((using, fallback))
+    try:
+        yield
+    finally:
+        _lookup_db.reset(token)
+
+
+def get_lookup_dbs():
+    """Returns the ``(using, fallback)`` databases of the lookups in progress
+    (see :func:`using_lookup_db`)."""
+    return _lookup_db.get()
+
+
+def get_lookup_queryset(queryset):
+    """Returns ``queryset`` on the database of the lookups in progress."""
+    using, _ = _lookup_db.get()
+    return queryset if using is None else queryset.using(using)
+
+
+def get_lookup_fallback_queryset(queryset):
+    """Returns ``queryset`` on the fallback database of the lookups in progress,
+    or ``None`` if there is none."""
+    _, fallback = _lookup_db.get()
+    return None if fallback is None else queryset.using(fallback)
+
+
+def get_lookup_instance(queryset, **lookup_kwargs):
+    """Returns the instance of ``queryset`` matching ``lookup_kwargs``, from the
+    database of the lookups in progress, or else from their fallback database.
+    """
+    try:
+        return get_lookup_queryset(queryset).get(**lookup_kwargs)
+    except queryset.model.DoesNotExist:
+        fallback_queryset = get_lookup_fallback_queryset(queryset)
+        if fallback_queryset is None:
+            raise
+    return fallback_queryset.get(**lookup_kwargs)
@@ -1,21 +1,37 @@
+import contextlib
+import contextvars
 import json
 import logging
 import numbers
+import unicodedata
 from collections import defaultdict, namedtuple
+from copy import deepcopy
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 
 import django
 from django.conf import settings
-from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import F
-from django.utils import timezone
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ObjectDoesNotExist,
+    ValidationError,
+)
+from django.core.signals import setting_changed
+from django.db.models import F, Model, Q
+from django.utils import numberformat, timezone
 from django.utils.dateparse import parse_duration
 from django.utils.encoding import force_str, smart_str
-from django.utils.formats import number_format, sanitize_separators
+from django.utils.formats import get_format
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
 from import_export.exceptions import WidgetError
+from import_export.utils import (
+    get_lookup_dbs,
+    get_lookup_fallback_queryset,
+    get_lookup_instance,
+    get_lookup_queryset,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +43,106 @@ def format_datetime(value, datetime_format):
     return value.strftime(format_)
 
 
+#: ``strptime()`` directives which only match digits (and spaces).
+_NUMERIC_DIRECTIVES = frozenset("dfGHIjmMSuUVwWyY")
+
+#: Formats of ISO 8601 values, which ``fromisoformat()`` parses much faster than
+#: ``strptime()``.
+_ISO_DATETIME_FORMATS = frozenset(
+    (
+        "%Y-%m-%d",
+        "%Y-%m-%d %H:%M",
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d %H:%M:%S.%f",
+        "%Y-%m-%dT%H:%M",
+        "%Y-%m-%dT%H:%M:%S",
+        "%Y-%m-%dT%H:%M:%S.%f",
+    )
+)
+_ISO_TIME_FORMATS = frozenset(("%H:%M", "%H:%M:%S", "%H:%M:%S.%f"))
+
+# the date of the values parsed by strptime() from a time format
+_STRPTIME_DEFAULT_DATE = date(1900, 1, 1)
+
+
+def _parse_iso_time(value):
+    return datetime.combine(_STRPTIME_DEFAULT_DATE, time.fromisoformat(value))
+
+
+def _get_format_signature(format_):
+    """
+    Returns the punctuation of the values matched by ``format_``, ignoring
+    whitespace, or ``None`` if it depends on the value.  Values matched by two
+    formats with different signatures are never matched by both.
+    """
+    signature = []
+    chars = iter(format_)
+    for char in chars:
+        if char == "%":
+            directive = next(chars, "")
+            if directive == "%":
+                signature.append(directive)
+            elif directive not in _NUMERIC_DIRECTIVES:
+                return None
+        elif not char.isalnum() and not char.isspace():
+            signature.append(char)
+    return "".join(signature)
+
+
+class _CompiledFormats:
+    """
+    The input formats of a date or time widget, compiled for parsing.
+
+    Values are parsed with the formats in order, as by ``strptime()``, except
+    that:
+
+    * ISO 8601 values are parsed with ``fromisoformat()``, and are accepted
+      only if they render back to the same string with the format.
+    * The format which parsed the previous value is tried first, if none of
+      the formats before it can match the same values.
+    """
+
+    def __init__(self, formats):
+        self.formats = formats
+        self.parsers = []
+        for format_ in formats:
+            if format_ in _ISO_DATETIME_FORMATS:
+                self.parsers.append(datetime.fromisoformat)
+            elif format_ in _ISO_TIME_FORMATS:
+                self.parsers.append(_parse_iso_time)
+            else:
+                self.parsers.append(None)
+        signatures = [_get_format_signature(format_) for format_ in formats]
+        indexes = list(range(len(formats)))
+        self.orders = [indexes]
+        for i in indexes[1:]:
+            exclusive = signatures[i] is not None and all(
+                signature is not None and signature != signatures[i]
+                for signature in signatures[:i]
+            )
+            self.orders.append(
+                [i] + indexes[:i] + indexes[i + 1 :] if exclusive else indexes
+            )
+
+    def parse(self, value, index):
+        format_ = self.formats[index]
+        parser = self.parsers[index]
+        if parser is not None:
+            try:
+                parsed = parser(value)
+            except (ValueError, TypeError):
+                pass
+            else:
+                if parsed.strftime(format_) == value:
+                    return parsed
+        return datetime.strptime(value, format_)
+
+
 class _ParseDateTimeMixin:
     """Internal Mixin for shared logic with date and datetime conversions."""
 
+    cache_attributes = ("_compiled_formats", "_last_format", "_render_format")
+
     def __init__(
         self,
         format=None,
@@ -48,24 +161,48 @@ class _ParseDateTimeMixin:
         if isinstance(value, value_type):
             return value
 
-        for format_ in self.formats:
+        compiled = self._get_compiled_formats()
+        for index in compiled.orders[self.__dict__.get("_last_format", 0)]:
             try:
-                parsed_date = datetime.strptime(value, format_)
-                if value_type is date:
-                    return parsed_date.date()
-                if value_type is time:
-                    return parsed_date.time()
-                return parsed_date
+                parsed_date = compiled.parse(value, index)
             except (ValueError, TypeError) as e:
                 logger.debug(str(e))
+                continue
+            self._last_format = index
+            if value_type is date:
+                return parsed_date.date()
+            if value_type is time:
+                return parsed_date.time()
+            return parsed_date
         raise ValueError("Value could not be parsed using defined formats.")
 
+    def _get_compiled_formats(self):
+        compiled = self.__dict__.get("_compiled_formats")
+        if compiled is None or compiled.formats is not self.formats:
+            compiled = self._compiled_formats = _CompiledFormats(self.formats)
+            self._last_format = 0
+        return compiled
+
+    def _format_datetime(self, value):
+        # the same as format_datetime(), with the sanitized format cached
+        render_format = self.__dict__.get("_render_format")
+        if render_format is None or render_format[0] is not self.formats[0]:
+            render_format = self._render_format = (
+                self.formats[0],
+                django.utils.formats.sanitize_strftime_format(self.formats[0]),
+            )
+        return value.strftime(render_format[1])
+
 
 class Widget:
     """
     A Widget handles converting between import and export representations.
     """
 
+    #: Names of instance attributes holding per-instance caches.
+    #: They are never copied, so that a copied widget starts with empty caches.
+    cache_attributes = ()
+
     def __init__(self, coerce_to_string=True):
         """
         :param coerce_to_string: If True, :meth:`~import_export.widgets.Widget.render`
@@ -96,10 +233,128 @@ class Widget:
         """
         return force_str(value) if value is not None else ""
 
+    def __copy__(self):
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self._get_copyable_state())
+        return clone
+
+    def __deepcopy__(self, memo):
+        clone = self.__class__.__new__(self.__class__)
+        memo[id(self)] = clone
+        clone.__dict__.update(deepcopy(self._get_copyable_state(), memo))
+        return clone
+
+    def _get_copyable_state(self):
+        state = self.__dict__
+        if any(name in state for name in self.cache_attributes):
+            state = {
+                name: value
+                for name, value in state.items()
+                if name not in self.cache_attributes
+            }
+        return state
+
+
+class _NumberCodec:
+    """
+    Converts numbers from and to strings with the separators of a language,
+    as ``sanitize_separators()`` and ``number_format()`` do.
+    """
+
+    def __init__(self, lang, use_thousand_separator):
+        self.decimal_separator = get_format("DECIMAL_SEPARATOR", lang)
+        self.thousand_separator = get_format("THOUSAND_SEPARATOR", lang)
+        self.grouping = get_format("NUMBER_GROUPING", lang)
+        self.use_thousand_separator = use_thousand_separator
+        self.thousand_separators = {
+            self.thousand_separator,
+            unicodedata.normalize("NFKD", self.thousand_separator),
+        }
+
+    def sanitize(self, value):
+        if self.decimal_separator in value:
+            value, decimals = value.split(self.decimal_separator, 1)
+        else:
+            decimals = None
+        if self.use_thousand_separator and not (
+            # a dot is probably a decimal separator (see Django #22171)
+            self.thousand_separator == "."
+            and value.count(".") == 1
+            and len(value.split(".")[-1]) != 3
+        ):
+            for separator in self.thousand_separators:
+                value = value.replace(separator, "")
+        return value if decimals is None else value + "." + decimals
+
+    def format(self, value):
+        if type(value) is int and not (
+            self.use_thousand_separator and self.grouping != 0
+        ):
+            return str(value)
+        return "" + numberformat.format(
+            value,
+            self.decimal_separator,
+            grouping=self.grouping,
+            thousand_sep=self.thousand_separator,
+            use_l10n=True,
+        )
+
+
+# (language, USE_THOUSAND_SEPARATOR) -> _NumberCodec
+_number_codecs = {}
+
+# the codec resolved for the current import or export
+_active_number_codec = contextvars.ContextVar(
+    "import_export_number_codec", default=None
+)
+
+
+def _get_number_codec():
+    codec = _active_number_codec.get()
+    if codec is None:
+        codec = _resolve_number_codec()
+    return codec
+
+
+def _resolve_number_codec():
+    use_thousand_separator = settings.USE_THOUSAND_SEPARATOR
+    lang = get_language()
+    try:
+        return _number_codecs[lang, use_thousand_separator]
+    except KeyError:
+        codec = _number_codecs[lang, use_thousand_separator] = _NumberCodec(
+            lang, use_thousand_separator
+        )
+        return codec
+
+
+@contextlib.contextmanager
+def _number_codec_scope():
+    """
+    Resolves the number separators of the active language once for the
+    duration of an import or export.
+    """
+    token = _active_number_codec.set(_resolve_number_codec())
+    try:
+        yield
+    finally:
+        _active_number_codec.reset(token)
+
+
+def _reset_number_codecs(**kwargs):
+    _number_codecs.clear()
+
+
+setting_changed.connect(_reset_number_codecs)
+
 
 class NumberWidget(Widget):
     """
     Widget for converting numeric fields.
+
+    Strings are cleaned and numbers are rendered with the decimal and thousand
+    separators of the active language, which are resolved once per import or
+    export.
     """
 
     def is_empty(self, value):
@@ -113,10 +368,16 @@ class NumberWidget(Widget):
             return (
                 ""
                 if value is None or not isinstance(value, numbers.Number)
-                else "" + number_format(value)
+                else _get_number_codec().format(value)
             )
         return value
 
+    @staticmethod
+    def _sanitize(value):
+        if isinstance(value, str):
+            return _get_number_codec().sanitize(value)
+        return value
+
 
 class FloatWidget(NumberWidget):
     """
@@ -136,7 +397,7 @@ class FloatWidget(NumberWidget):
         """
         if self.is_empty(value):
             return None
-        return float(sanitize_separators(value))
+        return float(self._sanitize(value))
 
 
 class IntegerWidget(NumberWidget):
@@ -160,7 +421,9 @@ class IntegerWidget(NumberWidget):
         """
         if self.is_empty(value):
             return None
-        return int(Decimal(sanitize_separators(value)))
+        if type(value) is int:
+            return value
+        return int(Decimal(self._sanitize(value)))
 
 
 class DecimalWidget(NumberWidget):
@@ -181,7 +444,9 @@ class DecimalWidget(NumberWidget):
         """
         if self.is_empty(value):
             return None
-        return Decimal(force_str(sanitize_separators(value)))
+        if type(value) is int:
+            return Decimal(value)
+        return Decimal(force_str(self._sanitize(value)))
 
 
 class CharWidget(Widget):
@@ -310,7 +575,7 @@ class DateWidget(_ParseDateTimeMixin, Widget):
             return value
         if not value or not isinstance(value, date):
             return ""
-        return format_datetime(value, self.formats[0])
+        return self._format_datetime(value)
 
 
 class DateTimeWidget(_ParseDateTimeMixin, Widget):
@@ -352,7 +617,7 @@ class DateTimeWidget(_ParseDateTimeMixin, Widget):
             # binary formats such as xlsx must not have tz set
             return value.replace(tzinfo=None) if force_native_type else value
 
-        return format_datetime(value, self.formats[0])
+        return self._format_datetime(value)
 
 
 class TimeWidget(_ParseDateTimeMixin, Widget):
@@ -531,25 +796,49 @@ class ForeignKeyWidget(Widget):
             class Meta:
                 fields = ('author',)
 
+    If ``use_natural_foreign_keys`` is set, each distinct natural key is resolved
+    once.  If the lookup paths of the elements of the natural key are known (from
+    ``natural_key_fields``, or a ``natural_key_fields`` attribute of the model),
+    the resource passes every value in the widget's column to :meth:`prefetch`
+    before the import starts, so that the natural keys are resolved with one
+    query per :attr:`natural_key_batch_size` keys.  Otherwise, each natural key
+    is resolved with ``get_by_natural_key()``::
+
+        class Book(models.Model):
+            natural_key_fields = ("name", "author__name")
+
+            def natural_key(self):
+                return (self.name,) + self.author.natural_key()
+
     :param model: The Model the ForeignKey refers to (required).
     :param field: A field on the related model used for looking up a particular
         object.
     :param use_natural_foreign_keys: Use natural key functions to identify
         related object, default to False
+    :param natural_key_fields: The lookup paths of the elements of the natural
+        key of ``model``, default to None
     """
 
+    cache_attributes = ("_natural_key_cache",)
+
+    #: The maximum number of natural keys resolved by each query made by
+    #: :meth:`prefetch`.
+    natural_key_batch_size = 500
+
     def __init__(
         self,
         model,
         field="pk",
         use_natural_foreign_keys=False,
         key_is_id=False,
+        natural_key_fields=None,
         **kwargs,
     ):
         self.model = model
         self.field = field
         self.key_is_id = key_is_id
         self.use_natural_foreign_keys = use_natural_foreign_keys
+        self.natural_key_fields = natural_key_fields
         if use_natural_foreign_keys is True and key_is_id is True:
             raise WidgetError(
                 _("use_natural_foreign_keys and key_is_id cannot both be True")
@@ -609,11 +898,96 @@ class ForeignKeyWidget(Widget):
     def get_instance_by_natural_key(self, value):
         # natural keys will always be a tuple, which ends up as a json list.
         value = json.loads(value)
-        return self.model.objects.get_by_natural_key(*value)
+        natural_key_cache = self._get_natural_key_cache()
+        try:
+            return natural_key_cache[tuple(value)]
+        except (KeyError, TypeError):
+            pass
+        using, fallback = get_lookup_dbs()
+        manager = self.model.objects
+        try:
+            if using is not None:
+                manager = manager.db_manager(using)
+            instance = manager.get_by_natural_key(*value)
+        except self.model.DoesNotExist:
+            if fallback is None:
+                raise
+            instance = self.model.objects.db_manager(fallback).get_by_natural_key(
+                *value
+            )
+        try:
+            natural_key_cache[tuple(value)] = instance
+        except TypeError:
+            # the natural key is not hashable
+            pass
+        return instance
+
+    def _get_natural_key_cache(self):
+        if not hasattr(self, "_natural_key_cache"):
+            self._natural_key_cache = {}
+        return self._natural_key_cache
+
+    def _get_natural_key_fields(self):
+        if self.natural_key_fields is not None:
+            return tuple(self.natural_key_fields)
+        return tuple(getattr(self.model, "natural_key_fields", ()))
+
+    def prefetch(self, values):
+        """
+        Resolves the distinct natural keys in ``values`` with one query per
+        :attr:`natural_key_batch_size` keys.  Does nothing unless
+        ``use_natural_foreign_keys`` is set and the natural key fields of the
+        model are known.
+
+        :param values: An iterable of raw column values from the dataset.
+        """
+        fields = self._get_natural_key_fields()
+        if not self.use_natural_foreign_keys or not fields:
+            return
+        natural_key_cache = self._get_natural_key_cache()
+        keys = set()
+        for value in values:
+            if not value:
+                continue
+            try:
+                key = tuple(json.loads(value))
+                if len(key) == len(fields) and key not in natural_key_cache:
+                    keys.add(key)
+            except (ValueError, TypeError):
+                # invalid values are reported against each row by clean()
+                continue
+        if not keys:
+            return
+
+        annotations = {
+            "django_import_export_natural_key_%d" % i: F(field)
+            for i, field in enumerate(fields)
+        }
+        queryset = get_lookup_queryset(self.model.objects.annotate(**annotations))
+        keys = list(keys)
+        for i in range(0, len(keys), self.natural_key_batch_size):
+            lookup = Q()
+            for key in keys[i : i + self.natural_key_batch_size]:
+                lookup |= Q(**dict(zip(fields, key)))
+            found = defaultdict(list)
+            try:
+                for instance in queryset.filter(lookup):
+                    key = tuple(getattr(instance, name) for name in annotations)
+                    found[key].append(instance)
+            except (ValueError, TypeError, ValidationError) as e:
+                logger.debug(str(e))
+                continue
+            for key, instances in found.items():
+                # keys which match several instances are left to
+                # get_by_natural_key() to report
+                if len(instances) == 1:
+                    natural_key_cache[key] = instances[0]
 
     def get_instance_by_lookup_fields(self, value, row, **kwargs):
         lookup_kwargs = self.get_lookup_kwargs(value, row, **kwargs)
-        return self.get_queryset(value, row, **kwargs).get(**lookup_kwargs)
+        return get_lookup_instance(
+            self.get_queryset(value, row, **kwargs), **lookup_kwargs
+        )
 
     def get_lookup_kwargs(self, value, row, **kwargs):
         """
@@ -658,6 +1032,16 @@ class ForeignKeyWidget(Widget):
         return value
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "shapes", "size"])
+CacheInfo.__doc__ = """
+The statistics of the lookups made by a
+:class:`~import_export.widgets.CachedForeignKeyWidget`, as returned by
+:meth:`~import_export.widgets.CachedForeignKeyWidget.cache_info`.
+``shapes`` is the number of distinct sets of lookup fields which were used, and
+``size`` is the number of cached instances.
+"""
+
+
 class _CachedQuerySetWrapper:
     """
     A wrapper around a Django QuerySet that caches its results in a dictionary
@@ -667,40 +1051,106 @@ class _CachedQuerySetWrapper:
     because it is intended to be used as a drop-in replacement for QuerySet
     in case of ForeignKeyWidget that calls 'get()' method for every row
     in the import dataset.
+
+    An index is built for each distinct set of lookup field names ("shape")
+    the first time it is used.  Lookup values are converted with the
+    ``to_python()`` method of the model field they refer to, so that for example
+    ``"1"``, ``1`` and ``Decimal("1.0")`` find the same instance of an integer
+    field.  Values of unknown fields are compared as strings.
     """
 
-    def __init__(self, queryset):
+    def __init__(self, queryset, instances=None, partial=False):
         self.queryset = queryset
         self.model = queryset.model
+        # if set, these instances are cached rather than those of the queryset
+        self.cached_instances = instances
+        # whether the cached instances are only some of those of the queryset
+        self.partial = partial
+        self.hits = 0
+        self.misses = 0
+        # shape -> (key extractors, index)
+        self._indexes = {}
+
+    def _get_all_instances(self):
+        if self.cached_instances is None:
+            self.cached_instances = list(self.queryset)
+        return self.cached_instances
+
+    def _get_lookup_field(self, name):
+        opts = self.model._meta
+        if name == "pk":
+            return opts.pk
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return getattr(annotation, "target", None)
+        try:
+            return opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
 
-    def _get_instances(self, queryset, key_cls):
+    def _compile_extractor(self, name):
         """
-        Converts a queryset into a dictionary mapping lookup fields values
-        to lists of instances. The values of the returned dict are lists
-        to handle potential multiple instances with the same lookup fields values.
+        Returns an ``(attribute, to_python)`` tuple for the lookup field ``name``,
+        where ``attribute`` is the attribute of an instance which holds its value,
+        and ``to_python`` normalises lookup values.
         """
-        if hasattr(self, "_instances"):
-            return self._instances
-
-        self._instances = defaultdict(list)
-        for instance in queryset:
-            key = key_cls(
-                **{field: str(getattr(instance, field)) for field in key_cls._fields}
-            )
-            self._instances[key].append(instance)
+        field = self._get_lookup_field(name)
+        if field is None or name in self.queryset.query.annotations:
+            attribute = name
+        elif name == "pk":
+            attribute = "pk"
+        else:
+            attribute = getattr(field, "attname", name)
+        if field is None or not hasattr(field, "to_python"):
+            return attribute, str
+        return attribute, field.to_python
 
-        return self._instances
+    def _get_index(self, shape):
+        try:
+            return self._indexes[shape]
+        except KeyError:
+            pass
+        extractors = [self._compile_extractor(name) for name in shape]
+        index = defaultdict(list)
+        for instance in self._get_all_instances():
+            key = []
+            for attribute, to_python in extractors:
+                value = getattr(instance, attribute, None)
+                key.append(str(value) if to_python is str else value)
+            try:
+                index[tuple(key)].append(instance)
+            except TypeError:
+                # unhashable values cannot be looked up
+                continue
+        self._indexes[shape] = extractors, index
+        return extractors, index
+
+    def _make_key(self, extractors, values):
+        key = []
+        for (attribute, to_python), value in zip(extractors, values):
+            if value is None:
+                key.append(None)
+            elif isinstance(value, Model):
+                key.append(to_python(value.pk))
+            else:
+                key.append(to_python(value))
+        return tuple(key)
 
     def get(self, **lookup_fields):
-        Key = namedtuple("Key", list(lookup_fields.keys()))
-
-        instances = self._get_instances(self.queryset, Key)
-        key = Key(**{k: str(v) for k, v in lookup_fields.items()})
-        result = instances.get(key, [])
+        shape = tuple(sorted(lookup_fields))
+        extractors, index = self._get_index(shape)
+        try:
+            key = self._make_key(extractors, [lookup_fields[name] for name in shape])
+            result = index.get(key, [])
+        except (ValueError, TypeError, ValidationError):
+            # a value which cannot be converted matches no instance
+            result = []
 
         if len(result) == 1:
+            self.hits += 1
             return result[0]
 
+        self.misses += 1
         if len(result) == 0:
             raise self.model.DoesNotExist(
                 "%s matching query does not exist." % self.model._meta.object_name
@@ -710,6 +1160,10 @@ class _CachedQuerySetWrapper:
             % (self.model._meta.object_name, len(result))
         )
 
+    def cache_info(self):
+        size = len(self.cached_instances) if self.cached_instances is not None else 0
+        return CacheInfo(self.hits, self.misses, len(self._indexes), size)
+
 
 class CachedForeignKeyWidget(ForeignKeyWidget):
     """
@@ -721,7 +1175,9 @@ class CachedForeignKeyWidget(ForeignKeyWidget):
 
     Using this class has some limitations:
 
-    - It does not support caching when ``use_natural_foreign_keys=True`` is set.
+    - When ``use_natural_foreign_keys=True`` is set, natural keys are resolved as
+      by :class:`~import_export.widgets.ForeignKeyWidget`, and the queryset is
+      not cached.
 
     - It calls :meth:`~import_export.widgets.ForeignKeyWidget.get_queryset` only once,
       so if the queryset depends on the row data, this widget may not work as expected.
@@ -763,16 +1219,97 @@ class CachedForeignKeyWidget(ForeignKeyWidget):
                 def get_lookup_kwargs(self, value, row, **kwargs):
                     return {f'{self.field}__gt': value}
 
+    Before the import starts, the resource passes every value in the widget's
+    column to :meth:`prefetch`, so that only the related instances referenced by
+    the dataset are cached.  When the dataset references a large fraction of the
+    related instances (see :attr:`prefetch_max_ratio`), the whole queryset is
+    cached instead.  Widgets which override
+    :meth:`~import_export.widgets.ForeignKeyWidget.get_queryset` or
+    :meth:`~import_export.widgets.ForeignKeyWidget.get_lookup_kwargs` are not
+    prefetched, because the queryset or the lookup may depend on the row; they
+    cache the whole queryset on the first lookup.
+
+    If ``lookup_cache`` is set, the instances of the queryset are held in that
+    :class:`~import_export.lookup_caches.LookupCache`, and are shared with other
+    widgets and imports which use it.  This suits small reference tables which
+    are imported against frequently, and :meth:`prefetch` is then not used::
+
+        from import_export.lookup_caches import default_lookup_cache
+
+        widget = CachedForeignKeyWidget(
+            Country, "code", lookup_cache=default_lookup_cache
+        )
+
     :param model: The Model the ForeignKey refers to (required).
     :param field: A field on the related model used for looking up a particular
         object.
     :param use_natural_foreign_keys: Use natural key functions to identify
         related object, default to False
+    :param lookup_cache: A :class:`~import_export.lookup_caches.LookupCache`
+        shared by imports, default to None
     """
 
+    cache_attributes = ("_cached_qs", "_natural_key_cache")
+
+    def __init__(self, model, field="pk", *args, lookup_cache=None, **kwargs):
+        self.lookup_cache = lookup_cache
+        super().__init__(model, field, *args, **kwargs)
+
+    #: The maximum number of lookup values in each query made by :meth:`prefetch`.
+    prefetch_batch_size = 1000
+
+    #: If the number of distinct values passed to :meth:`prefetch` is at least
+    #: this fraction of the number of related instances, the whole queryset is
+    #: cached rather than the referenced instances only.  The instances are
+    #: counted up to the number at which the fraction is reached, so that large
+    #: tables are not counted in full.  ``None`` disables the whole queryset
+    #: cache.
+    prefetch_max_ratio = 0.5
+
     def _contains_relations(self):
         return "__" in self.field
 
+    def prefetch(self, values):
+        """
+        Caches the related instances matching the distinct lookup values in
+        ``values``, with one query per :attr:`prefetch_batch_size` values.  Does
+        nothing if ``get_queryset()`` or ``get_lookup_kwargs()`` is overridden.
+
+        :param values: An iterable of raw column values from the dataset.
+        """
+        if self.use_natural_foreign_keys:
+            super().prefetch(values)
+            return
+        if (
+            hasattr(self, "_cached_qs")
+            or self.lookup_cache is not None
+            # the queryset or the lookup values may depend on the row
+            or type(self).get_queryset is not CachedForeignKeyWidget.get_queryset
+            or type(self).get_lookup_kwargs
+            is not CachedForeignKeyWidget.get_lookup_kwargs
+        ):
+            return
+        ids = list({value for value in values if value})
+        if not ids:
+            return
+        try:
+            queryset = get_lookup_queryset(self.get_queryset(None, None))
+            if self.prefetch_max_ratio:
+                # the most instances of which the values are a large fraction
+                limit = int(len(ids) / self.prefetch_max_ratio)
+                if queryset[: limit + 1].count() <= limit:
+                    # the whole queryset is cached on the first lookup
+                    return
+            instances = []
+            for i in range(0, len(ids), self.prefetch_batch_size):
+                batch = ids[i : i + self.prefetch_batch_size]
+                instances.extend(queryset.filter(**{"%s__in" % self.field: batch}))
+        except (ValueError, TypeError, ValidationError) as e:
+            # invalid values are reported against each row by clean()
+            logger.debug(str(e))
+            return
+        self._cached_qs = _CachedQuerySetWrapper(queryset, instances, partial=True)
+
     def get_queryset(self, value, row, *args, **kwargs):
         queryset = super().get_queryset(value, row, *args, **kwargs)
         if self._contains_relations():
@@ -786,13 +1323,36 @@ class CachedForeignKeyWidget(ForeignKeyWidget):
             return {"django_import_export_cached_lookup": value}
         return super().get_lookup_kwargs(value, row, **kwargs)
 
+    def cache_info(self):
+        """
+        Returns a :class:`~import_export.widgets.CacheInfo` with the hit and
+        miss counts of the lookups made since the instances were cached, or
+        ``None`` if nothing is cached.  Misses of a partial cache built by
+        :meth:`prefetch` are each resolved with a query.
+        """
+        if not hasattr(self, "_cached_qs"):
+            return None
+        return self._cached_qs.cache_info()
+
     def get_instance_by_lookup_fields(self, value, row, **kwargs):
         if not hasattr(self, "_cached_qs"):
-            queryset = self.get_queryset(value, row, **kwargs)
-            self._cached_qs = _CachedQuerySetWrapper(queryset)
+            queryset = get_lookup_queryset(self.get_queryset(value, row, **kwargs))
+            if self.lookup_cache is not None:
+                self._cached_qs = _CachedQuerySetWrapper(
+                    queryset, self.lookup_cache.get_instances(queryset)
+                )
+            else:
+                self._cached_qs = _CachedQuerySetWrapper(queryset)
 
         lookup_kwargs = self.get_lookup_kwargs(value, row, **kwargs)
-        return self._cached_qs.get(**lookup_kwargs)
+        try:
+            return self._cached_qs.get(**lookup_kwargs)
+        except self.model.DoesNotExist:
+            if not self._cached_qs.partial and get_lookup_dbs()[1] is None:
+                raise
+        # the value was not in the prefetched dataset, or is looked up in the
+        # fallback database
+        return super().get_instance_by_lookup_fields(value, row, **kwargs)
 
 
 class ManyToManyWidget(Widget):
@@ -838,6 +1398,10 @@ class ManyToManyWidget(Widget):
         Splits the input by the configured separator and looks up model instances
         using the specified field. Filters out empty values after splitting.
 
+        During an import which looks up instances in a read database with a
+        fallback, the instances are read from the fallback database if any of
+        them is missing from the read database.
+
         :param value: String of separated values, or a single numeric value.
         :param row: The current row being processed.
         :param **kwargs: Optional keyword arguments.
@@ -848,12 +1412,15 @@ class ManyToManyWidget(Widget):
         if not value:
             return self.model.objects.none()
         queryset = self.get_queryset(value, row, **kwargs)
-        if isinstance(value, (float, int)):
-            ids = [int(value)]
-        else:
-            ids = value.split(self.separator)
-            ids = filter(None, [i.strip() for i in ids])
-        return queryset.filter(**{"%s__in" % self.field: ids})
+        ids = self.split_values(value)
+        lookup_kwargs = {"%s__in" % self.field: ids}
+        lookup_queryset = get_lookup_queryset(queryset).filter(**lookup_kwargs)
+        if get_lookup_dbs()[1] is not None:
+            found = lookup_queryset.values(self.field).distinct().count()
+            if found < len(set(ids)):
+                # some instances have not reached the read database yet
+                return get_lookup_fallback_queryset(queryset).filter(**lookup_kwargs)
+        return lookup_queryset
 
     def render(self, value, **kwargs):
         """
@@ -865,3 +1432,171 @@ class ManyToManyWidget(Widget):
             ids = [smart_str(getattr(obj, self.field)) for obj in value.all()]
             return self.separator.join(ids)
         return ""
+
+    def split_values(self, value):
+        """
+        :return: A list of the lookup values contained in ``value``.
+          Empty values are removed.
+
+        :param value: String of separated values, or a single numeric value.
+        """
+        if not value:
+            return []
+        if isinstance(value, (float, int)):
+            return [int(value)]
+        return [i for i in (v.strip() for v in value.split(self.separator)) if i]
+
+
+class CachedManyToManyWidget(ManyToManyWidget):
+    """
+    A :class:`~import_export.widgets.ManyToManyWidget` subclass that caches
+    related instances to minimize database hits during import. The default
+    :class:`~import_export.widgets.ManyToManyWidget` makes a query for each row,
+    and :meth:`~import_export.resources.Resource.skip_row` cleans the row a second
+    time.
+
+    Before the import starts, the resource passes every value in the widget's
+    column to :meth:`prefetch`, so that all distinct related instances are
+    resolved with a single query.  Subsequent calls to
+    :meth:`~import_export.widgets.CachedManyToManyWidget.clean` are served from
+    a map of lookup values to instances.  Values not found in the map (for
+    example if the widget is used outside of an import) are fetched with one
+    query per call.
+
+    Using this class has some limitations:
+
+    - The instances are cached by lookup value, so the queryset returned by
+      :meth:`~import_export.widgets.ManyToManyWidget.get_queryset` must be static
+      for all rows.  Widgets which override ``get_queryset()`` are not
+      prefetched.
+
+    - :meth:`~import_export.widgets.CachedManyToManyWidget.clean` returns a list of
+      instances rather than a ``QuerySet``.
+
+    - Unlike :class:`~import_export.widgets.ManyToManyWidget`, a value which does
+      not match any instance raises ``ValueError``.  During an import, the values
+      are cleaned by :meth:`~import_export.resources.Resource.import_instance`,
+      so that the row is reported as invalid.
+
+    Lookup values are compared after conversion by the ``to_python()`` method of
+    the model field they refer to, so that (for example) UUIDs match regardless
+    of case.
+
+    :param model: The model the ManyToMany field refers to (required).
+    :param separator: Defaults to ``','``.
+    :param field: A field on the related model. Default is ``pk``.
+    """
+
+    cache_attributes = ("_cached_instances",)
+
+    def _contains_relations(self):
+        return "__" in self.field
+
+    def _get_lookup_value(self, instance):
+        if self._contains_relations():
+            return instance.django_import_export_cached_lookup
+        return getattr(instance, self.field)
+
+    def _get_cached_instances(self):
+        if not hasattr(self, "_cached_instances"):
+            self._cached_instances = {}
+        return self._cached_instances
+
+    def _get_target_field(self):
+        # the model field which self.field refers to, if it can be resolved
+        field = None
+        model = self.model
+        try:
+            for name in self.field.split("__"):
+                if field is not None:
+                    model = field.related_model
+                    if model is None:
+                        return None
+                field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        return field
+
+    def _get_key(self, value, target_field):
+        if target_field is not None:
+            try:
+                return target_field.to_python(value)
+            except ValidationError:
+                pass
+        return str(value)
+
+    def _fetch(self, ids, value, row, fallback=False, **kwargs):
+        queryset = self.get_queryset(value, row, **kwargs)
+        if self._contains_relations():
+            queryset = queryset.annotate(
+                django_import_export_cached_lookup=F(self.field)
+            )
+        if fallback:
+            queryset = get_lookup_fallback_queryset(queryset)
+            if queryset is None:
+                return
+        else:
+            queryset = get_lookup_queryset(queryset)
+        cached_instances = self._get_cached_instances()
+        target_field = self._get_target_field()
+        for instance in queryset.filter(**{"%s__in" % self.field: ids}):
+            key = self._get_key(self._get_lookup_value(instance), target_field)
+            cached_instances[key] = instance
+
+    def prefetch(self, values):
+        """
+        Resolves all distinct lookup values in ``values`` with a single query.
+        Does nothing if ``get_queryset()`` is overridden.
+
+        :param values: An iterable of raw column values from the dataset.
+        """
+        if type(self).get_queryset is not CachedManyToManyWidget.get_queryset:
+            # the queryset may depend on the row
+            return
+        cached_instances = self._get_cached_instances()
+        target_field = self._get_target_field()
+        ids = {
+            i
+            for value in values
+            for i in self.split_values(value)
+            if self._get_key(i, target_field) not in cached_instances
+        }
+        if ids:
+            try:
+                self._fetch(ids, None, None)
+            except (ValueError, TypeError, ValidationError) as e:
+                # invalid values are reported against each row by clean()
+                logger.debug(str(e))
+
+    def clean(self, value, row=None, **kwargs):
+        """
+        Converts a separated string of values into a list of related instances.
+
+        :param value: String of separated values, or a single numeric value.
+        :param row: The current row being processed.
+        :param **kwargs: Optional keyword arguments.
+        :returns: A list containing the related model instances, or an empty list
+            if no value provided.
+        :raises ValueError: If any value does not match a related instance.
+        """
+        target_field = self._get_target_field()
+        keys = {i: self._get_key(i, target_field) for i in self.split_values(value)}
+        cached_instances = self._get_cached_instances()
+        missing = [i for i, key in keys.items() if key not in cached_instances]
+        if missing:
+            self._fetch(missing, value, row, **kwargs)
+            missing = [i for i in missing if keys[i] not in cached_instances]
+            if missing:
+                self._fetch(missing, value, row, fallback=True, **kwargs)
+                missing = [i for i in missing if keys[i] not in cached_instances]
+            if missing:
+                raise ValueError(
+                    _("%(model)s matching %(field)s not found: %(values)s")
+                    % {
+                        "model": self.model._meta.object_name,
+                        "field": self.field,
+                        "values": ", ".join(str(i) for i in missing),
+                    }
+                )
+        # remove duplicates but keep the order in which values were declared
+        return list({key: cached_instances[key] for key in keys.values()}.values())
@@ -193,3 +193,26 @@ class UUIDBook(models.Model):
 class WithPositiveIntegerFields(models.Model):
     big = models.PositiveBigIntegerField(null=True)
     small = models.PositiveSmallIntegerField(null=True)
+
+
+class Edition(models.Model):
+    """A model with unique constraints (see validate_unique_in_batches)"""
+
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="+")
+    number = models.IntegerField()
+    isbn = models.CharField(max_length=13, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["book", "number"], name="unique_book_edition_number"
+            ),
+            models.UniqueConstraint(
+                fields=["isbn"],
+                name="unique_edition_isbn",
+                violation_error_message="An edition with this ISBN exists.",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(number__gte=1), name="edition_number_gte_1"
+            ),
+        ]
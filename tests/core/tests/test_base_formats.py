@@ -8,8 +8,9 @@ import openpyxl
 import tablib
 from django.test import TestCase, override_settings
 from django.utils.encoding import force_str
-from tablib.core import UnsupportedFormat
+from tablib.formats import registry
 
+from import_export.columnar import ColumnarDataset
 from import_export.formats import base_formats
 from import_export.widgets import NumberWidget
 
@@ -18,19 +19,43 @@ class FormatTest(TestCase):
     def setUp(self):
         self.format = base_formats.Format()
 
-    @mock.patch(
-        "import_export.formats.base_formats.HTML.get_format", side_effect=ImportError
-    )
+    @mock.patch.dict(registry._formats, clear=True)
+    @mock.patch("import_export.formats.base_formats.find_spec", return_value=None)
     def test_format_non_available1(self, mocked):
         self.assertFalse(base_formats.HTML.is_available())
+        mocked.assert_called_once_with("tablib.formats._html")
 
-    @mock.patch(
-        "import_export.formats.base_formats.HTML.get_format",
-        side_effect=UnsupportedFormat,
-    )
+    @mock.patch.dict(registry._formats, clear=True)
+    @mock.patch("import_export.formats.base_formats.find_spec", side_effect=ImportError)
     def test_format_non_available2(self, mocked):
         self.assertFalse(base_formats.HTML.is_available())
 
+    def test_format_available_in_tablib_registry(self):
+        class CustomFormat(base_formats.TablibFormat):
+            TABLIB_MODULE = "custom_formats._custom"
+
+        self.assertFalse(CustomFormat.is_available())
+        with mock.patch.dict(
+            registry._formats, {"custom": "custom_formats.CustomFormat"}
+        ):
+            self.assertTrue(CustomFormat.is_available())
+
+    def test_format_non_available_required_module(self):
+        def find_spec(name):
+            return None if name == "openpyxl" else mock.sentinel.spec
+
+        with mock.patch(
+            "import_export.formats.base_formats.find_spec", side_effect=find_spec
+        ):
+            self.assertFalse(base_formats.XLSX.is_available())
+
+    def test_format_available_does_not_import_format(self):
+        with mock.patch(
+            "import_export.formats.base_formats.registry.get_format"
+        ) as mock_get_format:
+            self.assertTrue(base_formats.XLSX.is_available())
+        mock_get_format.assert_not_called()
+
     def test_format_available(self):
         self.assertTrue(base_formats.CSV.is_available())
 
@@ -116,6 +141,15 @@ class XLSXTest(TestCase):
             unittest.mock.ANY, read_only=True, data_only=True
         )
 
+    @override_settings(IMPORT_EXPORT_ESCAPE_ILLEGAL_CHARS_ON_EXPORT=True)
+    def test_export_columnar_data_escape_illegal_chars(self):
+        dataset = ColumnarDataset(headers=["id", "name"])
+        dataset.append((1, "invalid" + chr(11)))
+        dataset.append((2, "valid"))
+        wb = openpyxl.load_workbook(BytesIO(self.format.export_data(dataset)))
+        self.assertEqual("invalid\N{REPLACEMENT CHARACTER}", wb.active["B2"].value)
+        self.assertEqual("valid", wb.active["B3"].value)
+
     @override_settings(IMPORT_EXPORT_IMPORT_IGNORE_BLANK_LINES=False)
     def test_xlsx_create_dataset__empty_rows(self):
         """Default situation without the flag: do not ignore the empty rows for
@@ -241,6 +275,28 @@ class CSVTest(TestCase):
         res = self.format.export_data(self.dataset)
         self.assertEqual("id,username\r\n1,x\r\n", res)
 
+    def test_export_columnar_data(self):
+        rows = [(1, 'x "y"'), (2, None), (3, "a;b")]
+        dataset = tablib.Dataset(*rows, headers=["id", "username"])
+        columnar_dataset = ColumnarDataset(headers=["id", "username"])
+        columnar_dataset.extend(rows)
+        for kwargs in ({}, {"delimiter": ";"}):
+            self.assertEqual(
+                self.format.export_data(dataset, **kwargs),
+                self.format.export_data(columnar_dataset, **kwargs),
+            )
+
+    @override_settings(IMPORT_EXPORT_ESCAPE_FORMULAE_ON_EXPORT=True)
+    def test_export_columnar_data_escape_formulae(self):
+        dataset = ColumnarDataset(headers=["id", "formula"])
+        dataset.append((1, "=1+1"))
+        dataset.append((2, "=1+1"))
+        dataset.append((3, "1"))
+        self.assertEqual(
+            "id,formula\r\n1,1+1\r\n2,1+1\r\n3,1\r\n",
+            self.format.export_data(dataset),
+        )
+
     def test_get_extension(self):
         self.assertEqual("csv", self.format.get_extension())
 
@@ -276,6 +332,11 @@ class TSVTest(TestCase):
             data = force_str(in_stream.read())
         base_formats.TSV().create_dataset(data)
 
+    def test_export_columnar_data(self):
+        dataset = ColumnarDataset(headers=["id", "name"])
+        dataset.append((1, "a,b"))
+        self.assertEqual("id\tname\r\n1\ta,b\r\n", self.format.export_data(dataset))
+
 
 class TextFormatTest(TestCase):
     def setUp(self):
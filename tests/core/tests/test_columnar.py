@@ -0,0 +1,148 @@
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import tablib
+from core.models import Author, Book
+from django.test import SimpleTestCase, TestCase
+
+from import_export import resources
+from import_export.columnar import ColumnarDataset
+from import_export.formats import base_formats
+
+
+class ColumnarDatasetTest(SimpleTestCase):
+    def setUp(self):
+        self.dataset = ColumnarDataset(headers=["id", "name"], title="Books")
+        self.dataset.append([1, "Moonraker"])
+        self.dataset.append([2, "Goldfinger"])
+        self.dataset.append([3, "Moonraker"])
+
+    def test_rows(self):
+        self.assertEqual(3, len(self.dataset))
+        self.assertEqual(2, self.dataset.width)
+        self.assertEqual(
+            [(1, "Moonraker"), (2, "Goldfinger"), (3, "Moonraker")], list(self.dataset)
+        )
+        self.assertEqual((2, "Goldfinger"), self.dataset[1])
+        self.assertEqual((3, "Moonraker"), self.dataset[-1])
+        self.assertEqual([(2, "Goldfinger"), (3, "Moonraker")], self.dataset[1:])
+        self.assertEqual(["Moonraker", "Goldfinger", "Moonraker"], self.dataset["name"])
+        self.assertEqual({"id": 1, "name": "Moonraker"}, self.dataset.dict[0])
+
+    def test_repeated_values_are_stored_once(self):
+        self.assertEqual(["Moonraker", "Goldfinger"], self.dataset._columns[1].values)
+        self.assertEqual(1, self.dataset._columns[1].codes.itemsize)
+
+    def test_equal_values_of_other_types_are_kept(self):
+        utc = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        dataset = ColumnarDataset(headers=["value"])
+        for value in (
+            1,
+            True,
+            1.0,
+            Decimal("1.0"),
+            Decimal("1.00"),
+            utc,
+            utc.astimezone(timezone(timedelta(hours=1))),
+        ):
+            dataset.append([value])
+        self.assertEqual(
+            ["1", "True", "1.0", "1.0", "1.00", str(utc), "2024-01-01 01:00:00+01:00"],
+            [str(value) for value in dataset["value"]],
+        )
+
+    def test_codes_grow_with_the_number_of_values(self):
+        dataset = ColumnarDataset(headers=["id"])
+        for number in range(300):
+            dataset.append([number])
+        self.assertEqual(2, dataset._columns[0].codes.itemsize)
+        self.assertEqual(list(range(300)), dataset["id"])
+
+    def test_invalid_dimensions(self):
+        with self.assertRaises(tablib.InvalidDimensions):
+            self.dataset.append([4])
+
+    def test_no_headers(self):
+        dataset = ColumnarDataset()
+        dataset.extend([[1, "a"], [2, "b"]])
+        self.assertIsNone(dataset.headers)
+        self.assertEqual([[1, "a"], [2, "b"]], dataset.dict)
+
+    def test_map_values(self):
+        self.dataset.map_values(lambda value: str(value).upper())
+        self.dataset.append([4, "MOONRAKER"])
+        self.assertEqual(
+            ["MOONRAKER", "GOLDFINGER", "MOONRAKER", "MOONRAKER"], self.dataset["name"]
+        )
+        self.assertEqual(2, len(self.dataset._columns[1].values))
+
+    def test_distinct_values_stop_being_shared(self):
+        dataset = ColumnarDataset(headers=["id", "status"])
+        for number in range(3000):
+            dataset.append([str(number), "published"])
+        self.assertIsNone(dataset._columns[0].codes)
+        self.assertEqual(["published"], dataset._columns[1].values)
+        self.assertEqual(("2999", "published"), dataset[-1])
+        self.assertEqual([str(number) for number in range(3000)], dataset["id"])
+
+    def test_to_dataset(self):
+        dataset = self.dataset.to_dataset()
+        self.assertEqual(["id", "name"], dataset.headers)
+        self.assertEqual("Books", dataset.title)
+        self.assertEqual(list(self.dataset), list(dataset))
+        self.assertEqual(dataset.export("json"), self.dataset.export("json"))
+
+    def test_uses_less_memory_than_tablib(self):
+        def measure(dataset_class):
+            tracemalloc.start()
+            dataset = dataset_class(headers=["id", "status", "author", "date"])
+            for number in range(5000):
+                # rendered values are new strings, even if they are equal
+                dataset.append(
+                    [
+                        str(number),
+                        "".join(["publ", "ished"]),
+                        "Ian Fleming %d" % (number % 10),
+                        "2024-01-%02d" % (number % 28 + 1),
+                    ]
+                )
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return size
+
+        self.assertLess(measure(ColumnarDataset) * 2, measure(tablib.Dataset))
+
+
+class ColumnarExportTest(TestCase):
+    class BookResource(resources.ModelResource):
+        class Meta:
+            model = Book
+            fields = ("id", "name", "author", "price")
+
+    class ColumnarBookResource(BookResource):
+        class Meta:
+            model = Book
+            fields = ("id", "name", "author", "price")
+            use_columnar_export = True
+
+    def setUp(self):
+        author = Author.objects.create(name="Ian Fleming")
+        Book.objects.create(name="Moonraker", author=author, price=Decimal("1.00"))
+        Book.objects.create(name="=Goldfinger", author=author)
+
+    def test_export(self):
+        dataset = self.ColumnarBookResource().export()
+        self.assertIsInstance(dataset, ColumnarDataset)
+        expected = self.BookResource().export()
+        self.assertEqual(expected.headers, dataset.headers)
+        self.assertEqual(list(expected), list(dataset))
+
+    def test_formats(self):
+        for format_class in (base_formats.CSV, base_formats.TSV, base_formats.JSON):
+            with self.subTest(format=format_class):
+                file_format = format_class()
+                self.assertEqual(
+                    file_format.export_data(self.BookResource().export()),
+                    file_format.export_data(self.ColumnarBookResource().export()),
+                )
@@ -8,6 +8,8 @@ from django.core.management import call_command
 from django.core.management.base import CommandError
 from django.test import TestCase
 
+from import_export.checkpoints.models import ImportCheckpoint
+from import_export.checkpoints.stores import ModelCheckpointStore
 from import_export.formats.base_formats import XLSX
 from import_export.resources import ModelResource, modelresource_factory
 
@@ -30,6 +32,12 @@ class BookResourceWithError(ModelResource):
         model = Book
 
 
+class CheckpointBookResource(ModelResource):
+    class Meta:
+        model = Book
+        checkpoint_store_class = ModelCheckpointStore
+
+
 class ImportCommandTest(TestCase):
     def setUp(self):
         self.out = StringIO()
@@ -152,3 +160,35 @@ class ImportCommandTest(TestCase):
                     assert e.exception.args[0] == "Import cancelled."
 
         self.assertEqual(Book.objects.count(), 0)
+
+    def test_import_command_resume_without_checkpoint_store(self):
+        with tempfile.NamedTemporaryFile(mode="w+", suffix=".csv") as tmp_csv:
+            tmp_csv.write(CSV_CONTENT)
+            tmp_csv.seek(0)
+            with self.assertRaises(CommandError):
+                call_command(
+                    "import",
+                    "core.Book",
+                    tmp_csv.name,
+                    "--resume",
+                    stdout=self.out,
+                    stderr=self.err,
+                    interactive=False,
+                )
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_import_command_with_checkpoint_store(self):
+        with tempfile.NamedTemporaryFile(mode="w+", suffix=".csv") as tmp_csv:
+            tmp_csv.write(CSV_CONTENT)
+            tmp_csv.seek(0)
+            call_command(
+                "import",
+                "core.tests.test_command_import.CheckpointBookResource",
+                tmp_csv.name,
+                "--resume",
+                stdout=self.out,
+                stderr=self.err,
+                interactive=False,
+            )
+        self.assertEqual(Book.objects.count(), 1)
+        self.assertFalse(ImportCheckpoint.objects.exists())
@@ -1,7 +1,17 @@
+import gc
+import weakref
+from collections import OrderedDict
+from unittest import mock
+
+from core.models import Book
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
 from django.test import TestCase
+from django.test.utils import isolate_apps
 
 from import_export import fields
-from import_export.resources import Resource
+from import_export.declarative import _generated_fields_cache
+from import_export.resources import ModelResource, Resource
 
 from .resources import MyResource
 
@@ -121,3 +131,139 @@ class TestMultiInheritance(TestCase):
         self.assertEqual(1000, grandparent_resource._meta.batch_size)
         self.assertEqual(1000, parent_resource._meta.batch_size)
         self.assertEqual(1000, child_resource._meta.batch_size)
+
+
+class TestGeneratedFields(TestCase):
+    def test_fields_are_built_on_definition(self):
+        class BookResource(ModelResource):
+            class Meta:
+                model = Book
+
+        self.assertIsInstance(vars(BookResource)["fields"], OrderedDict)
+        self.assertIn("name", BookResource.fields)
+
+    def test_invalid_widget_options_are_reported_on_definition(self):
+        with self.assertRaises(TypeError):
+
+            class BookResource(ModelResource):
+                class Meta:
+                    model = Book
+                    fields = ("id", "name")
+                    widgets = {"name": {"unknown_option": True}}
+
+    def test_subclass_fields(self):
+        class ParentResource(ModelResource):
+            class Meta:
+                model = Book
+
+        class ChildResource(ParentResource):
+            extra = fields.Field()
+
+        self.assertEqual(
+            [*ParentResource.fields, "extra"], list(ChildResource().fields)
+        )
+
+    def test_invalid_relationship_is_reported_on_definition(self):
+        with self.assertRaises(FieldDoesNotExist):
+
+            class BookResource(ModelResource):
+                class Meta:
+                    model = Book
+                    fields = ("author__nonexistent",)
+
+    def test_relationship_declared_on_parent_is_not_validated(self):
+        class ParentResource(ModelResource):
+            author__nonexistent = fields.Field(attribute="name")
+
+            class Meta:
+                model = Book
+                fields = ("name", "author__nonexistent")
+
+        class ChildResource(ParentResource):
+            pass
+
+        self.assertEqual(["name", "author__nonexistent"], list(ChildResource.fields))
+
+    def test_generated_fields_are_memoised_per_signature(self):
+        def resource_class():
+            class BookResource(ModelResource):
+                class Meta:
+                    model = Book
+                    fields = ("id", "name", "author__name")
+
+            return BookResource
+
+        first = resource_class()
+        self.assertEqual(["id", "name", "author__name"], list(first.fields))
+        with mock.patch.object(fields.Field, "__init__", side_effect=AssertionError):
+            second_fields = resource_class().fields
+        self.assertEqual(list(first.fields), list(second_fields))
+        for field_name, field in first.fields.items():
+            self.assertIsNot(field, second_fields[field_name])
+            self.assertIsNot(field.widget, second_fields[field_name].widget)
+            self.assertEqual(field.attribute, second_fields[field_name].attribute)
+            self.assertEqual(type(field.widget), type(second_fields[field_name].widget))
+
+    def test_generated_fields_are_not_shared_with_different_signatures(self):
+        class BookResource(ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "name")
+
+        class CustomBookResource(ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "name")
+                widgets = {"name": {"coerce_to_string": False}}
+
+        self.assertTrue(BookResource.fields["name"].widget.coerce_to_string)
+        self.assertFalse(CustomBookResource.fields["name"].widget.coerce_to_string)
+
+    def test_generated_fields_are_not_memoised_for_custom_field_factories(self):
+        class BaseBookResource(ModelResource):
+
+            @classmethod
+            def widget_kwargs_for_field(cls, field_name, django_field):
+                kwargs = super().widget_kwargs_for_field(field_name, django_field)
+                if field_name == "published":
+                    kwargs["format"] = cls.fmt
+                return kwargs
+
+        class IsoBookResource(BaseBookResource):
+            fmt = "%Y-%m-%d"
+
+            class Meta:
+                model = Book
+                fields = ("id", "published")
+
+        class EuropeanBookResource(BaseBookResource):
+            fmt = "%d.%m.%Y"
+
+            class Meta:
+                model = Book
+                fields = ("id", "published")
+
+        self.assertEqual(
+            ("%Y-%m-%d",), IsoBookResource.fields["published"].widget.formats
+        )
+        self.assertEqual(
+            ("%d.%m.%Y",), EuropeanBookResource.fields["published"].widget.formats
+        )
+
+    def test_generated_fields_of_dynamic_models_are_released(self):
+        def define_resource():
+            with isolate_apps("core"):
+
+                class DynamicModel(models.Model):
+                    name = models.CharField(max_length=10)
+
+                class DynamicResource(ModelResource):
+                    class Meta:
+                        model = DynamicModel
+
+            self.assertIn(DynamicModel, _generated_fields_cache)
+            return weakref.ref(DynamicModel)
+
+        model_ref = define_resource()
+        gc.collect()
+        self.assertIsNone(model_ref())
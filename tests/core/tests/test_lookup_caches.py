@@ -0,0 +1,160 @@
+import copy
+from unittest import mock
+
+from core.models import Author, Book
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from import_export import widgets
+from import_export.lookup_caches import LookupCache
+
+
+class LookupCacheTest(TransactionTestCase):
+    def setUp(self):
+        self.lookup_cache = LookupCache()
+        self.author = Author.objects.create(name="Foo")
+
+    def test_instances_are_cached(self):
+        with self.assertNumQueries(1):
+            instances = self.lookup_cache.get_instances(Author.objects.all())
+            self.assertEqual([self.author], instances)
+            self.assertIs(
+                instances, self.lookup_cache.get_instances(Author.objects.all())
+            )
+
+    def test_key_includes_queryset_sql(self):
+        Author.objects.create(name="Bar")
+        self.lookup_cache.get_instances(Author.objects.all())
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                [self.author],
+                self.lookup_cache.get_instances(Author.objects.filter(name="Foo")),
+            )
+
+    def test_timeout(self):
+        self.lookup_cache.timeout = 10
+        with mock.patch("import_export.lookup_caches.time.monotonic") as mock_time:
+            mock_time.return_value = 100
+            self.lookup_cache.get_instances(Author.objects.all())
+            mock_time.return_value = 109
+            with self.assertNumQueries(0):
+                self.lookup_cache.get_instances(Author.objects.all())
+            mock_time.return_value = 111
+            with self.assertNumQueries(1):
+                self.lookup_cache.get_instances(Author.objects.all())
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.lookup_cache.maxsize = 2
+        first = Author.objects.filter(name="1")
+        self.lookup_cache.get_instances(first)
+        self.lookup_cache.get_instances(Author.objects.filter(name="2"))
+        self.lookup_cache.get_instances(first)
+        self.lookup_cache.get_instances(Author.objects.filter(name="3"))
+        with self.assertNumQueries(0):
+            self.lookup_cache.get_instances(first)
+        with self.assertNumQueries(1):
+            self.lookup_cache.get_instances(Author.objects.filter(name="2"))
+
+    def test_save_invalidates_model(self):
+        self.lookup_cache.get_instances(Author.objects.all())
+        self.lookup_cache.get_instances(Book.objects.all())
+        author = Author.objects.create(name="Bar")
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                [self.author, author],
+                self.lookup_cache.get_instances(Author.objects.order_by("pk")),
+            )
+        with self.assertNumQueries(0):
+            self.lookup_cache.get_instances(Book.objects.all())
+
+    def test_save_invalidates_related_model(self):
+        book = Book.objects.create(name="Moonraker", author=self.author)
+        self.assertEqual(
+            [book],
+            self.lookup_cache.get_instances(Book.objects.filter(author__name="Foo")),
+        )
+        self.author.name = "Bar"
+        self.author.save()
+        self.assertEqual(
+            [], self.lookup_cache.get_instances(Book.objects.filter(author__name="Foo"))
+        )
+
+    def test_instances_are_cached_on_commit(self):
+        with transaction.atomic():
+            self.lookup_cache.get_instances(Author.objects.all())
+            with self.assertNumQueries(1):
+                self.lookup_cache.get_instances(Author.objects.all())
+        with self.assertNumQueries(0):
+            self.lookup_cache.get_instances(Author.objects.all())
+
+    def test_rolled_back_instances_are_not_cached(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                Author.objects.create(name="Bar")
+                self.assertEqual(
+                    2, len(self.lookup_cache.get_instances(Author.objects.all()))
+                )
+                raise ValueError
+        self.assertEqual(
+            [self.author], self.lookup_cache.get_instances(Author.objects.all())
+        )
+
+    def test_delete_invalidates_model(self):
+        self.lookup_cache.get_instances(Author.objects.all())
+        self.author.delete()
+        self.assertEqual([], self.lookup_cache.get_instances(Author.objects.all()))
+
+    def test_empty_queryset_is_not_cached(self):
+        with self.assertNumQueries(0):
+            self.assertEqual([], self.lookup_cache.get_instances(Author.objects.none()))
+
+    def test_copy_returns_same_cache(self):
+        self.assertIs(self.lookup_cache, copy.copy(self.lookup_cache))
+        self.assertIs(self.lookup_cache, copy.deepcopy(self.lookup_cache))
+
+
+class DjangoCacheLookupCacheTest(TransactionTestCase):
+    def setUp(self):
+        self.lookup_cache = LookupCache(cache_alias="default")
+        self.author = Author.objects.create(name="Foo")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_instances_are_cached(self):
+        self.lookup_cache.get_instances(Author.objects.all())
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [self.author],
+                LookupCache(cache_alias="default").get_instances(Author.objects.all()),
+            )
+
+    def test_save_invalidates_model(self):
+        other_cache = LookupCache(cache_alias="default")
+        other_cache.get_instances(Author.objects.all())
+        self.lookup_cache.get_instances(Author.objects.all())
+        author = Author.objects.create(name="Bar")
+        self.assertEqual(
+            [self.author, author],
+            other_cache.get_instances(Author.objects.order_by("pk")),
+        )
+
+
+class CachedForeignKeyWidgetLookupCacheTest(TransactionTestCase):
+    def setUp(self):
+        self.lookup_cache = LookupCache()
+        self.author = Author.objects.create(name="Foo")
+
+    def test_widgets_share_instances(self):
+        widget = widgets.CachedForeignKeyWidget(
+            Author, "name", lookup_cache=self.lookup_cache
+        )
+        self.assertEqual(self.author, widget.clean("Foo"))
+        other_widget = copy.deepcopy(widget)
+        self.assertIs(self.lookup_cache, other_widget.lookup_cache)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.author, other_widget.clean("Foo"))
+            other_widget.prefetch(["Foo"])
+            with self.assertRaises(Author.DoesNotExist):
+                other_widget.clean("Bar")
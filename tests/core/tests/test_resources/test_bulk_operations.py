@@ -1,11 +1,16 @@
-from unittest import mock
+from datetime import date
+from decimal import Decimal
+from unittest import mock, skipUnless
 
 import tablib
-from core.models import Book, UUIDBook
-from django.core.exceptions import ValidationError
+from core.models import Author, Book, Profile, UUIDBook
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import connection
+from django.db.models import Value
 from django.test import TestCase
 
-from import_export import exceptions, fields, resources, widgets
+from import_export import bulk_writers, exceptions, fields, resources, widgets
 from import_export.instance_loaders import ModelInstanceLoader
 
 
@@ -311,6 +316,169 @@ class BulkCreateTest(BulkTest):
         )
 
 
+class BulkWriterTest(BulkTest):
+    class WriterBookResource(resources.ModelResource):
+        class Meta:
+            model = Book
+            use_bulk = True
+            bulk_writer_classes = bulk_writers.VENDOR_BULK_WRITER_CLASSES
+
+    def setUp(self):
+        super().setUp()
+        self.author = Author.objects.create(name="Ian Fleming")
+        rows = [
+            (i + 1, "book_name", self.author.pk, "9.99", "2024-01-02")
+            for i in range(10)
+        ]
+        self.dataset = tablib.Dataset(
+            *rows, headers=["id", "name", "author", "price", "published"]
+        )
+
+    def test_orm_bulk_writer_is_default(self):
+        self.assertIsInstance(
+            self.resource.get_bulk_writer(), bulk_writers.ORMBulkWriter
+        )
+
+    def test_bulk_writer_for_unmapped_vendor(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                use_bulk = True
+                bulk_writer_classes = {"unknown": bulk_writers.SQLiteBulkWriter}
+
+        writer = _BookResource().get_bulk_writer()
+        self.assertIsInstance(writer, bulk_writers.ORMBulkWriter)
+        self.assertEqual("default", writer.using)
+
+    def test_bulk_writer_chosen_by_vendor(self):
+        writer = self.WriterBookResource().get_bulk_writer()
+        self.assertIsInstance(
+            writer, bulk_writers.VENDOR_BULK_WRITER_CLASSES[connection.vendor]
+        )
+
+    @skipUnless(
+        connection.vendor in bulk_writers.VENDOR_BULK_WRITER_CLASSES,
+        "Run only against databases with a vendor bulk writer",
+    )
+    @mock.patch("core.models.Book.objects.bulk_create")
+    def test_vendor_bulk_writer(self, mock_bulk_create):
+        resource = self.WriterBookResource()
+        result = resource.import_data(self.dataset, raise_errors=True)
+        mock_bulk_create.assert_not_called()
+        self.assertEqual(10, result.totals["new"])
+        self.assertEqual(10, Book.objects.count())
+        book = Book.objects.get(pk=10)
+        self.assertEqual("book_name", book.name)
+        self.assertEqual(self.author, book.author)
+        self.assertEqual(Decimal("9.99"), book.price)
+        self.assertEqual(date(2024, 1, 2), book.published)
+        self.assertFalse(book.imported)
+
+    @skipUnless(connection.vendor == "sqlite", "Run only against SQLite")
+    def test_sqlite_bulk_writer_uses_single_query_per_batch(self):
+        class _BookResource(self.WriterBookResource):
+            class Meta:
+                batch_size = 5
+                use_transactions = False
+
+        with mock.patch.object(
+            bulk_writers.SQLiteBulkWriter,
+            "write_rows",
+            autospec=True,
+            side_effect=bulk_writers.SQLiteBulkWriter.write_rows,
+        ) as mock_write_rows:
+            _BookResource().import_data(self.dataset, raise_errors=True)
+        self.assertEqual(2, mock_write_rows.call_count)
+        self.assertEqual(10, Book.objects.count())
+
+    @skipUnless(connection.vendor == "sqlite", "Run only against SQLite")
+    def test_sqlite_bulk_writer_writes_in_batches(self):
+        books = [Book(name=f"Book {i}") for i in range(5)]
+        writer = bulk_writers.SQLiteBulkWriter(self.resource, "default")
+        with mock.patch.object(
+            bulk_writers.SQLiteBulkWriter,
+            "write_rows",
+            autospec=True,
+            side_effect=bulk_writers.SQLiteBulkWriter.write_rows,
+        ) as mock_write_rows:
+            writer.write(books, batch_size=2)
+        self.assertEqual(
+            [2, 2, 1], [len(c.args[3]) for c in mock_write_rows.call_args_list]
+        )
+        self.assertEqual(5, Book.objects.count())
+
+    def test_postgresql_copy_bulk_writer(self):
+        books = [
+            Book(id=i + 1, name=f"Book {i}", author=self.author, price=Decimal("9.99"))
+            for i in range(3)
+        ]
+        writer = bulk_writers.PostgreSQLCopyBulkWriter(self.resource, "default")
+        psycopg_any = mock.Mock(is_psycopg3=True)
+        with (
+            mock.patch.dict(
+                "sys.modules",
+                {"django.db.backends.postgresql.psycopg_any": psycopg_any},
+            ),
+            mock.patch.object(connection, "cursor") as mock_cursor,
+        ):
+            writer.write(books, batch_size=2)
+
+        cursor = mock_cursor.return_value.__enter__.return_value
+        qn = connection.ops.quote_name
+        sql = "COPY %s (%s) FROM STDIN" % (
+            qn("core_book"),
+            ", ".join(qn(f.column) for f in Book._meta.concrete_fields),
+        )
+        self.assertEqual([mock.call(sql)] * 2, cursor.copy.call_args_list)
+        copy = cursor.copy.return_value.__enter__.return_value
+        self.assertEqual(
+            [
+                mock.call(
+                    [
+                        i + 1,
+                        f"Book {i}",
+                        self.author.pk,
+                        "",
+                        False,
+                        None,
+                        None,
+                        connection.ops.adapt_decimalfield_value(Decimal("9.99"), 10, 2),
+                        None,
+                    ]
+                )
+                for i in range(3)
+            ],
+            copy.write_row.call_args_list,
+        )
+        self.assertFalse(any(book._state.adding for book in books))
+
+    def test_bulk_writer_without_pk(self):
+        del self.dataset["id"]
+        self.WriterBookResource().import_data(self.dataset, raise_errors=True)
+        self.assertEqual(10, Book.objects.filter(name="book_name").count())
+
+    def test_bulk_writer_dry_run(self):
+        self.WriterBookResource().import_data(self.dataset, dry_run=True)
+        self.assertEqual(0, Book.objects.count())
+
+    def test_bulk_writer_falls_back_to_orm_for_expressions(self):
+        resource = self.WriterBookResource()
+        book = Book(name="Book", imported=Value(True))
+        with mock.patch("core.models.Book.objects.bulk_create") as mock_bulk_create:
+            resource.get_bulk_writer().write([book], batch_size=5)
+        mock_bulk_create.assert_called_once_with([book], batch_size=5)
+
+    @mock.patch.object(bulk_writers.SQLiteBulkWriter, "write_rows")
+    @mock.patch.object(bulk_writers.PostgreSQLCopyBulkWriter, "write_rows")
+    def test_bulk_writer_logs_exception(self, *mocks):
+        e = ValidationError("invalid field")
+        for mock_write_rows in mocks:
+            mock_write_rows.side_effect = e
+        with mock.patch("logging.Logger.debug") as mock_exception:
+            self.WriterBookResource().import_data(self.dataset)
+            mock_exception.assert_called_with(e, exc_info=mock.ANY)
+
+
 class BulkUpdateTest(BulkTest):
     class _BookResource(resources.ModelResource):
         class Meta:
@@ -549,6 +717,159 @@ class BulkUUIDBookUpdateTest(BulkTest):
         self.assertEqual(10, result.totals["update"])
 
 
+class BulkUpsertTest(BulkTest):
+    class UpsertBookResource(resources.ModelResource):
+        class Meta:
+            model = Book
+            use_bulk = True
+            use_upsert = True
+
+    def setUp(self):
+        super().setUp()
+        self.resource = self.UpsertBookResource()
+        self.book1 = Book.objects.create(name="Book 1", author_email="a@example.com")
+        self.book2 = Book.objects.create(name="Book 2", author_email="b@example.com")
+        rows = [
+            (self.book1.pk, "Updated 1"),
+            (self.book2.pk, "Updated 2"),
+            (self.book2.pk + 1, "New 3"),
+        ]
+        self.dataset = tablib.Dataset(*rows, headers=["id", "name"])
+
+    def test_upsert_creates_and_updates(self):
+        result = self.resource.import_data(self.dataset, raise_errors=True)
+
+        self.assertEqual(
+            ["Updated 1", "Updated 2", "New 3"],
+            list(Book.objects.order_by("pk").values_list("name", flat=True)),
+        )
+        self.assertEqual(1, result.totals["new"])
+        self.assertEqual(2, result.totals["update"])
+        self.assertFalse(result.totals_approximate)
+        self.assertEqual(
+            ["update", "update", "new"], [row.import_type for row in result.rows]
+        )
+
+    def test_upsert_does_not_overwrite_columns_missing_from_dataset(self):
+        self.resource.import_data(self.dataset, raise_errors=True)
+        self.book1.refresh_from_db()
+        self.assertEqual("a@example.com", self.book1.author_email)
+
+    def test_upsert_does_not_load_instances(self):
+        with mock.patch.object(
+            ModelInstanceLoader, "get_instance"
+        ) as mock_get_instance:
+            self.resource.import_data(self.dataset, raise_errors=True)
+        mock_get_instance.assert_not_called()
+
+    def test_upsert_queries(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                use_bulk = True
+                use_upsert = True
+                skip_diff = True
+
+        # one query to tell new and updated rows apart, one to save the batch
+        with self.assertNumQueries(2):
+            _BookResource().import_data(self.dataset, use_transactions=False)
+
+    @mock.patch("core.models.Book.objects.bulk_create")
+    def test_upsert_batch_size_of_2(self, mock_bulk_create):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                use_bulk = True
+                use_upsert = True
+                batch_size = 2
+
+        result = _BookResource().import_data(self.dataset)
+        self.assertEqual(2, mock_bulk_create.call_count)
+        mock_bulk_create.assert_called_with(
+            mock.ANY,
+            batch_size=None,
+            update_conflicts=True,
+            update_fields=["name"],
+            unique_fields=["id"],
+        )
+        self.assertEqual(2, result.totals["update"])
+        self.assertEqual(1, result.totals["new"])
+
+    @mock.patch("core.models.Book.objects.bulk_create")
+    def test_upsert_without_update_fields_ignores_conflicts(self, mock_bulk_create):
+        dataset = tablib.Dataset((self.book1.pk,), headers=["id"])
+        self.resource.import_data(dataset)
+        mock_bulk_create.assert_called_once_with(
+            mock.ANY, batch_size=None, ignore_conflicts=True
+        )
+
+    @mock.patch("core.models.Book.objects.bulk_create")
+    def test_upsert_totals_approximate_for_multiple_import_id_fields(
+        self, mock_bulk_create
+    ):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                use_bulk = True
+                use_upsert = True
+                import_id_fields = ("id", "name")
+
+        result = _BookResource().import_data(self.dataset)
+        self.assertTrue(result.totals_approximate)
+        self.assertEqual(3, result.totals["new"])
+        self.assertEqual(0, result.totals["update"])
+
+    def test_upsert_foreign_key_import_id_field(self):
+        class _ProfileResource(resources.ModelResource):
+            user = fields.Field(
+                attribute="user",
+                column_name="user",
+                widget=widgets.ForeignKeyWidget(User),
+            )
+
+            class Meta:
+                model = Profile
+                fields = ("user", "is_private")
+                import_id_fields = ("user",)
+                use_bulk = True
+                use_upsert = True
+
+        user1 = User.objects.create(username="user1")
+        user2 = User.objects.create(username="user2")
+        Profile.objects.create(user=user1, is_private=True)
+        dataset = tablib.Dataset(
+            (user1.pk, False), (user2.pk, False), headers=["user", "is_private"]
+        )
+
+        result = _ProfileResource().import_data(dataset, raise_errors=True)
+
+        self.assertEqual(["update", "new"], [row.import_type for row in result.rows])
+        self.assertEqual(1, result.totals["update"])
+        self.assertEqual(1, result.totals["new"])
+        self.assertFalse(result.totals_approximate)
+        self.assertEqual(
+            [(user1.pk, False), (user2.pk, False)],
+            list(Profile.objects.order_by("user").values_list("user", "is_private")),
+        )
+
+    def test_upsert_requires_use_bulk(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                use_upsert = True
+
+        with self.assertRaisesRegex(ImproperlyConfigured, "requires use_bulk"):
+            _BookResource().import_data(self.dataset)
+
+    @mock.patch("core.models.Book.objects.bulk_create")
+    def test_upsert_logs_exception(self, mock_bulk_create):
+        e = ValidationError("invalid field")
+        mock_bulk_create.side_effect = e
+        with mock.patch("logging.Logger.debug") as mock_exception:
+            self.resource.import_data(self.dataset)
+            mock_exception.assert_called_with(e, exc_info=mock.ANY)
+
+
 class BulkDeleteTest(BulkTest):
     class DeleteBookResource(resources.ModelResource):
         def for_delete(self, row, instance):
@@ -0,0 +1,181 @@
+from unittest import mock
+
+import tablib
+from core.models import Book
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.test import TestCase
+
+from import_export import exceptions, resources
+from import_export.checkpoints.models import ImportCheckpoint
+from import_export.checkpoints.stores import ModelCheckpointStore
+
+
+class CheckpointBookResource(resources.ModelResource):
+    class Meta:
+        model = Book
+        fields = ("id", "name")
+        checkpoint_store_class = ModelCheckpointStore
+        checkpoint_batch_size = 2
+
+    def before_save_instance(self, instance, row, **kwargs):
+        if instance.name == "bad":
+            raise ValueError("bad book")
+
+
+class CheckpointStoreTest(TestCase):
+    def setUp(self):
+        self.resource = CheckpointBookResource()
+        self.dataset = tablib.Dataset(headers=["id", "name"])
+        for name in ("Book 1", "Book 2", "Book 3", "bad", "Book 5"):
+            self.dataset.append(["", name])
+
+    def get_checkpoint(self):
+        return ModelCheckpointStore(self.resource, "default").get_checkpoint(
+            self.resource.get_dataset_fingerprint(self.dataset)
+        )
+
+    def names(self):
+        return list(Book.objects.order_by("pk").values_list("name", flat=True))
+
+    def test_rows_are_committed_in_chunks(self):
+        result = self.resource.import_data(self.dataset)
+        self.assertTrue(result.has_errors())
+        # the chunk of the row with an error is rolled back
+        self.assertEqual(["Book 1", "Book 2"], self.names())
+        row_number, totals = self.get_checkpoint()
+        self.assertEqual(2, row_number)
+        self.assertEqual(2, totals["new"])
+        self.assertEqual(0, totals["error"])
+
+    def test_resume(self):
+        self.resource.import_data(self.dataset)
+        self.dataset[3] = ["", "Book 4"]
+        # the dataset has changed, so its digest differs
+        ImportCheckpoint.objects.update(
+            digest=self.resource.get_dataset_fingerprint(self.dataset)
+        )
+        with mock.patch.object(
+            self.resource, "import_row", wraps=self.resource.import_row
+        ) as mock_import_row:
+            result = self.resource.import_data(self.dataset, resume=True)
+        self.assertEqual(
+            [3, 4, 5], [c.kwargs["row_number"] for c in mock_import_row.call_args_list]
+        )
+        self.assertFalse(result.has_errors())
+        self.assertEqual(5, result.totals["new"])
+        self.assertEqual(3, len(result.rows))
+        self.assertEqual(
+            ["Book 1", "Book 2", "Book 3", "Book 4", "Book 5"], self.names()
+        )
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_import_without_resume_starts_from_the_first_row(self):
+        self.resource.import_data(self.dataset)
+        result = self.resource.import_data(self.dataset)
+        self.assertEqual(
+            ["new", "new", "new", "error"], [row.import_type for row in result.rows]
+        )
+        self.assertEqual(2, self.get_checkpoint()[0])
+
+    def test_raised_error_rolls_back_the_chunk(self):
+        with self.assertRaises(exceptions.ImportError):
+            self.resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(["Book 1", "Book 2"], self.names())
+        self.assertEqual(2, self.get_checkpoint()[0])
+
+    def test_validation_errors_roll_back_the_chunk(self):
+        class _CheckpointBookResource(CheckpointBookResource):
+            class Meta(CheckpointBookResource.Meta):
+                checkpoint_batch_size = 3
+
+            def before_save_instance(self, instance, row, **kwargs):
+                if instance.name == "bad":
+                    raise ValidationError("bad book")
+
+        self.resource = _CheckpointBookResource()
+        result = self.resource.import_data(
+            self.dataset, rollback_on_validation_errors=True
+        )
+        self.assertTrue(result.has_validation_errors())
+        self.assertEqual(["Book 1", "Book 2", "Book 3"], self.names())
+        self.assertEqual(3, self.get_checkpoint()[0])
+
+    def test_checkpoint_is_removed_once_every_row_is_committed(self):
+        self.dataset[3] = ["", "Book 4"]
+        result = self.resource.import_data(self.dataset)
+        self.assertEqual(5, result.totals["new"])
+        self.assertEqual(5, Book.objects.count())
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_savepoint_groups_end_at_checkpoints(self):
+        class _BookResource(CheckpointBookResource):
+            class Meta:
+                checkpoint_batch_size = 3
+                savepoint_batch_size = 2
+
+        self.dataset[3] = ["", "Book 4"]
+        self.dataset[4] = ["", "bad"]
+        resource = _BookResource()
+        result = resource.import_data(self.dataset)
+        self.assertTrue(result.has_errors())
+        # row 4 is in the chunk of the row with an error, so it is rolled back
+        self.assertEqual(["Book 1", "Book 2", "Book 3"], self.names())
+        row_number, totals = ModelCheckpointStore(resource, "default").get_checkpoint(
+            resource.get_dataset_fingerprint(self.dataset)
+        )
+        self.assertEqual(3, row_number)
+        self.assertEqual(3, totals["new"])
+
+        self.dataset[4] = ["", "Book 5"]
+        ImportCheckpoint.objects.update(
+            digest=resource.get_dataset_fingerprint(self.dataset)
+        )
+        result = resource.import_data(self.dataset, resume=True)
+        self.assertFalse(result.has_errors())
+        self.assertEqual(5, result.totals["new"])
+        self.assertEqual(
+            ["Book 1", "Book 2", "Book 3", "Book 4", "Book 5"], self.names()
+        )
+
+    def test_use_bulk(self):
+        class _CheckpointBookResource(CheckpointBookResource):
+            class Meta(CheckpointBookResource.Meta):
+                use_bulk = True
+                batch_size = 10
+
+        self.resource = _CheckpointBookResource()
+        self.dataset[3] = ["", "Book 4"]
+        with mock.patch.object(
+            Book.objects, "bulk_create", wraps=Book.objects.bulk_create
+        ) as mock_bulk_create:
+            self.resource.import_data(self.dataset)
+        # one for each chunk
+        self.assertEqual(3, mock_bulk_create.call_count)
+        self.assertEqual(5, Book.objects.count())
+
+    def test_dry_run_is_not_checkpointed(self):
+        self.resource.import_data(self.dataset, dry_run=True)
+        self.assertFalse(ImportCheckpoint.objects.exists())
+        self.assertFalse(Book.objects.exists())
+
+    def test_resume_requires_checkpoint_store(self):
+        with self.assertRaises(ImproperlyConfigured):
+            resources.modelresource_factory(Book)().import_data(
+                self.dataset, resume=True
+            )
+
+    def test_checkpoint_store_requires_transactions(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.resource.import_data(self.dataset, use_transactions=False)
+
+    def test_checkpoint_store_requires_batch_size(self):
+        class _BookResource(CheckpointBookResource):
+            class Meta:
+                checkpoint_batch_size = None
+                batch_size = None
+                savepoint_batch_size = 2
+
+        for dry_run in (False, True):
+            with self.assertRaisesRegex(ValueError, "checkpoint_batch_size"):
+                _BookResource().import_data(self.dataset, dry_run=dry_run)
+        self.assertFalse(Book.objects.exists())
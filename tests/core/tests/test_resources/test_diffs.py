@@ -1,10 +1,11 @@
+from decimal import Decimal
 from unittest import mock
 
 import tablib
-from core.models import Book
+from core.models import Book, Category
 from django.test import TestCase
 
-from import_export import resources
+from import_export import resources, results
 
 
 @mock.patch("import_export.resources.Diff", spec=True)
@@ -99,7 +100,70 @@ class SkipDiffTest(TestCase):
             "import_export.resources.Resource.get_import_fields"
         ) as mock_get_import_fields:
             resource.import_data(self.dataset, dry_run=True)
-            self.assertEqual(3, mock_get_import_fields.call_count)
+            # once for the diff headers, and once for the import plan
+            self.assertEqual(2, mock_get_import_fields.call_count)
+
+
+class SkipUnchangedHashTest(TestCase):
+    class HashBookResource(resources.ModelResource):
+        class Meta:
+            model = Book
+            fields = ("id", "name", "price", "categories")
+            skip_unchanged = True
+            skip_unchanged_hash = True
+            skip_diff = True
+
+    def setUp(self):
+        self.resource = self.HashBookResource()
+        self.cat1 = Category.objects.create(name="Category 1")
+        self.cat2 = Category.objects.create(name="Category 2")
+        self.book = Book.objects.create(name="Moonraker", price="1.99")
+        self.book.categories.add(self.cat1, self.cat2)
+
+    def import_row(self, name="Moonraker", price="1.99", categories=None):
+        if categories is None:
+            categories = f"{self.cat2.pk},{self.cat1.pk}"
+        dataset = tablib.Dataset(headers=["id", "name", "price", "categories"])
+        dataset.append([self.book.pk, name, price, categories])
+        return self.resource.import_data(dataset, raise_errors=True).rows[0]
+
+    def test_unchanged_row_is_skipped_without_copy(self):
+        with mock.patch("import_export.resources.deepcopy") as mock_deep_copy:
+            row_result = self.import_row()
+            mock_deep_copy.assert_not_called()
+        self.assertEqual(results.RowResult.IMPORT_TYPE_SKIP, row_result.import_type)
+
+    def test_changed_row_is_updated(self):
+        row_result = self.import_row(price="2.99")
+        self.assertEqual(results.RowResult.IMPORT_TYPE_UPDATE, row_result.import_type)
+        self.book.refresh_from_db()
+        self.assertEqual("2.99", str(self.book.price))
+
+    def test_changed_m2m_row_is_updated(self):
+        row_result = self.import_row(categories=str(self.cat1.pk))
+        self.assertEqual(results.RowResult.IMPORT_TYPE_UPDATE, row_result.import_type)
+        self.assertEqual([self.cat1], list(self.book.categories.all()))
+
+    def test_m2m_column_missing_from_dataset(self):
+        dataset = tablib.Dataset(headers=["id", "name", "price"])
+        dataset.append([self.book.pk, "Moonraker", "1.99"])
+        row_result = self.resource.import_data(dataset, raise_errors=True).rows[0]
+        self.assertEqual(results.RowResult.IMPORT_TYPE_SKIP, row_result.import_type)
+
+    def test_new_row_is_not_skipped(self):
+        dataset = tablib.Dataset(headers=["name", "price"])
+        dataset.append(["Thunderball", "2.99"])
+        row_result = self.resource.import_data(dataset, raise_errors=True).rows[0]
+        self.assertEqual(results.RowResult.IMPORT_TYPE_NEW, row_result.import_type)
+
+    def test_instance_digest(self):
+        self.book.refresh_from_db()
+        row = {"id": self.book.pk, "name": "Moonraker", "price": "1.99"}
+        digest = self.resource.get_instance_digest(self.book, row, original=True)
+        self.book.price = Decimal("1.99")
+        self.assertEqual(digest, self.resource.get_instance_digest(self.book, row))
+        self.book.name = "Thunderball"
+        self.assertNotEqual(digest, self.resource.get_instance_digest(self.book, row))
 
 
 class SkipHtmlDiffTest(TestCase):
@@ -0,0 +1,128 @@
+from unittest import mock
+
+import tablib
+from core.models import Book
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.test import TestCase
+
+from import_export import resources, results
+
+
+def get_resource(**options):
+    meta = type("Meta", (), {"model": Book, "fields": ("id", "name", "price")})
+    for name, value in options.items():
+        setattr(meta, name, value)
+    return type("BookResource", (resources.ModelResource,), {"Meta": meta})()
+
+
+class DuplicateImportIdsTest(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(name="Moonraker")
+        self.dataset = tablib.Dataset(headers=["id", "name", "price"])
+        self.dataset.append([self.book.pk, "Moonraker 1", "1.00"])
+        self.dataset.append(["", "Goldfinger", "2.00"])
+        self.dataset.append(["", "Thunderball", "3.00"])
+        self.dataset.append([self.book.pk, "Moonraker 2", "4.00"])
+        self.dataset.append([999, "Dr. No", "5.00"])
+        self.dataset.append([999, "Dr. No", "6.00"])
+
+    def import_types(self, result):
+        return [row.import_type for row in result.rows]
+
+    def duplicate_rows(self, result):
+        return [(row.number, row.kept_number) for row in result.duplicate_rows]
+
+    def test_every_row_is_imported_by_default(self):
+        result = get_resource().import_data(self.dataset, raise_errors=True)
+        self.assertEqual(
+            ["update", "new", "new", "update", "new", "update"],
+            self.import_types(result),
+        )
+        self.assertEqual([], result.duplicate_rows)
+        self.book.refresh_from_db()
+        self.assertEqual("Moonraker 2", self.book.name)
+
+    def test_first(self):
+        resource = get_resource(duplicate_import_ids="first")
+        with mock.patch.object(resource, "before_import_row") as mock_before_import_row:
+            result = resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(4, mock_before_import_row.call_count)
+        self.assertEqual(
+            ["update", "new", "new", "skip", "new", "skip"], self.import_types(result)
+        )
+        self.assertEqual([(4, 1), (6, 5)], self.duplicate_rows(result))
+        self.assertEqual(2, result.totals[results.RowResult.IMPORT_TYPE_SKIP])
+        self.book.refresh_from_db()
+        self.assertEqual("Moonraker 1", self.book.name)
+        self.assertEqual("5.00", str(Book.objects.get(pk=999).price))
+
+    def test_last(self):
+        resource = get_resource(duplicate_import_ids="last")
+        result = resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(
+            ["skip", "new", "new", "update", "skip", "new"], self.import_types(result)
+        )
+        self.assertEqual([(1, 4), (5, 6)], self.duplicate_rows(result))
+        self.book.refresh_from_db()
+        self.assertEqual("Moonraker 2", self.book.name)
+        self.assertEqual("6.00", str(Book.objects.get(pk=999).price))
+
+    def test_last_with_use_bulk(self):
+        resource = get_resource(duplicate_import_ids="last", use_bulk=True)
+        updated = []
+        bulk_update = Book.objects.bulk_update
+
+        def _bulk_update(objs, *args, **kwargs):
+            updated.extend(book.name for book in objs)
+            return bulk_update(objs, *args, **kwargs)
+
+        with mock.patch.object(Book.objects, "bulk_update", _bulk_update):
+            resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(["Moonraker 2"], updated)
+        self.assertEqual(
+            [("Dr. No", "6.00"), ("Goldfinger", "2.00"), ("Thunderball", "3.00")],
+            [
+                (book.name, str(book.price))
+                for book in Book.objects.exclude(pk=self.book.pk).order_by("name")
+            ],
+        )
+
+    def test_skipped_rows_are_not_reported(self):
+        resource = get_resource(duplicate_import_ids="last", report_skipped=False)
+        result = resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(["new", "new", "update", "new"], self.import_types(result))
+        self.assertEqual([(1, 4), (5, 6)], self.duplicate_rows(result))
+
+    def test_error(self):
+        result = get_resource(duplicate_import_ids="error").import_data(self.dataset)
+        self.assertEqual(
+            ["invalid", "new", "new", "invalid", "invalid", "invalid"],
+            self.import_types(result),
+        )
+        self.assertEqual(
+            [(1, None), (4, None), (5, None), (6, None)], self.duplicate_rows(result)
+        )
+        self.assertEqual([1, 4, 5, 6], [row.number for row in result.invalid_rows])
+        self.assertEqual(
+            {"id": ["The import id of this row is repeated in rows 4."]},
+            result.invalid_rows[0].error_dict,
+        )
+        self.book.refresh_from_db()
+        self.assertEqual("Moonraker", self.book.name)
+        self.assertFalse(Book.objects.filter(pk=999).exists())
+
+    def test_error_with_several_import_id_fields(self):
+        resource = get_resource(
+            duplicate_import_ids="error", import_id_fields=["name", "price"]
+        )
+        self.dataset.append([1000, "Goldfinger", "2.00"])
+        result = resource.import_data(self.dataset)
+        self.assertEqual([(2, None), (7, None)], self.duplicate_rows(result))
+        self.assertEqual(
+            {NON_FIELD_ERRORS: ["The import id of this row is repeated in rows 2."]},
+            result.invalid_rows[1].error_dict,
+        )
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            get_resource(duplicate_import_ids="any").import_data(self.dataset)
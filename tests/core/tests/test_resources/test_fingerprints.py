@@ -0,0 +1,158 @@
+from unittest import mock
+
+import tablib
+from core.models import Book
+from django.test import TestCase
+
+from import_export import resources, results
+from import_export.fingerprints.models import RowFingerprint
+from import_export.fingerprints.stores import ModelFingerprintStore
+
+
+class FingerprintBookResource(resources.ModelResource):
+    class Meta:
+        model = Book
+        fields = ("id", "name", "price")
+        fingerprint_store_class = ModelFingerprintStore
+
+
+class FingerprintStoreTest(TestCase):
+    def setUp(self):
+        self.resource = FingerprintBookResource()
+        self.dataset = tablib.Dataset(headers=["id", "name", "price"])
+        for i in range(1, 4):
+            self.dataset.append([i, f"Book {i}", "1.99"])
+
+    def import_types(self, result):
+        return [row.import_type for row in result.rows]
+
+    def test_import_stores_fingerprints(self):
+        self.resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(
+            ["1", "2", "3"],
+            sorted(RowFingerprint.objects.values_list("import_id", flat=True)),
+        )
+        self.assertEqual(
+            {self.resource.get_fingerprint_key()},
+            set(RowFingerprint.objects.values_list("resource", flat=True)),
+        )
+
+    def test_unchanged_rows_are_skipped_without_import(self):
+        self.resource.import_data(self.dataset, raise_errors=True)
+        with mock.patch.object(self.resource, "import_row") as mock_import_row:
+            result = self.resource.import_data(self.dataset, raise_errors=True)
+            mock_import_row.assert_not_called()
+        self.assertEqual(
+            [results.RowResult.IMPORT_TYPE_SKIP] * 3, self.import_types(result)
+        )
+        self.assertEqual(3, result.totals[results.RowResult.IMPORT_TYPE_SKIP])
+
+    def test_changed_row_is_imported(self):
+        self.resource.import_data(self.dataset, raise_errors=True)
+        self.dataset[1] = [2, "Book 2", "2.99"]
+        result = self.resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(
+            [
+                results.RowResult.IMPORT_TYPE_SKIP,
+                results.RowResult.IMPORT_TYPE_UPDATE,
+                results.RowResult.IMPORT_TYPE_SKIP,
+            ],
+            self.import_types(result),
+        )
+        self.assertEqual("2.99", str(Book.objects.get(pk=2).price))
+
+        result = self.resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(
+            [results.RowResult.IMPORT_TYPE_SKIP] * 3, self.import_types(result)
+        )
+
+    def test_dry_run_does_not_store_fingerprints(self):
+        self.resource.import_data(self.dataset, dry_run=True, raise_errors=True)
+        self.assertFalse(RowFingerprint.objects.exists())
+
+    def test_invalidate_fingerprints(self):
+        self.resource.import_data(self.dataset, raise_errors=True)
+        RowFingerprint.objects.create(resource="other", import_id="1", digest="x")
+        self.resource.invalidate_fingerprints()
+        self.assertEqual(
+            ["other"], list(RowFingerprint.objects.values_list("resource", flat=True))
+        )
+
+        result = self.resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(
+            [results.RowResult.IMPORT_TYPE_UPDATE] * 3, self.import_types(result)
+        )
+
+    def test_fingerprints_are_kept_per_resource(self):
+        class OtherBookResource(FingerprintBookResource):
+            pass
+
+        self.resource.import_data(self.dataset, raise_errors=True)
+        result = OtherBookResource().import_data(self.dataset, raise_errors=True)
+        self.assertEqual(
+            [results.RowResult.IMPORT_TYPE_UPDATE] * 3, self.import_types(result)
+        )
+
+    def test_rows_without_import_id_are_not_fingerprinted(self):
+        dataset = tablib.Dataset(headers=["id", "name", "price"])
+        dataset.append(["", "Book", "1.99"])
+        self.resource.import_data(dataset, raise_errors=True)
+        self.assertFalse(RowFingerprint.objects.exists())
+        self.assertEqual(
+            (None, None), self.resource.get_row_fingerprint(dataset.dict[0])
+        )
+
+    def test_rows_are_not_fingerprinted_without_import_id_field(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("name", "price")
+                force_init_instance = True
+                fingerprint_store_class = ModelFingerprintStore
+
+        resource = _BookResource()
+        result = resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(
+            [results.RowResult.IMPORT_TYPE_NEW] * 3, self.import_types(result)
+        )
+        self.assertFalse(RowFingerprint.objects.exists())
+        self.assertEqual(
+            (None, None), resource.get_row_fingerprint(self.dataset.dict[0])
+        )
+
+    def test_import_without_batch_size(self):
+        class _BookResource(FingerprintBookResource):
+            class Meta:
+                batch_size = None
+
+        _BookResource().import_data(self.dataset, raise_errors=True)
+        self.assertEqual(3, RowFingerprint.objects.count())
+
+    def test_bulk_import_stores_fingerprints_per_batch(self):
+        class _BookResource(FingerprintBookResource):
+            class Meta:
+                use_bulk = True
+                batch_size = 2
+
+        resource = _BookResource()
+        with mock.patch.object(
+            ModelFingerprintStore,
+            "set_fingerprints",
+            autospec=True,
+            side_effect=ModelFingerprintStore.set_fingerprints,
+        ) as mock_set_fingerprints:
+            resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(2, mock_set_fingerprints.call_count)
+        self.assertEqual(3, RowFingerprint.objects.count())
+
+    @mock.patch("core.models.Book.objects.bulk_create")
+    def test_fingerprints_not_stored_after_error(self, mock_bulk_create):
+        class _BookResource(FingerprintBookResource):
+            class Meta:
+                use_bulk = True
+                use_transactions = False
+
+        mock_bulk_create.side_effect = ValueError("bulk error")
+        result = _BookResource().import_data(self.dataset)
+        self.assertTrue(result.has_errors())
+        self.assertFalse(RowFingerprint.objects.exists())
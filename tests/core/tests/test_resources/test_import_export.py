@@ -451,6 +451,72 @@ class ImportWithMissingFields(TestCase):
         self.assertEqual(1, Author.objects.count())
 
 
+class ImportPlanTest(TestCase):
+    def setUp(self):
+        self.dataset = tablib.Dataset(
+            *[(None, f"Book {i}", "1") for i in range(3)],
+            headers=["id", "name", "categories"],
+        )
+        self.category = Category.objects.create(pk=1, name="Category")
+
+    def test_import_fields_are_resolved_once(self):
+        resource = BookResource()
+        with patch.object(
+            resource, "get_import_fields", wraps=resource.get_import_fields
+        ) as mock_get_import_fields:
+            result = resource.import_data(self.dataset, raise_errors=True)
+        self.assertEqual(3, result.totals["new"])
+        # once for the diff headers, and once for the import plan
+        self.assertEqual(2, mock_get_import_fields.call_count)
+        self.assertIsNone(resource._import_plan)
+        self.assertEqual(
+            [self.category], list(Book.objects.get(name="Book 1").categories.all())
+        )
+
+    def test_import_plan_outside_import_data(self):
+        resource = BookResource()
+        book = Book()
+        resource.import_instance(book, {"name": "Moonraker"})
+        self.assertEqual("Moonraker", book.name)
+
+    @patch("import_export.resources.logger")
+    def test_skipped_field_is_logged_once(self, mock_logger):
+        BookResource().import_data(self.dataset, raise_errors=True)
+        message = (
+            "skipping field '<import_export.fields.Field: author_email>' "
+            "- column name 'author_email' is not present in row"
+        )
+        self.assertEqual(
+            1, [c.args for c in mock_logger.debug.call_args_list].count((message,))
+        )
+
+    def test_overridden_import_field_is_called(self):
+        class _BookResource(BookResource):
+            def import_field(self, field, instance, row, is_m2m=False, **kwargs):
+                if field.attribute == "name":
+                    row = {**row, "name": row["name"].upper()}
+                super().import_field(field, instance, row, is_m2m, **kwargs)
+
+        _BookResource().import_data(self.dataset, raise_errors=True)
+        self.assertTrue(Book.objects.filter(name="BOOK 1").exists())
+        self.assertEqual(3, Book.objects.filter(categories=self.category).count())
+
+    def test_overridden_field_save_is_called(self):
+        class UpperField(fields.Field):
+            def save(self, instance, row, is_m2m=False, **kwargs):
+                instance.name = row["name"].upper()
+
+        class _BookResource(ModelResource):
+            name = UpperField(attribute="name", column_name="name")
+
+            class Meta:
+                model = Book
+                fields = ("id", "name")
+
+        _BookResource().import_data(self.dataset, raise_errors=True)
+        self.assertTrue(Book.objects.filter(name="BOOK 1").exists())
+
+
 class CustomColumnNameImportTest(TestCase):
     """
     If a custom field is declared, import should work if either the Field's
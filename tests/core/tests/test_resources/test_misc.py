@@ -1,8 +1,10 @@
+from collections import OrderedDict
+
 import tablib
 from core.models import Author, Book, Category
 from django.test import TestCase
 
-from import_export import resources, results
+from import_export import fields, resources, results, widgets
 
 
 class RawValueTest(TestCase):
@@ -63,3 +65,89 @@ class ResourceSubscriptTest(TestCase):
                 model = Book
 
         self.assertTrue(issubclass(BookResource, resources.ModelResource))
+
+
+class ResourceFieldsCopyOnWriteTest(TestCase):
+    def setUp(self):
+        class _BookResource(resources.ModelResource):
+            author = fields.Field(
+                attribute="author",
+                column_name="Author",
+                widget=widgets.CachedForeignKeyWidget(Author),
+            )
+
+            class Meta:
+                model = Book
+
+        self.resource_class = _BookResource
+
+    def test_fields_are_shared_until_accessed(self):
+        resource = self.resource_class()
+        self.assertIs(
+            resource.fields._fields["name"], self.resource_class.fields["name"]
+        )
+        field = resource.fields["name"]
+        self.assertIsNot(field, self.resource_class.fields["name"])
+        self.assertIs(field, resource.fields["name"])
+        self.assertIsNot(field.widget, self.resource_class.fields["name"].widget)
+
+    def test_changing_a_field_does_not_affect_other_instances(self):
+        resource = self.resource_class()
+        resource.fields["name"].column_name = "Title"
+        resource.fields["name"].widget.coerce_to_string = False
+
+        self.assertEqual("Title", resource.fields["name"].column_name)
+        self.assertEqual("name", self.resource_class().fields["name"].column_name)
+        self.assertEqual("name", self.resource_class.fields["name"].column_name)
+        self.assertTrue(self.resource_class.fields["name"].widget.coerce_to_string)
+
+    def test_changing_the_mapping_does_not_affect_other_instances(self):
+        resource = self.resource_class()
+        custom_field = fields.Field(attribute="name", column_name="Title")
+        resource.fields["title"] = custom_field
+        del resource.fields["author_email"]
+
+        self.assertIs(custom_field, resource.fields["title"])
+        self.assertNotIn("author_email", resource.fields)
+        self.assertIn("author_email", self.resource_class().fields)
+        self.assertNotIn("title", self.resource_class().fields)
+
+    def test_fields_keep_declaration_order(self):
+        resource = self.resource_class()
+        self.assertEqual(list(self.resource_class.fields), list(resource.fields.keys()))
+        self.assertEqual(
+            [f.column_name for f in self.resource_class.fields.values()],
+            [f.column_name for f in resource.fields.values()],
+        )
+
+    def test_widget_cache_is_not_copied(self):
+        author = Author.objects.create(name="Foo")
+        widget = self.resource_class.fields["author"].widget
+        widget.clean(author.pk)
+        self.assertTrue(hasattr(widget, "_cached_qs"))
+
+        resource = self.resource_class()
+        self.assertFalse(hasattr(resource.fields["author"].widget, "_cached_qs"))
+
+    def test_dict_methods(self):
+        resource = self.resource_class()
+        names = list(resource.fields)
+        fields_ = resource.fields.copy()
+        self.assertIsInstance(fields_, OrderedDict)
+        self.assertEqual(names, list(fields_))
+        self.assertIs(resource.fields["name"], fields_["name"])
+
+        title = fields.Field(attribute="name", column_name="Title")
+        self.assertEqual(names + ["title"], list(resource.fields | {"title": title}))
+        self.assertEqual(["title"] + names, list({"title": title} | resource.fields))
+        resource.fields |= {"title": title}
+        self.assertIs(title, resource.fields["title"])
+
+        resource.fields.move_to_end("title", last=False)
+        self.assertEqual(["title"] + names, list(resource.fields))
+        self.assertEqual(
+            list(reversed(["title"] + names)), list(reversed(resource.fields))
+        )
+        self.assertEqual(("title", title), resource.fields.popitem(last=False))
+        self.assertEqual(names[-1], resource.fields.popitem()[0])
+        self.assertNotIn("title", self.resource_class.fields)
@@ -1,9 +1,11 @@
-from datetime import date
+from datetime import date, datetime, time
+from decimal import Decimal
+from unittest import mock
 
 import tablib
 from core.admin import BookResource
 from core.models import Author, Book, EBook
-from django.db.models import CharField, Value
+from django.db.models import CharField, F, Value
 from django.db.models.functions import Cast, JSONObject, TruncDate
 from django.test import TestCase
 
@@ -40,6 +42,8 @@ class ExportFunctionalityTest(TestCase):
         )
 
     def test_export(self):
+        # 'categories' are prefetched, so the query count does not depend
+        # on the number of rows
         with self.assertNumQueries(2):
             dataset = self.resource.export(queryset=Book.objects.all())
             self.assertEqual(len(dataset), 1)
@@ -56,7 +60,7 @@ class ExportFunctionalityTest(TestCase):
         Book.objects.create(name="Second book", author=Author.objects.create())
         Book.objects.create(name="Third book", author=Author.objects.create())
 
-        with self.assertNumQueries(3):
+        with self.assertNumQueries(2):
             dataset = self.resource.export(Book.objects.prefetch_related("categories"))
             self.assertEqual(dataset.dict[0]["author"], author.pk)
             self.assertEqual(len(dataset), 3)
@@ -67,7 +71,7 @@ class ExportFunctionalityTest(TestCase):
             self.assertEqual(len(dataset), 1)
 
     def test_export_prefetch_related(self):
-        with self.assertNumQueries(3):
+        with self.assertNumQueries(2):
             dataset = self.resource.export(
                 queryset=Book.objects.prefetch_related("categories").all()
             )
@@ -178,3 +182,208 @@ class ExportFunctionalityTest(TestCase):
         self.assertEqual(dataset.dict[0]["Author Name"], "Ian Fleming")
         self.assertEqual(dataset.dict[0]["Author Birthdate"], "")
         self.assertEqual(dataset.dict[0]["Custom Attribute"], "")
+
+
+class ValuesExportTest(TestCase):
+    class _BookResource(ModelResource):
+        class Meta:
+            model = Book
+            fields = (
+                "id",
+                "name",
+                "author",
+                "author__name",
+                "author__birthday",
+                "published",
+                "published_time",
+                "price",
+                "added",
+                "imported",
+            )
+
+    def setUp(self):
+        author = Author.objects.create(name="Ian Fleming")
+        Book.objects.create(
+            name="Moonraker",
+            author=author,
+            published=date(1955, 4, 5),
+            published_time=time(12, 30),
+            price=Decimal("10.25"),
+            added=datetime(2020, 1, 2, 3, 4, 5),
+        )
+        Book.objects.create(name="Untitled")
+
+    def _export_instances(self, resource, queryset=None):
+        with mock.patch.object(
+            resource, "_get_export_values_lookups", return_value=None
+        ):
+            return resource.export(queryset)
+
+    def test_values_export_is_used(self):
+        resource = self._BookResource()
+        queryset = Book.objects.all()
+        lookups = [
+            "author_id" if f == "author" else f for f in self._BookResource.Meta.fields
+        ]
+        self.assertEqual(
+            lookups,
+            resource._get_export_values_lookups(queryset, resource.get_export_fields()),
+        )
+        with mock.patch.object(
+            resource, "_iter_export_values", wraps=resource._iter_export_values
+        ) as mock_iter_export_values:
+            self.assertEqual(2, len(resource.export(queryset)))
+            mock_iter_export_values.assert_called_once()
+
+    def test_values_export_matches_instance_export(self):
+        resource = self._BookResource()
+        queryset = Book.objects.order_by("id")
+        self.assertEqual(
+            self._export_instances(resource, queryset).dict,
+            resource.export(queryset).dict,
+        )
+
+    def test_values_export_one_query(self):
+        with self.assertNumQueries(1):
+            dataset = self._BookResource().export(Book.objects.order_by("id"))
+        self.assertEqual("Ian Fleming", dataset.dict[0]["author__name"])
+        self.assertEqual("", dataset.dict[1]["author__name"])
+
+    def test_values_export_of_distinct_queryset(self):
+        class _BookResource(ModelResource):
+            class Meta:
+                model = Book
+                fields = ("name",)
+
+        Book.objects.create(name="Moonraker")
+        resource = _BookResource()
+        # ordered by an exported column, which does not add the pk to the SELECT
+        queryset = Book.objects.distinct().order_by("name")
+        self.assertIsNotNone(
+            resource._get_export_values_lookups(queryset, resource.get_export_fields())
+        )
+        dataset = resource.export(queryset)
+        self.assertEqual(["Moonraker", "Moonraker", "Untitled"], dataset["name"])
+        self.assertEqual(self._export_instances(resource, queryset).dict, dataset.dict)
+
+    def test_values_export_with_annotation(self):
+        class _BookResource(ModelResource):
+            author_name = Field(attribute="author_name")
+
+            class Meta:
+                model = Book
+                fields = ("id", "author_name")
+
+        resource = _BookResource()
+        queryset = Book.objects.annotate(author_name=F("author__name")).order_by("id")
+        self.assertIsNotNone(
+            resource._get_export_values_lookups(queryset, resource.get_export_fields())
+        )
+        self.assertEqual(
+            self._export_instances(resource, queryset).dict,
+            resource.export(queryset).dict,
+        )
+
+    def test_not_used_for_dehydrate_method(self):
+        class _BookResource(self._BookResource):
+            def dehydrate_name(self, obj):
+                return obj.name.upper()
+
+        resource = _BookResource()
+        self.assertIsNone(
+            resource._get_export_values_lookups(
+                Book.objects.all(), resource.get_export_fields()
+            )
+        )
+        self.assertIn("MOONRAKER", resource.export()["name"])
+
+    def test_not_used_for_related_widgets(self):
+        resource = BookResource()
+        self.assertIsNone(
+            resource._get_export_values_lookups(
+                Book.objects.all(), resource.get_export_fields()
+            )
+        )
+
+    def test_not_used_for_custom_field_class(self):
+        class UpperField(Field):
+            def get_value(self, instance):
+                return super().get_value(instance).upper()
+
+        class _BookResource(ModelResource):
+            name = UpperField(attribute="name")
+
+            class Meta:
+                model = Book
+                fields = ("name",)
+
+        self.assertIn("MOONRAKER", _BookResource().export()["name"])
+
+    def test_is_values_lookup(self):
+        queryset = Book.objects.all()
+        self.assertTrue(ModelResource._is_values_lookup(queryset, "pk"))
+        self.assertTrue(ModelResource._is_values_lookup(queryset, "author_id"))
+        self.assertTrue(ModelResource._is_values_lookup(queryset, "author__pk"))
+        self.assertFalse(ModelResource._is_values_lookup(queryset, "author"))
+        self.assertFalse(ModelResource._is_values_lookup(queryset, "categories"))
+        self.assertFalse(ModelResource._is_values_lookup(queryset, "categories__name"))
+        self.assertFalse(ModelResource._is_values_lookup(queryset, "name__x"))
+        self.assertFalse(ModelResource._is_values_lookup(queryset, "unknown"))
+
+
+class ExportPlanTest(TestCase):
+    def setUp(self):
+        author = Author.objects.create(name="Ian Fleming")
+        Book.objects.create(name="Moonraker", author=author)
+        Book.objects.create(name="Dr. No", author=author)
+
+    def test_export_fields_are_resolved_once(self):
+        resource = BookResource()
+        with mock.patch.object(
+            resource, "get_export_fields", wraps=resource.get_export_fields
+        ) as mock_get_export_fields:
+            dataset = resource.export()
+        self.assertEqual(2, len(dataset))
+        # once for the plan, once for the headers
+        self.assertEqual(2, mock_get_export_fields.call_count)
+
+    def test_export_plan_dehydrate_methods(self):
+        class _BookResource(ModelResource):
+            full_title = Field(column_name="Full title")
+            author_name = Field(
+                column_name="Author", dehydrate_method=lambda obj: obj.author.name
+            )
+
+            class Meta:
+                model = Book
+                fields = ("name", "categories", "full_title", "author_name")
+
+            def dehydrate_full_title(self, obj):
+                return f"{obj.name} by {obj.author.name}"
+
+        dataset = _BookResource().export(Book.objects.order_by("id"))
+        self.assertEqual(
+            {
+                "name": "Moonraker",
+                "categories": "",
+                "Full title": "Moonraker by Ian Fleming",
+                "Author": "Ian Fleming",
+            },
+            dataset.dict[0],
+        )
+
+    def test_export_plan_matches_export_resource(self):
+        resource = BookResource()
+        queryset = Book.objects.order_by("id")
+        dataset = resource.export(queryset)
+        self.assertEqual(
+            [tuple(resource.export_resource(obj)) for obj in queryset], dataset[:]
+        )
+
+    def test_overridden_export_field_is_called(self):
+        class _BookResource(BookResource):
+            def export_field(self, field, instance, **kwargs):
+                return "x"
+
+        dataset = _BookResource().export()
+        self.assertEqual(["x", "x"], dataset["name"])
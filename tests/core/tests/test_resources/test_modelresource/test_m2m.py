@@ -1,7 +1,9 @@
 import tablib
 from core.models import Author, Book, Category
 from core.tests.resources import BookResource
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from import_export import fields, resources, widgets
 
@@ -127,3 +129,59 @@ class ForeignKeyM2MTest(TestCase):
         self.assertIn(cat2, book2.categories.all())
         self.assertIn(cat3, book2.categories.all())
         self.assertIn(cat4, book2.categories.all())
+
+
+class CachedManyToManyWidgetImportTest(TestCase):
+    class BookCachedM2MResource(resources.ModelResource):
+        categories = fields.Field(
+            attribute="categories",
+            widget=widgets.CachedManyToManyWidget(Category, field="name"),
+        )
+
+        class Meta:
+            model = Book
+            fields = ("id", "name", "categories")
+            skip_unchanged = True
+
+    def setUp(self):
+        self.cat1 = Category.objects.create(name="Cat 1")
+        self.cat2 = Category.objects.create(name="Cat 2")
+        self.dataset = tablib.Dataset(
+            [None, "Book 1", "Cat 1"],
+            [None, "Book 2", "Cat 1,Cat 2"],
+            [None, "Book 3", "Cat 2"],
+            headers=["id", "name", "categories"],
+        )
+
+    def test_import(self):
+        resource = self.BookCachedM2MResource()
+        result = resource.import_data(self.dataset, raise_errors=True)
+        self.assertFalse(result.has_errors())
+        self.assertEqual(
+            [self.cat1, self.cat2],
+            list(Book.objects.get(name="Book 2").categories.order_by("id")),
+        )
+
+    def test_import_resolves_related_instances_once(self):
+        resource = self.BookCachedM2MResource()
+        with CaptureQueriesContext(connection) as ctx:
+            resource.import_data(self.dataset, raise_errors=True)
+        category_queries = [
+            q
+            for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and '"core_category"."name" IN' in q["sql"]
+        ]
+        self.assertEqual(1, len(category_queries))
+
+    def test_import_unknown_value(self):
+        self.dataset.append([None, "Book 4", "Unknown"])
+        resource = self.BookCachedM2MResource()
+        result = resource.import_data(self.dataset)
+        self.assertFalse(result.has_errors())
+        self.assertTrue(result.has_validation_errors())
+        self.assertEqual(4, result.invalid_rows[0].number)
+        self.assertEqual(
+            {"categories": ["Category matching name not found: Unknown"]},
+            result.invalid_rows[0].error_dict,
+        )
+        self.assertFalse(Book.objects.filter(name="Book 4").exists())
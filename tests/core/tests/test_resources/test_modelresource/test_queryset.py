@@ -1,11 +1,13 @@
 from unittest import mock
 
 import tablib
-from core.models import Book
+from core.models import Author, Book, Category
 from core.tests.resources import BookResource
-from django.core.paginator import Paginator
+from django.db.models import Prefetch
 from django.test import TestCase
 
+from import_export import fields, resources, widgets
+
 
 class QuerysetHandlingTest(TestCase):
     def setUp(self):
@@ -21,29 +23,190 @@ class QuerysetHandlingTest(TestCase):
             list(self.resource.iter_queryset(qs))
             mocked_method.assert_called_once_with(chunk_size=100)
 
-    def test_iter_queryset_prefetch_unordered(self):
-        qsu = Book.objects.prefetch_related("categories").all()
-        qso = qsu.order_by("pk").all()
-        with mock.patch.object(qsu, "order_by") as mocked_method:
-            mocked_method.return_value = qso
-            list(self.resource.iter_queryset(qsu))
-            mocked_method.assert_called_once_with("pk")
-
-    def test_iter_queryset_prefetch_ordered(self):
-        qs = Book.objects.prefetch_related("categories").order_by("pk").all()
-        with mock.patch("import_export.resources.Paginator", autospec=True) as p:
-            p.return_value = Paginator(qs, 100)
+    def test_iter_queryset_prefetch(self):
+        qs = Book.objects.prefetch_related("categories").all()
+        with mock.patch.object(qs, "iterator") as mocked_method:
             list(self.resource.iter_queryset(qs))
-            p.assert_called_once_with(qs, 100)
+            mocked_method.assert_called_once_with(chunk_size=100)
 
     def test_iter_queryset_prefetch_chunk_size(self):
         class B(BookResource):
             class Meta:
-                chunk_size = 1000
+                chunk_size = 1
+
+        Book.objects.create(name="Other book")
+        qs = Book.objects.prefetch_related("categories").order_by("pk")
+        # one query for the books, and one for the categories of each chunk
+        with self.assertNumQueries(3):
+            books = list(B().iter_queryset(qs))
+        self.assertEqual(["Some book", "Other book"], [book.name for book in books])
+
+    def test_iter_queryset_prefetch_keeps_default_ordering(self):
+        Category.objects.create(name="b")
+        Category.objects.create(name="c")
+        Category.objects.create(name="a")
+        qs = Category.objects.prefetch_related("book_set")
+        with mock.patch.object(Category._meta, "ordering", ["name"]):
+            names = [c.name for c in self.resource.iter_queryset(qs.all())]
+        self.assertEqual(["a", "b", "c"], names)
+
+
+class ExportQuerysetOptimizationTest(TestCase):
+    def setUp(self):
+        for i in range(3):
+            author = Author.objects.create(name=f"Author {i}")
+            book = Book.objects.create(name=f"Book {i}", author=author)
+            book.categories.add(Category.objects.create(name=f"Category {i}"))
+
+    def test_related_attribute_path_is_selected(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "author__name")
+
+        resource = _BookResource()
+        qs = resource.optimize_export_queryset(
+            Book.objects.all(), resource.get_export_fields()
+        )
+        self.assertEqual({"author": {}}, qs.query.select_related)
+        with self.assertNumQueries(1):
+            dataset = resource.export(Book.objects.order_by("id"))
+        self.assertEqual("Author 2", dataset.dict[2]["author__name"])
+
+    def test_foreign_key_widget_is_selected(self):
+        class _BookResource(resources.ModelResource):
+            author = fields.Field(
+                attribute="author", widget=widgets.ForeignKeyWidget(Author, "name")
+            )
+
+            class Meta:
+                model = Book
+                fields = ("id", "author")
+
+        with self.assertNumQueries(1):
+            dataset = _BookResource().export()
+        self.assertEqual(
+            ["Author 0", "Author 1", "Author 2"], sorted(dataset["author"])
+        )
+
+    def test_foreign_key_id_is_not_selected(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "author")
+
+        resource = _BookResource()
+        qs = resource.optimize_export_queryset(
+            Book.objects.all(), resource.get_export_fields()
+        )
+        self.assertFalse(qs.query.select_related)
+        self.assertFalse(qs._prefetch_related_lookups)
+
+    def test_many_to_many_is_prefetched(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "categories")
+
+        resource = _BookResource()
+        qs = resource.optimize_export_queryset(
+            Book.objects.all(), resource.get_export_fields()
+        )
+        self.assertEqual(("categories",), qs._prefetch_related_lookups)
+        # select and prefetch
+        with self.assertNumQueries(2):
+            resource.export()
+
+    def test_existing_prefetch_is_not_duplicated(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "categories")
+
+        resource = _BookResource()
+        qs = resource.optimize_export_queryset(
+            Book.objects.prefetch_related(
+                Prefetch("categories", queryset=Category.objects.all())
+            ),
+            resource.get_export_fields(),
+        )
+        self.assertEqual(1, len(qs._prefetch_related_lookups))
+
+    def test_dehydrated_field_is_ignored(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "author__name")
+
+            def dehydrate_author__name(self, obj):
+                return "x"
+
+        resource = _BookResource()
+        qs = resource.optimize_export_queryset(
+            Book.objects.all(), resource.get_export_fields()
+        )
+        self.assertFalse(qs.query.select_related)
+
+    def test_natural_foreign_key_dependencies_are_selected(self):
+        class _AuthorField(fields.Field):
+            def export(self, instance, **kwargs):
+                return super().export(instance, **kwargs)
+
+        class _BookResource(resources.ModelResource):
+            author = _AuthorField(
+                attribute="author",
+                widget=widgets.ForeignKeyWidget(Author, use_natural_foreign_keys=True),
+            )
+
+            class Meta:
+                model = Book
+                fields = ("id", "author")
+
+        resource = _BookResource()
+        qs = resource.optimize_export_queryset(
+            Book.objects.all(), resource.get_export_fields()
+        )
+        self.assertEqual({"author": {}}, qs.query.select_related)
+        self.assertEqual(
+            ["author"],
+            [f.name for f in resources.ModelResource._get_natural_key_relations(Book)],
+        )
+
+    def test_batched_natural_foreign_keys_are_not_selected(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "author")
+                use_natural_foreign_keys = True
+
+        resource = _BookResource()
+        qs = resource.optimize_export_queryset(
+            Book.objects.all(), resource.get_export_fields()
+        )
+        self.assertFalse(qs.query.select_related)
+
+    def test_optimize_export_queryset_disabled(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "author__name", "categories")
+                optimize_export_queryset = False
+
+        resource = _BookResource()
+        qs = Book.objects.all()
+        self.assertIs(
+            qs, resource.optimize_export_queryset(qs, resource.get_export_fields())
+        )
+
+    def test_values_queryset_is_unaltered(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "author__name")
 
-        paginator = "import_export.resources.Paginator"
-        qs = Book.objects.prefetch_related("categories").order_by("pk").all()
-        with mock.patch(paginator, autospec=True) as mocked_obj:
-            mocked_obj.return_value = Paginator(qs, 1000)
-            list(B().iter_queryset(qs))
-            mocked_obj.assert_called_once_with(qs, 1000)
+        resource = _BookResource()
+        qs = Book.objects.values("id", "author__name")
+        self.assertIs(
+            qs, resource.optimize_export_queryset(qs, resource.get_export_fields())
+        )
+        self.assertEqual(3, len(resource.export(qs)))
@@ -25,6 +25,7 @@ class ModelResourcePostgresModuleLoadTest(TestCase):
     def setUp(self):
         super().setUp()
         self.resource = BookResource()
+        resources._get_array_field_class.cache_clear()
         if self.pg_module_name in sys.modules:
             self.pg_modules = sys.modules[self.pg_module_name]
             del sys.modules[self.pg_module_name]
@@ -32,6 +33,7 @@ class ModelResourcePostgresModuleLoadTest(TestCase):
     def tearDown(self):
         super().tearDown()
         sys.modules[self.pg_module_name] = self.pg_modules
+        resources._get_array_field_class.cache_clear()
 
     def test_widget_from_django_field_cannot_import_postgres(self):
         # test that default widget is returned if postgres extensions
@@ -1,3 +1,6 @@
+import json
+from unittest import mock
+
 import tablib
 from core.models import Author, Book
 from django.test import TestCase
@@ -55,6 +58,39 @@ class TestNaturalKeys(TestCase):
         exported_dataset = resource.export(Book.objects.all())
         self.assertDatasetEqual(self.expected_dataset, exported_dataset)
 
+    def test_export_natural_keys_in_batches(self):
+        authors = [Author.objects.create(name="Author %d" % i) for i in range(3)]
+        for i in range(9):
+            Book.objects.create(author=authors[i % 3], name="Book %d" % i)
+        Book.objects.create(name="Anonymous")
+        resource = BookUsingNaturalKeys()
+        # one query for the books and one for the authors of each chunk
+        with self.assertNumQueries(2):
+            exported_dataset = resource.export(Book.objects.order_by("pk"))
+        self.assertEqual(
+            [
+                ("The Hobbit", '["J. R. R. Tolkien"]'),
+                *(("Book %d" % i, '["Author %d"]' % (i % 3)) for i in range(9)),
+                ("Anonymous", ""),
+            ],
+            list(exported_dataset),
+        )
+
+    def test_export_natural_keys_by_chunk(self):
+        for i in range(4):
+            Book.objects.create(
+                author=Author.objects.create(name="Author %d" % i),
+                name="Book %d" % i,
+            )
+        resource = BookUsingAuthorNaturalKey()
+        with mock.patch.object(resource, "get_chunk_size", return_value=2):
+            with self.assertNumQueries(4):
+                exported_dataset = resource.export(Book.objects.order_by("pk"))
+        self.assertEqual(
+            ["J. R. R. Tolkien", "Author 0", "Author 1", "Author 2", "Author 3"],
+            [json.loads(author)[0] for author in exported_dataset["author"]],
+        )
+
     def assertDatasetEqual(self, expected_dataset, actual_dataset, message=None):
         """
         Util for comparing datasets
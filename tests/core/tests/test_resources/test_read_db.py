@@ -0,0 +1,144 @@
+from unittest import mock
+
+import tablib
+from core.models import Author, Book, Category
+from django.db.models.query import QuerySet
+from django.test import TestCase
+
+from import_export import fields, instance_loaders, resources, widgets
+from import_export.utils import using_lookup_db
+
+using = QuerySet.using
+
+
+def get_resource(**options):
+    meta = type(
+        "Meta",
+        (),
+        {"model": Book, "fields": ("id", "name", "author"), "using_read_db": "replica"},
+    )
+    for name, value in options.items():
+        setattr(meta, name, value)
+    return type("BookResource", (resources.ModelResource,), {"Meta": meta})()
+
+
+class ReadDbTest(TestCase):
+    """
+    The test database has no replica: querysets routed to "replica" are run on
+    the default database, as if it had no replication lag, or return no rows if
+    ``lagging`` is set.
+    """
+
+    lagging = False
+
+    def setUp(self):
+        self.author = Author.objects.create(name="Ian Fleming")
+        self.book = Book.objects.create(name="Moonraker", author=self.author)
+        self.dataset = tablib.Dataset(headers=["id", "name", "author"])
+        self.dataset.append([self.book.pk, "Moonraker 2", self.author.pk])
+        self.aliases = []
+        patcher = mock.patch.object(QuerySet, "using", self.get_using())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_using(self):
+        def _using(queryset, alias):
+            self.aliases.append(alias)
+            if alias != "replica":
+                return using(queryset, alias)
+            queryset = using(queryset, "default")
+            return queryset.none() if self.lagging else queryset
+
+        return _using
+
+    def test_export_reads_from_read_db(self):
+        dataset = get_resource().export()
+        self.assertIn("replica", self.aliases)
+        self.assertNotIn("default", self.aliases)
+        self.assertEqual(
+            [str(self.book.pk), "Moonraker", str(self.author.pk)],
+            [str(value) for value in dataset[0]],
+        )
+
+    def test_export_renders_natural_keys_from_read_db(self):
+        class BookResource(resources.ModelResource):
+            author = fields.Field(
+                attribute="author",
+                column_name="author",
+                widget=widgets.ForeignKeyWidget(Author, use_natural_foreign_keys=True),
+            )
+
+            class Meta:
+                model = Book
+                fields = ("id", "author")
+                using_read_db = "replica"
+
+        with mock.patch.object(Author, "natural_key", lambda a: (a.name,), create=True):
+            BookResource().export()
+        self.assertEqual({"replica"}, set(self.aliases))
+
+    def test_export_without_read_db(self):
+        get_resource(using_read_db=None).export()
+        self.assertEqual([], self.aliases)
+
+    def test_import_reads_from_write_db(self):
+        result = get_resource().import_data(self.dataset, dry_run=True)
+        self.assertEqual(["update"], [row.import_type for row in result.rows])
+        self.assertNotIn("replica", self.aliases)
+
+    def test_dry_run_reads_from_read_db(self):
+        resource = get_resource(dry_run_uses_read_db=True)
+        result = resource.import_data(self.dataset, dry_run=True)
+        self.assertEqual(["update"], [row.import_type for row in result.rows])
+        # the book and its author are looked up in the replica, and the book is
+        # saved to the default database
+        self.assertEqual(["replica", "replica", "default"], self.aliases)
+        self.aliases.clear()
+        resource.import_data(self.dataset)
+        self.assertNotIn("replica", self.aliases)
+
+    def test_dry_run_falls_back_to_write_db(self):
+        self.lagging = True
+        for instance_loader_class in (
+            instance_loaders.ModelInstanceLoader,
+            instance_loaders.CachedInstanceLoader,
+        ):
+            with self.subTest(instance_loader_class=instance_loader_class):
+                self.aliases.clear()
+                resource = get_resource(
+                    dry_run_uses_read_db=True,
+                    instance_loader_class=instance_loader_class,
+                )
+                result = resource.import_data(self.dataset, dry_run=True)
+                self.assertEqual([], result.invalid_rows)
+                self.assertEqual(["update"], [row.import_type for row in result.rows])
+                self.assertIn("default", self.aliases)
+
+    def test_many_to_many_falls_back_to_write_db(self):
+        categories = [Category.objects.create(name=name) for name in ("A", "B")]
+        value = ",".join(str(category.pk) for category in categories)
+        widget = widgets.ManyToManyWidget(Category)
+        for lagging in (False, True):
+            with self.subTest(lagging=lagging):
+                self.lagging = lagging
+                self.aliases.clear()
+                with using_lookup_db("replica", "default"):
+                    self.assertEqual(
+                        categories, list(widget.clean(value).order_by("pk"))
+                    )
+                self.assertEqual(lagging, "default" in self.aliases)
+
+    def test_dry_run_without_fallback(self):
+        self.lagging = True
+        resource = get_resource(dry_run_uses_read_db=True, read_db_fallback=False)
+        result = resource.import_data(self.dataset, dry_run=True)
+        self.assertTrue(result.has_errors())
+        self.assertEqual(["replica", "replica"], self.aliases)
+
+    def test_get_lookup_db_connection_name(self):
+        self.assertIsNone(
+            get_resource(using_read_db=None).get_lookup_db_connection_name(True)
+        )
+        resource = get_resource(using_db="primary", dry_run_uses_read_db=True)
+        self.assertEqual("primary", resource.get_lookup_db_connection_name())
+        self.assertEqual("replica", resource.get_lookup_db_connection_name(True))
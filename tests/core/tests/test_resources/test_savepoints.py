@@ -0,0 +1,87 @@
+from unittest import mock
+
+import tablib
+from core.models import Category
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from import_export import resources
+
+
+class CategoryResource(resources.ModelResource):
+    class Meta:
+        model = Category
+        fields = ("id", "name")
+
+
+class SavepointCategoryResource(CategoryResource):
+    class Meta(CategoryResource.Meta):
+        savepoint_batch_size = 3
+
+
+class SavepointBatchSizeTest(TestCase):
+    def setUp(self):
+        Category.objects.create(name="Fiction")
+        self.dataset = tablib.Dataset(headers=["id", "name"])
+        for name in ("Poetry", "Drama", "Essays", "Plays", "Letters"):
+            self.dataset.append(["", name])
+
+    def import_data(self, resource, dataset, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            result = resource.import_data(dataset, use_transactions=True, **kwargs)
+        savepoints = [q for q in queries if q["sql"].startswith("SAVEPOINT")]
+        return result, len(savepoints)
+
+    def test_one_savepoint_per_group(self):
+        _, savepoints = self.import_data(CategoryResource(), self.dataset, dry_run=True)
+        result, batch_savepoints = self.import_data(
+            SavepointCategoryResource(), self.dataset
+        )
+        self.assertEqual(savepoints - len(self.dataset) + 2, batch_savepoints)
+        self.assertEqual(
+            ["new"] * len(self.dataset), [row.import_type for row in result.rows]
+        )
+        self.assertEqual(
+            [row.object_id for row in result.rows],
+            list(
+                Category.objects.filter(name__in=self.dataset["name"])
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            ),
+        )
+
+    def test_group_with_error_is_imported_row_by_row(self):
+        self.dataset[1] = ["", "Fiction"]
+        resource = SavepointCategoryResource()
+        with mock.patch.object(
+            resource, "import_row", wraps=resource.import_row
+        ) as mock_import_row:
+            result, _ = self.import_data(resource, self.dataset)
+        self.assertEqual(
+            [1, 2, 1, 2, 3, 4, 5],
+            [c.kwargs["row_number"] for c in mock_import_row.call_args_list],
+        )
+        self.assertEqual(
+            ["new", "error", "new", "new", "new"],
+            [row.import_type for row in result.rows],
+        )
+        self.assertIn("UNIQUE", str(result.rows[1].errors[0].error).upper())
+        self.assertEqual([], result.rows[2].errors)
+
+    def test_without_transactions(self):
+        resource = SavepointCategoryResource()
+        with CaptureQueriesContext(connection) as queries:
+            result = resource.import_data(self.dataset, use_transactions=False)
+        self.assertFalse(any(q["sql"].startswith("SAVEPOINT") for q in queries))
+        self.assertEqual(
+            ["new"] * len(self.dataset), [row.import_type for row in result.rows]
+        )
+
+    def test_invalid_savepoint_batch_size(self):
+        class _CategoryResource(CategoryResource):
+            class Meta(CategoryResource.Meta):
+                savepoint_batch_size = 0
+
+        with self.assertRaises(ValueError):
+            _CategoryResource().import_data(self.dataset)
@@ -0,0 +1,202 @@
+import tablib
+from core.models import Book, Category, Edition
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from import_export import fields, resources, widgets
+
+
+class CategoryResource(resources.ModelResource):
+    class Meta:
+        model = Category
+        fields = ("id", "name")
+        clean_model_instances = True
+
+
+class BatchCategoryResource(CategoryResource):
+    class Meta(CategoryResource.Meta):
+        validate_unique_in_batches = True
+
+
+class EditionResource(resources.ModelResource):
+    class Meta:
+        model = Edition
+        fields = ("id", "book", "number", "isbn")
+        clean_model_instances = True
+
+
+class BatchEditionResource(EditionResource):
+    class Meta(EditionResource.Meta):
+        validate_unique_in_batches = True
+
+
+class CachedBookBatchEditionResource(BatchEditionResource):
+    book = fields.Field(
+        attribute="book",
+        column_name="book",
+        widget=widgets.CachedForeignKeyWidget(Book),
+    )
+
+
+class BatchUniqueValidationTest(TestCase):
+    def setUp(self):
+        self.fiction = Category.objects.create(name="Fiction")
+        self.book = Book.objects.create(name="Moonraker")
+        Edition.objects.create(book=self.book, number=1, isbn="111")
+
+    def get_outcomes(self, resource, dataset, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            result = resource.import_data(dataset, dry_run=True, **kwargs)
+        outcomes = [
+            (
+                row.import_type,
+                row.validation_error.message_dict if row.validation_error else None,
+            )
+            for row in result.rows
+        ]
+        return outcomes, len(queries)
+
+    def assertSameOutcomes(self, resource, batch_resource, dataset, **kwargs):
+        outcomes, num_queries = self.get_outcomes(resource, dataset, **kwargs)
+        batch_outcomes, batch_num_queries = self.get_outcomes(
+            batch_resource, dataset, **kwargs
+        )
+        self.assertEqual(outcomes, batch_outcomes)
+        return num_queries, batch_num_queries
+
+    def test_unique_fields(self):
+        dataset = tablib.Dataset(headers=["id", "name"])
+        for name in ("Fiction", "Poetry", "Poetry", "Drama", "Essays"):
+            dataset.append(["", name])
+        dataset.append([self.fiction.pk, "Fiction"])
+        num_queries, batch_num_queries = self.assertSameOutcomes(
+            CategoryResource(), BatchCategoryResource(), dataset
+        )
+        # one query for each of the unique fields (id and name) of the dataset,
+        # instead of one for the name of each row
+        self.assertEqual(num_queries - len(dataset) + 2, batch_num_queries)
+        outcomes, _ = self.get_outcomes(BatchCategoryResource(), dataset)
+        self.assertEqual(
+            [
+                ("invalid", {"name": ["Category with this Name already exists."]}),
+                ("new", None),
+                ("invalid", {"name": ["Category with this Name already exists."]}),
+                ("new", None),
+                ("new", None),
+                ("update", None),
+            ],
+            outcomes,
+        )
+
+    def test_without_batch_size(self):
+        class _BatchCategoryResource(BatchCategoryResource):
+            class Meta:
+                batch_size = None
+
+        dataset = tablib.Dataset(headers=["id", "name"])
+        for name in ("Fiction", "Poetry", "Poetry"):
+            dataset.append(["", name])
+        _, num_queries = self.assertSameOutcomes(
+            CategoryResource(), _BatchCategoryResource(), dataset
+        )
+        _, batch_num_queries = self.get_outcomes(BatchCategoryResource(), dataset)
+        self.assertEqual(batch_num_queries, num_queries)
+
+    def test_renamed_and_deleted_values_are_free(self):
+        class _CategoryResource(CategoryResource):
+            def for_delete(self, row, instance):
+                return row["name"] == "delete"
+
+        class _BatchCategoryResource(_CategoryResource):
+            class Meta(BatchCategoryResource.Meta):
+                pass
+
+        poetry = Category.objects.create(name="Poetry")
+        dataset = tablib.Dataset(headers=["id", "name"])
+        dataset.append([self.fiction.pk, "Novels"])
+        dataset.append(["", "Fiction"])
+        dataset.append([poetry.pk, "delete"])
+        dataset.append(["", "Poetry"])
+        self.assertSameOutcomes(_CategoryResource(), _BatchCategoryResource(), dataset)
+        outcomes, _ = self.get_outcomes(_BatchCategoryResource(), dataset)
+        self.assertEqual(["update", "new", "delete", "new"], [o[0] for o in outcomes])
+
+    def test_unique_constraints(self):
+        dataset = tablib.Dataset(headers=["id", "book", "number", "isbn"])
+        dataset.append(["", self.book.pk, 1, "222"])
+        dataset.append(["", self.book.pk, 2, "111"])
+        dataset.append(["", self.book.pk, 0, "333"])
+        dataset.append(["", self.book.pk, 3, "444"])
+        dataset.append(["", self.book.pk, 3, "444"])
+        dataset.append(["", self.book.pk, 4, ""])
+        dataset.append(["", self.book.pk, 5, ""])
+        for batch_resource in (
+            BatchEditionResource(),
+            CachedBookBatchEditionResource(),
+        ):
+            with self.subTest(resource=batch_resource):
+                self.assertSameOutcomes(EditionResource(), batch_resource, dataset)
+        outcomes, _ = self.get_outcomes(CachedBookBatchEditionResource(), dataset)
+        self.assertEqual(
+            [
+                (
+                    "invalid",
+                    {"__all__": ["Edition with this Book and Number already exists."]},
+                ),
+                ("invalid", {"__all__": ["An edition with this ISBN exists."]}),
+                (
+                    "invalid",
+                    {"__all__": ["Constraint “edition_number_gte_1” is violated."]},
+                ),
+                ("new", None),
+                (
+                    "invalid",
+                    {
+                        "__all__": [
+                            "Edition with this Book and Number already exists.",
+                            "An edition with this ISBN exists.",
+                        ]
+                    },
+                ),
+                ("new", None),
+                ("invalid", {"__all__": ["An edition with this ISBN exists."]}),
+            ],
+            outcomes,
+        )
+
+    def test_duplicates_are_reported_with_use_bulk(self):
+        class _BatchCategoryResource(BatchCategoryResource):
+            class Meta(BatchCategoryResource.Meta):
+                use_bulk = True
+
+        dataset = tablib.Dataset(headers=["id", "name"])
+        for name in ("Poetry", "Poetry", "Fiction"):
+            dataset.append(["", name])
+        outcomes, _ = self.get_outcomes(_BatchCategoryResource(), dataset)
+        self.assertEqual(
+            [
+                ("new", None),
+                ("invalid", {"name": ["Category with this Name already exists."]}),
+                ("invalid", {"name": ["Category with this Name already exists."]}),
+            ],
+            outcomes,
+        )
+
+    def test_values_set_on_import_are_checked_by_query(self):
+        class _BatchCategoryResource(BatchCategoryResource):
+            def before_import_row(self, row, **kwargs):
+                row["name"] = row["name"].title()
+
+        dataset = tablib.Dataset(headers=["id", "name"])
+        dataset.append(["", "fiction"])
+        outcomes, _ = self.get_outcomes(_BatchCategoryResource(), dataset)
+        self.assertEqual(
+            [("invalid", {"name": ["Category with this Name already exists."]})],
+            outcomes,
+        )
+
+    def test_validator_is_only_used_during_import(self):
+        resource = BatchCategoryResource()
+        resource.import_data(tablib.Dataset(headers=["id", "name"]))
+        self.assertIsNone(resource._unique_validator)
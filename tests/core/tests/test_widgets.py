@@ -1,3 +1,4 @@
+import copy
 import json
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
@@ -6,11 +7,11 @@ from unittest.mock import patch
 from zoneinfo import ZoneInfo
 
 import tablib
-from core.models import Author, Book, Category
+from core.models import Author, Book, Category, UUIDCategory
 from django.db import connection
 from django.test import TestCase
 from django.test.utils import CaptureQueriesContext, override_settings
-from django.utils import timezone
+from django.utils import formats, timezone, translation
 
 from import_export import fields, resources, widgets
 from import_export.exceptions import WidgetError
@@ -319,6 +320,93 @@ class TimeWidgetTest(TestCase):
         self.assertEqual(self.time, self.widget.clean(self.time))
 
 
+class CompiledFormatsTest(TestCase):
+    values = [
+        "2012-08-13",
+        "2012-8-13",
+        "0010-08-13",
+        "2012-08-13 18:05",
+        "2012-08-13 18:05:09",
+        "2012-08-13  18:05:09",
+        "2012-08-13T18:05:09",
+        "2012-08-13 18:05:09.5",
+        "2012-08-13 18:05:09.500000",
+        "2012-08-13 18:05:09+02:00",
+        "08/13/2012",
+        "08/13/12 18:05",
+        "13/08/2012",
+        "Aug 13 2012",
+        "18:05",
+        "18:05:09",
+        "18:05:09.25",
+        "20120813",
+        5,
+    ]
+
+    def assertParsesAsStrptime(self, widget):
+        for value in self.values:
+            for _ in range(2):
+                expected = None
+                for format_ in widget.formats:
+                    try:
+                        expected = datetime.strptime(value, format_)
+                        break
+                    except (ValueError, TypeError):
+                        pass
+                if expected is None:
+                    with self.assertRaises(ValueError):
+                        widget._parse_value(value, datetime)
+                else:
+                    self.assertEqual(expected, widget._parse_value(value, datetime))
+
+    def test_parses_as_strptime(self):
+        for widget_class in (
+            widgets.DateWidget,
+            widgets.DateTimeWidget,
+            widgets.TimeWidget,
+        ):
+            with self.subTest(widget_class=widget_class):
+                self.assertParsesAsStrptime(widget_class())
+
+    def test_last_format_is_tried_first(self):
+        widget = widgets.DateWidget()
+        widget.formats = ("%Y-%m-%d", "%d.%m.%Y")
+        self.assertEqual(date(2012, 8, 13), widget.clean("13.08.2012"))
+        with patch("import_export.widgets.datetime") as mock_datetime:
+            mock_datetime.strptime.side_effect = datetime.strptime
+            self.assertEqual(date(2012, 8, 14), widget.clean("14.08.2012"))
+        mock_datetime.strptime.assert_called_once_with("14.08.2012", "%d.%m.%Y")
+
+    def test_last_format_keeps_order_of_ambiguous_formats(self):
+        widget = widgets.DateWidget()
+        widget.formats = ("%m/%d/%Y", "%d/%m/%Y")
+        self.assertEqual(date(2012, 8, 13), widget.clean("13/08/2012"))
+        self.assertEqual(date(2012, 2, 1), widget.clean("02/01/2012"))
+
+    def test_formats_are_recompiled_when_changed(self):
+        widget = widgets.DateWidget("%d.%m.%Y")
+        self.assertEqual(date(2012, 8, 13), widget.clean("13.08.2012"))
+        widget.formats = ("%Y/%m/%d",)
+        self.assertEqual(date(2012, 8, 13), widget.clean("2012/08/13"))
+        with self.assertRaises(ValueError):
+            widget.clean("13.08.2012")
+
+    def test_render_format_is_sanitized_once(self):
+        widget = widgets.DateWidget("%d.%m.%Y")
+        with patch(
+            "django.utils.formats.sanitize_strftime_format",
+            return_value="%d.%m.%4Y",
+        ) as mock_sanitize:
+            self.assertEqual("02.08.0010", widget.render(date(10, 8, 2)))
+            self.assertEqual("13.08.2012", widget.render(date(2012, 8, 13)))
+        mock_sanitize.assert_called_once_with("%d.%m.%Y")
+
+    def test_compiled_formats_are_not_copied(self):
+        widget = widgets.DateWidget("%d.%m.%Y")
+        widget.clean("13.08.2012")
+        self.assertNotIn("_compiled_formats", copy.deepcopy(widget).__dict__)
+
+
 class DurationWidgetTest(TestCase):
     def setUp(self):
         self.duration = timedelta(hours=1, minutes=57, seconds=0)
@@ -392,6 +480,87 @@ class NumberWidgetTest(TestCase):
         self.assertEqual("", self.widget_coerce_to_string.render(None))
 
 
+class NumberCodecTest(TestCase):
+    strings = [
+        "1234",
+        "1,234.5",
+        "1.234,5",
+        "1.234.567,89",
+        "1.5",
+        "1.234",
+        "1\xa0234,5",
+        "1 234,5",
+        "-12,5",
+        "abc",
+    ]
+    numbers = [0, 7, 1234567, -1234567, 1.5, -1234.25, 1e20, Decimal("1234567.891")]
+
+    def test_matches_django_formats(self):
+        for language in ("en", "fr", "de", "ar", "hi"):
+            for use_thousand_separator in (False, True):
+                with override_settings(
+                    LANGUAGE_CODE=language,
+                    USE_THOUSAND_SEPARATOR=use_thousand_separator,
+                ):
+                    codec = widgets._get_number_codec()
+                    for value in self.strings:
+                        self.assertEqual(
+                            formats.sanitize_separators(value), codec.sanitize(value)
+                        )
+                    for value in self.numbers:
+                        self.assertEqual(
+                            formats.number_format(value), codec.format(value)
+                        )
+
+    def test_separators_are_resolved_once_per_language(self):
+        widget = widgets.DecimalWidget()
+        widget.clean("1.5")
+        with patch("import_export.widgets.get_format") as mock_get_format:
+            self.assertEqual(Decimal("2.5"), widget.clean("2.5"))
+            self.assertEqual("2.5", widget.render(Decimal("2.5")))
+        mock_get_format.assert_not_called()
+
+    def test_separators_are_resolved_once_per_scope(self):
+        widget = widgets.DecimalWidget()
+        with widgets._number_codec_scope():
+            with patch("import_export.widgets.get_language") as mock_get_language:
+                self.assertEqual(Decimal("2.5"), widget.clean("2.5"))
+                self.assertEqual("2.5", widget.render(Decimal("2.5")))
+        mock_get_language.assert_not_called()
+
+    def test_export_resolves_separators_once(self):
+        class _BookResource(resources.ModelResource):
+            class Meta:
+                model = Book
+                fields = ("id", "price")
+
+        Book.objects.create(name="a", price=Decimal("1.5"))
+        Book.objects.create(name="b", price=Decimal("2.5"))
+        with patch(
+            "import_export.widgets._resolve_number_codec",
+            side_effect=widgets._resolve_number_codec,
+        ) as mock_resolve:
+            dataset = _BookResource().export(Book.objects.order_by("pk"))
+        self.assertEqual(["1.50", "2.50"], dataset["price"])
+        mock_resolve.assert_called_once_with()
+
+    @override_settings(LANGUAGE_CODE="fr")
+    def test_codec_follows_active_language(self):
+        widget = widgets.FloatWidget()
+        self.assertEqual(1.5, widget.clean("1,5"))
+        with translation.override("en"):
+            self.assertEqual(1.5, widget.clean("1.5"))
+            self.assertEqual("1.5", widget.render(1.5))
+        self.assertEqual("1,5", widget.render(1.5))
+
+    def test_numeric_values_are_not_sanitized(self):
+        with patch.object(widgets._NumberCodec, "sanitize") as mock_sanitize:
+            self.assertEqual(12, widgets.IntegerWidget().clean(12))
+            self.assertEqual(Decimal("12"), widgets.DecimalWidget().clean(12))
+            self.assertEqual(1.5, widgets.FloatWidget().clean(1.5))
+        mock_sanitize.assert_not_called()
+
+
 class FloatWidgetTest(TestCase):
     def setUp(self):
         self.value = 11.111
@@ -642,6 +811,61 @@ class ForeignKeyWidgetTest(TestCase):
             json.dumps(self.book.natural_key()),
         )
 
+    def test_natural_key_is_resolved_once(self):
+        value = json.dumps(self.author.natural_key())
+        with self.assertNumQueries(1):
+            self.assertEqual(self.author, self.natural_key_author_widget.clean(value))
+            self.assertEqual(self.author, self.natural_key_author_widget.clean(value))
+
+    def test_prefetch_natural_keys(self):
+        author2 = Author.objects.create(name="Baz")
+        book2 = Book.objects.create(name="Qux", author=author2)
+        widget = widgets.ForeignKeyWidget(
+            Book,
+            use_natural_foreign_keys=True,
+            natural_key_fields=("name", "author__name"),
+        )
+        widget.natural_key_batch_size = 1
+        values = [
+            json.dumps(self.book.natural_key()),
+            json.dumps(book2.natural_key()),
+            json.dumps(book2.natural_key()),
+            "",
+            "not json",
+        ]
+        with self.assertNumQueries(2):
+            widget.prefetch(values)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.book, widget.clean(values[0]))
+            self.assertEqual(book2, widget.clean(values[1]))
+
+    def test_prefetch_natural_key_fields_from_model(self):
+        with (
+            mock.patch.object(Author, "natural_key_fields", ("name",), create=True),
+            self.assertNumQueries(1),
+        ):
+            self.natural_key_author_widget.prefetch(['["Foo"]', '["Missing"]'])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.author, self.natural_key_author_widget.clean('["Foo"]')
+            )
+        with self.assertRaises(Author.DoesNotExist):
+            self.natural_key_author_widget.clean('["Missing"]')
+
+    def test_prefetch_without_natural_key_fields(self):
+        with self.assertNumQueries(0):
+            self.natural_key_author_widget.prefetch(['["Foo"]'])
+            self.widget.prefetch([self.author.pk])
+
+    def test_prefetch_leaves_duplicate_natural_keys_to_get_by_natural_key(self):
+        Author.objects.create(name="Foo")
+        widget = widgets.ForeignKeyWidget(
+            Author, use_natural_foreign_keys=True, natural_key_fields=("name",)
+        )
+        widget.prefetch(['["Foo"]'])
+        with self.assertRaises(Author.MultipleObjectsReturned):
+            widget.clean('["Foo"]')
+
     def test_natural_foreign_key_with_key_is_id(self):
         with self.assertRaises(WidgetError) as e:
             widgets.ForeignKeyWidget(
@@ -703,6 +927,184 @@ class CachedForeignKeyWidgetTest(TestCase):
             self.assertEqual(self.widget.clean(author2.id), author2)  # cache hit
             self.assertEqual(len(ctx.captured_queries), 0)
 
+    def test_lookup_values_are_normalised_by_field_type(self):
+        book = Book.objects.create(name="Baz", price=Decimal("1.00"))
+        widget = widgets.CachedForeignKeyWidget(Book, "price")
+        with self.assertNumQueries(1):
+            for value in ("1", "1.0", 1, 1.0, Decimal("1.000")):
+                self.assertEqual(book, widget.clean(value))
+
+    def test_relation_lookup_by_instance(self):
+        class AuthorBookWidget(widgets.CachedForeignKeyWidget):
+            def get_lookup_kwargs(self, value, row, **kwargs):
+                return {"author": row["author"]}
+
+        widget = AuthorBookWidget(Book)
+        for author in (self.author, self.author.pk, str(self.author.pk)):
+            self.assertEqual(self.book, widget.clean("x", row={"author": author}))
+
+    def test_multiple_lookup_shapes(self):
+        class NameOrEmailWidget(widgets.CachedForeignKeyWidget):
+            def get_lookup_kwargs(self, value, row, **kwargs):
+                if "@" in value:
+                    return {"author_email": value}
+                return {"name": value, "author": row["author"]}
+
+        book = Book.objects.create(name="Baz", author_email="baz@example.com")
+        widget = NameOrEmailWidget(Book)
+        with self.assertNumQueries(1):
+            self.assertEqual(book, widget.clean("baz@example.com"))
+            self.assertEqual(
+                self.book, widget.clean("Bar", row={"author": self.author.pk})
+            )
+        self.assertEqual(2, widget.cache_info().shapes)
+
+    def test_cache_info(self):
+        self.assertIsNone(self.widget.cache_info())
+        self.widget.clean(self.author.pk)
+        self.widget.clean(self.author.pk)
+        with self.assertRaises(Author.DoesNotExist):
+            self.widget.clean("invalid")
+        self.assertEqual(
+            widgets.CacheInfo(hits=2, misses=1, shapes=1, size=1),
+            self.widget.cache_info(),
+        )
+
+    def test_prefetch_caches_referenced_instances(self):
+        authors = [Author.objects.create(name=f"Author {i}") for i in range(4)]
+        with self.assertNumQueries(2):
+            self.widget.prefetch([self.author.id, str(self.author.id), "", None])
+        self.assertTrue(self.widget._cached_qs.partial)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.author, self.widget.clean(str(self.author.id)))
+        # values which were not prefetched are fetched
+        with self.assertNumQueries(1):
+            self.assertEqual(authors[0], self.widget.clean(authors[0].id))
+        with self.assertRaises(Author.DoesNotExist):
+            self.widget.clean(authors[-1].id + 1)
+
+    def test_prefetch_in_batches(self):
+        authors = [Author.objects.create(name=f"Author {i}") for i in range(4)]
+        self.widget.prefetch_batch_size = 1
+        with self.assertNumQueries(3):
+            self.widget.prefetch([authors[0].id, authors[1].id])
+        with self.assertNumQueries(0):
+            self.assertEqual(authors[1], self.widget.clean(authors[1].id))
+
+    def test_prefetch_fetches_referenced_instances_only(self):
+        [Author.objects.create(name=f"Author {i}") for i in range(4)]
+        with CaptureQueriesContext(connection) as ctx:
+            self.widget.prefetch([self.author.id])
+        self.assertEqual([self.author], self.widget._cached_qs.cached_instances)
+        # the related instances are counted up to the limit of the ratio only
+        self.assertEqual(2, len(ctx.captured_queries))
+        self.assertIn("LIMIT 3", ctx.captured_queries[0]["sql"])
+
+    def test_prefetch_high_ratio_caches_whole_queryset(self):
+        Author.objects.create(name="Baz")
+        with self.assertNumQueries(1):
+            self.widget.prefetch([self.author.id])
+        self.assertFalse(hasattr(self.widget, "_cached_qs"))
+        self.assertEqual(self.author, self.widget.clean(self.author.id))
+        self.assertFalse(self.widget._cached_qs.partial)
+
+    def test_prefetch_without_max_ratio(self):
+        Author.objects.create(name="Baz")
+        self.widget.prefetch_max_ratio = None
+        with self.assertNumQueries(1):
+            self.widget.prefetch([self.author.id])
+        self.assertTrue(self.widget._cached_qs.partial)
+
+    def test_prefetch_without_values(self):
+        with self.assertNumQueries(0):
+            self.widget.prefetch(["", None])
+        self.assertFalse(hasattr(self.widget, "_cached_qs"))
+
+    def test_prefetch_related_field(self):
+        for i in range(4):
+            Book.objects.create(name=f"Book {i}")
+        widget = widgets.CachedForeignKeyWidget(Book, "author__name")
+        widget.prefetch(["Foo"])
+        self.assertTrue(widget._cached_qs.partial)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.book, widget.clean("Foo"))
+
+    def test_prefetch_invalid_value(self):
+        [Author.objects.create(name=f"Author {i}") for i in range(4)]
+        self.widget.prefetch(["non-existent-id"])
+        self.assertFalse(hasattr(self.widget, "_cached_qs"))
+
+    def test_prefetch_skipped_for_custom_queryset(self):
+        class FullNameWidget(widgets.CachedForeignKeyWidget):
+            def get_queryset(self, value, row, *args, **kwargs):
+                return self.model.objects.filter(name=row.get("first_name"))
+
+        widget = FullNameWidget(Author, "name")
+        with self.assertNumQueries(0):
+            widget.prefetch(["Foo"])
+        self.assertFalse(hasattr(widget, "_cached_qs"))
+
+    def test_import_with_row_dependent_queryset(self):
+        class FullNameWidget(widgets.CachedForeignKeyWidget):
+            def get_queryset(self, value, row, *args, **kwargs):
+                return self.model.objects.filter(name=row.get("first_name"))
+
+        class BookResource(resources.ModelResource):
+            author = fields.Field(
+                attribute="author",
+                column_name="author",
+                widget=FullNameWidget(Author, "name"),
+            )
+
+            class Meta:
+                model = Book
+                fields = ("id", "author")
+                store_instance = True
+
+        dataset = tablib.Dataset(
+            ["", "Foo", "Foo"], headers=["id", "author", "first_name"]
+        )
+        result = BookResource().import_data(dataset, raise_errors=True)
+        self.assertEqual(self.author, result.rows[0].instance.author)
+
+    def test_prefetch_skipped_for_custom_lookup_kwargs(self):
+        class BookWidget(widgets.CachedForeignKeyWidget):
+            def get_lookup_kwargs(self, value, row, *args, **kwargs):
+                return {"name": row["name"]}
+
+        widget = BookWidget(Book, "name")
+        with self.assertNumQueries(0):
+            widget.prefetch(["Bar"])
+        self.assertFalse(hasattr(widget, "_cached_qs"))
+
+    def test_prefetch_from_import(self):
+        [Author.objects.create(name=f"Author {i}") for i in range(4)]
+
+        class BookResource(resources.ModelResource):
+            author = fields.Field(
+                attribute="author",
+                column_name="Author",
+                widget=widgets.CachedForeignKeyWidget(Author),
+            )
+
+            class Meta:
+                model = Book
+                fields = ("id", "author")
+                store_instance = True
+
+        resource = BookResource()
+        dataset = tablib.Dataset(["", self.author.id], headers=["id", "Author"])
+        result = resource.import_data(dataset, raise_errors=True)
+        self.assertEqual(self.author, result.rows[0].instance.author)
+        self.assertTrue(resource.fields["author"].widget._cached_qs.partial)
+
+    def test_copy_does_not_copy_cache(self):
+        self.widget.clean(self.author.id)
+        for clone in (copy.copy(self.widget), copy.deepcopy(self.widget)):
+            self.assertFalse(hasattr(clone, "_cached_qs"))
+            self.assertEqual(self.widget.model, clone.model)
+            self.assertEqual(self.widget.field, clone.field)
+
     def test_cache_is_not_shared_for_different_resource_instances(self):
         class BookResource(resources.ModelResource):
             author = fields.Field(
@@ -934,6 +1336,105 @@ class ManyToManyWidget(TestCase):
         self.assertEqual("", self.widget.render(None))
 
 
+class CachedManyToManyWidgetTest(TestCase):
+    def setUp(self):
+        self.widget = widgets.CachedManyToManyWidget(Category)
+        self.widget_name = widgets.CachedManyToManyWidget(Category, field="name")
+        self.cat1 = Category.objects.create(name="Cat úňíčóďě")
+        self.cat2 = Category.objects.create(name="Cat 2")
+
+    def test_clean(self):
+        value = f"{self.cat1.pk},{self.cat2.pk}"
+        self.assertEqual([self.cat1, self.cat2], self.widget.clean(value))
+
+    def test_clean_field(self):
+        value = f"{self.cat1.name}, {self.cat2.name}"
+        self.assertEqual([self.cat1, self.cat2], self.widget_name.clean(value))
+
+    def test_clean_empty(self):
+        self.assertEqual([], self.widget.clean(""))
+        self.assertEqual([], self.widget.clean(None))
+
+    def test_clean_int(self):
+        self.assertEqual([self.cat1], self.widget.clean(self.cat1.pk))
+
+    def test_clean_float(self):
+        self.assertEqual([self.cat1], self.widget.clean(float(self.cat1.pk)))
+
+    def test_copy_does_not_copy_cache(self):
+        self.widget.clean(self.cat1.pk)
+        self.assertTrue(hasattr(self.widget, "_cached_instances"))
+        self.assertFalse(hasattr(copy.copy(self.widget), "_cached_instances"))
+        self.assertFalse(hasattr(copy.deepcopy(self.widget), "_cached_instances"))
+
+    def test_clean_duplicate_values(self):
+        value = f"{self.cat1.pk},{self.cat1.pk}"
+        self.assertEqual([self.cat1], self.widget.clean(value))
+
+    def test_clean_unknown_value_raises(self):
+        with self.assertRaises(ValueError) as e:
+            self.widget_name.clean(f"{self.cat1.name},Unknown")
+        self.assertEqual("Category matching name not found: Unknown", str(e.exception))
+
+    def test_cache_hit(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.widget.clean(str(self.cat1.pk))
+            self.widget.clean(str(self.cat1.pk))
+        self.assertEqual(1, len(ctx.captured_queries))
+
+    def test_prefetch(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.widget.prefetch([str(self.cat1.pk), f"{self.cat1.pk},{self.cat2.pk}"])
+            self.assertEqual([self.cat2], self.widget.clean(str(self.cat2.pk)))
+            self.assertEqual(
+                [self.cat1, self.cat2],
+                self.widget.clean(f"{self.cat1.pk},{self.cat2.pk}"),
+            )
+        self.assertEqual(1, len(ctx.captured_queries))
+
+    def test_prefetch_skipped_for_custom_queryset(self):
+        class RowCategoryWidget(widgets.CachedManyToManyWidget):
+            def get_queryset(self, value, row, *args, **kwargs):
+                return self.model.objects.filter(name=row.get("category"))
+
+        widget = RowCategoryWidget(Category, field="name")
+        with self.assertNumQueries(0):
+            widget.prefetch([self.cat1.name])
+        self.assertEqual(
+            [self.cat1],
+            widget.clean(self.cat1.name, row={"category": self.cat1.name}),
+        )
+
+    def test_prefetch_invalid_value_is_reported_by_clean(self):
+        self.widget.prefetch(["a"])
+        with self.assertRaises(ValueError):
+            self.widget.clean("a")
+
+    def test_keys_are_converted_by_the_model_field(self):
+        category = UUIDCategory.objects.create(name="Foo")
+        widget = widgets.CachedManyToManyWidget(UUIDCategory)
+        widget.prefetch([str(category.pk)])
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual([category], widget.clean(str(category.pk).upper()))
+            self.assertEqual([category], widget.clean(category.pk.hex))
+        self.assertEqual(0, len(ctx.captured_queries))
+        self.assertEqual(
+            [self.cat1], self.widget.clean(f"{self.cat1.pk},0{self.cat1.pk}")
+        )
+
+    def test_with_related_fields(self):
+        author = Author.objects.create(name="Foo")
+        book = Book.objects.create(name="Bar", author=author)
+        widget = widgets.CachedManyToManyWidget(Book, field="author__name")
+        self.assertEqual([book], widget.clean("Foo"))
+
+    def test_render(self):
+        self.assertEqual(
+            self.widget.render(Category.objects.order_by("id")),
+            f"{self.cat1.pk},{self.cat2.pk}",
+        )
+
+
 class JSONWidgetTest(TestCase):
     def setUp(self):
         self.value = {"value": 23}
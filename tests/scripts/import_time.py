@@ -0,0 +1,55 @@
+"""
+Helper module for measuring the import time of the import_export modules
+with ``python -X importtime``.
+
+See testing.rst
+"""
+
+import os
+import subprocess
+import sys
+
+# Modules whose cumulative import time is reported.
+MODULES = (
+    "import_export.formats.base_formats",
+    "import_export.resources",
+)
+
+# Modules which should not be imported until an import or export uses them.
+DEFERRED_MODULES = ("diff_match_patch", "openpyxl", "xlrd", "xlwt", "odf", "yaml")
+
+
+def measure(statement):
+    """
+    Runs ``statement`` in a new interpreter with ``python -X importtime`` and
+    returns a dict of the cumulative import time in microseconds of each
+    imported module.
+    """
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "settings")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def run(*args):
+    statement = "".join(f"import {module}; " for module in MODULES)
+    # the default formats are looked up by the admin forms on the first request
+    statement += "import_export.formats.base_formats.get_default_formats()"
+    times = measure(statement)
+    for module in MODULES:
+        print(f"{module}: {times.get(module, 0) / 1000: 0.4} ms")
+
+    loaded = sorted({module.split(".")[0] for module in times} & set(DEFERRED_MODULES))
+    print(f"Deferred modules imported: {', '.join(loaded) or 'none'}")
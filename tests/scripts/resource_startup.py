@@ -0,0 +1,65 @@
+"""
+Helper module for measuring the cost of defining resource classes.
+
+See testing.rst
+"""
+
+import gc
+import itertools
+import time
+
+from import_export import resources
+
+from core.models import Author, Book, Category, Child, Parent  # isort:skip
+
+# The number of resource classes defined on each run.
+NUM_RESOURCES = 1000
+
+MODELS = (Author, Book, Category, Child, Parent)
+
+
+def get_resource_options():
+    """
+    Returns the ``Meta`` options of ``NUM_RESOURCES`` distinct resources, which
+    each export a different subset of the fields of a model, so that no
+    resource reuses the fields generated for another.
+    """
+    field_names = {
+        model: [f.name for f in model._meta.fields + model._meta.many_to_many]
+        for model in MODELS
+    }
+    options = []
+    for size in itertools.count(1):
+        for model in MODELS:
+            for fields in itertools.combinations(field_names[model], size):
+                options.append({"model": model, "fields": fields})
+                if len(options) == NUM_RESOURCES:
+                    return options
+        if size > max(len(names) for names in field_names.values()):
+            return options
+
+
+def define_resources(options):
+    return [
+        type(
+            "Resource%d" % i,
+            (resources.ModelResource,),
+            {"Meta": type("Meta", (), meta)},
+        )
+        for i, meta in enumerate(options)
+    ]
+
+
+def profile_duration(label, fn, *args):
+    gc.collect()
+    t = time.perf_counter()
+    retval = fn(*args)
+    elapsed = time.perf_counter() - t
+    print(f"{label}: {elapsed: 0.4}")
+    return retval
+
+
+def run(*args):
+    options = get_resource_options()
+    print(f"Defining {len(options)} distinct resource classes")
+    profile_duration("Time to define", define_resources, options)
@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -10,6 +11,8 @@ INSTALLED_APPS = [
     "django.contrib.sites",
     "django.contrib.postgres",
     "import_export",
+    "import_export.fingerprints",
+    "import_export.checkpoints",
     "core",
 ]
 
@@ -21,6 +24,9 @@ DEBUG = True
 
 STATIC_URL = "/static/"
 
+# files written by MediaStorage during the tests are not kept in the tree
+MEDIA_ROOT = tempfile.mkdtemp(prefix="import_export_tests_")
+
 SECRET_KEY = "2n6)=vnp8@bu0om9d05vwf7@=5vpn%)97-!d*t4zq1mku%0-@j"
 
 MIDDLEWARE = (